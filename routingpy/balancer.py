@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Load balancing across several replicas of a self-hosted routing engine.
+"""
+import threading
+import time
+from typing import List, Optional, Sequence
+
+STRATEGIES = ("round_robin", "least_outstanding", "ewma")
+
+
+class Endpoint(object):
+    """The state of one base URL of a :class:`LoadBalancer`."""
+
+    def __init__(self, url: str):
+        self.url = url
+        #: The number of requests in flight.
+        self.outstanding = 0
+        #: The exponentially weighted moving average of the latency in seconds, None before the first response.
+        self.latency = None
+        #: The number of consecutive failures.
+        self.failures = 0
+        #: The monotonic time until which the endpoint is skipped, None while it's healthy.
+        self.unhealthy_until = None
+        self._probing = False
+
+    @property
+    def healthy(self) -> bool:
+        return self.unhealthy_until is None
+
+    def __repr__(self):  # pragma: no cover
+        return "Endpoint({}, outstanding={}, latency={}, healthy={})".format(
+            self.url, self.outstanding, self.latency, self.healthy
+        )
+
+
+class LoadBalancer(object):
+    """
+    Distributes a client's requests across several base URLs, e.g. replicas of an OSRM or Valhalla server.
+    Pass it, or simply a list of base URLs for round-robin, as a router's ``base_url``:
+
+    >>> from routingpy import Valhalla
+    >>> from routingpy.balancer import LoadBalancer
+    >>> router = Valhalla(LoadBalancer(["http://valhalla-1:8002", "http://valhalla-2:8002"], strategy="ewma"))
+
+    Strategies:
+
+    - ``round_robin``: cycles through the endpoints.
+    - ``least_outstanding``: picks the endpoint with the fewest requests in flight.
+    - ``ewma``: picks the endpoint with the lowest latency average, weighted by its requests in flight.
+
+    An endpoint is marked unhealthy after ``failure_threshold`` consecutive server errors, timeouts or
+    connection errors and skipped for ``recovery_time`` seconds. After that, a single request probes it again:
+    on success it's healthy again, otherwise it's skipped for another ``recovery_time``. A request whose
+    endpoint fails is retried right away on another healthy endpoint.
+    """
+
+    def __init__(
+        self,
+        base_urls: Sequence[str],
+        strategy: str = "round_robin",
+        failure_threshold: int = 3,
+        recovery_time: float = 30.0,
+        ewma_decay: float = 0.3,
+    ):
+        """
+        :param base_urls: The base URLs of the replicas. Should not have a trailing slash.
+        :type base_urls: list of str
+
+        :param strategy: One of "round_robin", "least_outstanding" and "ewma". Default "round_robin".
+        :type strategy: str
+
+        :param failure_threshold: The number of consecutive failures after which an endpoint is marked
+            unhealthy. Default 3.
+        :type failure_threshold: int
+
+        :param recovery_time: The number of seconds an unhealthy endpoint is skipped before it's probed again.
+            Default 30.
+        :type recovery_time: float
+
+        :param ewma_decay: The weight of the latest latency in the moving average. Default 0.3.
+        :type ewma_decay: float
+        """
+        if not base_urls:
+            raise ValueError("At least one base URL must be specified.")
+        if strategy not in STRATEGIES:
+            raise ValueError("strategy must be one of {}.".format(", ".join(STRATEGIES)))
+
+        self.endpoints: List[Endpoint] = [Endpoint(url) for url in base_urls]
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.ewma_decay = ewma_decay
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_urls(self) -> List[str]:
+        """The base URLs of all endpoints."""
+        return [endpoint.url for endpoint in self.endpoints]
+
+    def _available(self, now, exclude):
+        available = []
+        for endpoint in self.endpoints:
+            if endpoint in exclude:
+                continue
+            if endpoint.healthy or (endpoint.unhealthy_until <= now and not endpoint._probing):
+                available.append(endpoint)
+
+        return available
+
+    def acquire(self, exclude: Sequence[Endpoint] = ()) -> Optional[Endpoint]:
+        """
+        Selects an endpoint for a request and counts the request as in flight. Call :meth:`release` once
+        the request finished.
+
+        :param exclude: Endpoints which already failed for this request.
+        :type exclude: list of :class:`Endpoint`
+
+        :returns: The selected endpoint or None if every endpoint is excluded. If every endpoint is unhealthy,
+            the one recovering first.
+        :rtype: :class:`Endpoint` or None
+        """
+        now = time.monotonic()
+        with self._lock:
+            available = self._available(now, exclude)
+            if not available:
+                candidates = [endpoint for endpoint in self.endpoints if endpoint not in exclude]
+                if not candidates:
+                    return None
+                # Every endpoint is unhealthy, so fail fast with the error of the one recovering first
+                endpoint = min(candidates, key=lambda e: e.unhealthy_until)
+                endpoint.outstanding += 1
+                return endpoint
+
+            # Probe a recovering endpoint with a single request
+            recovering = [endpoint for endpoint in available if not endpoint.healthy]
+            if recovering:
+                endpoint = recovering[0]
+                endpoint._probing = True
+            elif self.strategy == "round_robin":
+                endpoint = available[self._next % len(available)]
+                self._next += 1
+            elif self.strategy == "least_outstanding":
+                endpoint = min(available, key=lambda e: e.outstanding)
+            else:
+                # Endpoints without a measured latency are tried first
+                endpoint = min(available, key=lambda e: (e.latency or 0.0) * (e.outstanding + 1))
+
+            endpoint.outstanding += 1
+
+        return endpoint
+
+    def release(self, endpoint: Endpoint, latency: Optional[float] = None, failed: bool = False):
+        """
+        Records the outcome of a request to an endpoint.
+
+        :param endpoint: The endpoint returned by :meth:`acquire`.
+        :type endpoint: :class:`Endpoint`
+
+        :param latency: The request's latency in seconds.
+        :type latency: float
+
+        :param failed: Whether the request failed with a server error, a timeout or a connection error.
+        :type failed: bool
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+            if latency is not None:
+                if endpoint.latency is None:
+                    endpoint.latency = latency
+                else:
+                    endpoint.latency += self.ewma_decay * (latency - endpoint.latency)
+
+            if failed:
+                endpoint.failures += 1
+                if endpoint._probing or endpoint.failures >= self.failure_threshold:
+                    endpoint.unhealthy_until = time.monotonic() + self.recovery_time
+            else:
+                endpoint.failures = 0
+                endpoint.unhealthy_until = None
+            endpoint._probing = False
+
+    def cancel(self, endpoint: Endpoint):
+        """
+        Releases an endpoint for a request which wasn't sent to it, e.g. because its circuit is open, without
+        recording an outcome. Its health is left as it is. If the request was to probe the endpoint, the
+        probe is postponed by ``recovery_time``.
+
+        :param endpoint: The endpoint returned by :meth:`acquire`.
+        :type endpoint: :class:`Endpoint`
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+            if endpoint._probing:
+                endpoint._probing = False
+                endpoint.unhealthy_until = time.monotonic() + self.recovery_time
+
+    def __len__(self):
+        return len(self.endpoints)
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Runs many requests of a router concurrently on a thread pool.
+"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .matrix import Matrix
+from .tiling import tiled_matrix
+
+
+def _zip_kwargs(locations, kwargs):
+    """Pairs each item of ``locations`` with its ``kwargs``, raising ValueError if their lengths differ."""
+    if hasattr(locations, "__len__") and hasattr(kwargs, "__len__") and len(locations) != len(kwargs):
+        raise ValueError(
+            "kwargs has {} items, but locations has {}.".format(len(kwargs), len(locations))
+        )
+
+    missing = object()
+    kwargs = iter(kwargs)
+    for item_locations in locations:
+        item_kwargs = next(kwargs, missing)
+        if item_kwargs is missing:
+            raise ValueError("kwargs has fewer items than locations.")
+        yield item_locations, item_kwargs
+
+    if next(kwargs, missing) is not missing:
+        raise ValueError("kwargs has more items than locations.")
+
+
+def run_many(
+    method: Callable,
+    locations: Iterable[List[List[float]]],
+    kwargs: Optional[Iterable[dict]] = None,
+    max_workers: int = 8,
+    max_in_flight: Optional[int] = None,
+    ordered: bool = False,
+    **common_kwargs
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Calls a router method once per item of ``locations`` on a thread pool and yields the results as they
+    become available. Works with the methods of any router, e.g. the one returned by
+    :func:`routingpy.routers.get_router_by_name`:
+
+    >>> from routingpy.batch import run_many
+    >>> router = get_router_by_name("osrm")()
+    >>> for index, route in run_many(router.directions, all_locations, profile="driving", max_workers=16):
+    ...     print(index, route.duration)
+
+    An exception raised for an item is yielded as that item's result instead of aborting the whole batch.
+    If the router's client has ``skip_api_error`` set, items without a valid response return an empty result,
+    just like a single request would.
+
+    :param method: The router method to call, e.g. ``router.directions`` or ``router.matrix``.
+    :type method: callable
+
+    :param locations: The ``locations`` argument for each request.
+    :type locations: iterable of list
+
+    :param kwargs: Additional keyword arguments per request, in the same order as ``locations``.
+        They take precedence over ``common_kwargs``. Must have as many items as ``locations``.
+    :type kwargs: iterable of dict
+
+    :param max_workers: The number of threads executing requests. Default 8.
+    :type max_workers: int
+
+    :param max_in_flight: The maximum number of submitted, but not yet yielded items. Bounds memory when
+        ``locations`` is a long iterator. Default ``2 * max_workers``.
+    :type max_in_flight: int
+
+    :param ordered: Yield results in input order rather than in completion order. Default False.
+    :type ordered: bool
+
+    :param common_kwargs: Keyword arguments passed to every request, e.g. ``profile``.
+    :type common_kwargs: dict
+
+    :raises ValueError: if ``kwargs`` and ``locations`` have a different number of items.
+
+    :returns: Tuples of the item's index and its result, or the exception raised for it.
+    :rtype: iterator of tuple
+    """
+    max_in_flight = max(max_in_flight or 2 * max_workers, 1)
+    items = enumerate(
+        _zip_kwargs(locations, kwargs) if kwargs is not None else ((loc, None) for loc in locations)
+    )
+
+    def call(item_locations, item_kwargs):
+        return method(item_locations, **dict(common_kwargs, **(item_kwargs or {})))
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="routingpy") as executor:
+        pending = {}
+        finished = {}
+        next_index = 0
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(pending) + len(finished) < max_in_flight:
+                    try:
+                        index, (item_locations, item_kwargs) = next(items)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending[executor.submit(call, item_locations, item_kwargs)] = index
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = e
+
+                    if not ordered:
+                        yield index, result
+                    else:
+                        finished[index] = result
+
+                while next_index in finished:
+                    yield next_index, finished.pop(next_index)
+                    next_index += 1
+        finally:
+            # Don't start what is left if the caller stops consuming the results
+            for future in pending:
+                future.cancel()
+
+
+class BatchMixin(object):
+    """Adds batch methods to a router, which run many requests concurrently."""
+
+    def directions_many(
+        self,
+        locations: Iterable[List[List[float]]],
+        kwargs: Optional[Iterable[dict]] = None,
+        max_workers: int = 8,
+        max_in_flight: Optional[int] = None,
+        ordered: bool = False,
+        **directions_kwargs
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Requests directions for many location lists concurrently. See :func:`routingpy.batch.run_many`
+        for details.
+
+        >>> for index, route in router.directions_many(all_locations, profile="auto", ordered=True):
+        ...     print(index, route.distance)
+
+        :param locations: The ``locations`` of each directions request.
+        :type locations: iterable of list
+
+        :param kwargs: Additional keyword arguments per request, in the same order as ``locations``.
+        :type kwargs: iterable of dict
+
+        :param max_workers: The number of threads executing requests. Default 8.
+        :type max_workers: int
+
+        :param max_in_flight: The maximum number of submitted, but not yet yielded items.
+            Default ``2 * max_workers``.
+        :type max_in_flight: int
+
+        :param ordered: Yield results in input order rather than in completion order. Default False.
+        :type ordered: bool
+
+        :param directions_kwargs: Keyword arguments passed to every directions request, e.g. ``profile``.
+        :type directions_kwargs: dict
+
+        :returns: Tuples of the item's index and its :class:`routingpy.direction.Direction` (or
+            :class:`routingpy.direction.Directions`), or the exception raised for it.
+        :rtype: iterator of tuple
+        """
+        return run_many(
+            self.directions,
+            locations,
+            kwargs=kwargs,
+            max_workers=max_workers,
+            max_in_flight=max_in_flight,
+            ordered=ordered,
+            **directions_kwargs
+        )
+
+
+class TiledMatrixMixin(BatchMixin):
+    """
+    Adds :meth:`matrix_tiled` to the batch methods of a router whose ``matrix`` accepts ``sources`` and
+    ``destinations``, which the tiles are requested with.
+    """
+
+    def matrix_tiled(
+        self,
+        locations: Sequence,
+        sources: Optional[Sequence[int]] = None,
+        destinations: Optional[Sequence[int]] = None,
+        tile_size: Optional[Tuple[int, int]] = None,
+        max_workers: int = 4,
+        tile_retries: int = 2,
+        **matrix_kwargs
+    ) -> Matrix:
+        """
+        Requests a matrix exceeding the provider's limits in concurrent tiles and stitches them together.
+        See :func:`routingpy.tiling.tiled_matrix` for details.
+
+        >>> matrix = router.matrix_tiled(two_thousand_locations, profile="auto", tile_size=(100, 100))
+
+        :param locations: All locations of the matrix.
+        :type locations: list of list
+
+        :param sources: A list of indices that refer to the list of locations
+            (starting with 0). If not passed, all indices are considered.
+        :type sources: list of int
+
+        :param destinations: A list of indices that refer to the list of locations
+            (starting with 0). If not passed, all indices are considered.
+        :type destinations: list of int
+
+        :param tile_size: The maximum number of sources and destinations per tile. Defaults to the
+            provider's limits, e.g. (50, 50) for OSRM, (10, 10) for Google and (12, 13) for Mapbox.
+        :type tile_size: tuple of int
+
+        :param max_workers: The number of tiles requested concurrently. Default 4.
+        :type max_workers: int
+
+        :param tile_retries: How many times a failed tile is requested again before giving up. Default 2.
+        :type tile_retries: int
+
+        :param matrix_kwargs: Additional arguments passed to each ``matrix`` request, e.g. ``profile``.
+        :type matrix_kwargs: dict
+
+        :returns: The stitched matrix. Its ``raw`` property holds the list of raw tile responses.
+        :rtype: :class:`routingpy.matrix.Matrix`
+        """
+        return tiled_matrix(
+            self,
+            locations,
+            sources=sources,
+            destinations=destinations,
+            tile_size=tile_size,
+            max_workers=max_workers,
+            tile_retries=tile_retries,
+            **matrix_kwargs
+        )
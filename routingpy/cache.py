@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Response caches which can be passed to a client to avoid requesting the same resource twice.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Union
+
+
+def cache_key(method: str, url: str, body: Optional[dict] = None) -> str:
+    """
+    Builds the cache key of a request from its HTTP method, its full URL including the query string and its
+    canonicalized body, i.e. with sorted keys.
+
+    :param method: The HTTP method, "GET" or "POST".
+    :type method: str
+
+    :param url: The request URL including the query string.
+    :type url: str
+
+    :param body: The POST parameters.
+    :type body: dict
+
+    :returns: The hex digest of the request's SHA-256 hash.
+    :rtype: str
+    """
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256("\n".join((method, url, canonical)).encode("utf-8")).hexdigest()
+
+
+class BaseCache(metaclass=ABCMeta):
+    """
+    Abstract base class every cache inherits from. Caches need to be thread-safe, since requests may be
+    made concurrently, e.g. with :class:`routingpy.client_async.AsyncClient`.
+
+    Counts hits and misses of :meth:`get`.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Union[dict, bytes]]:
+        """
+        Returns the cached response body or ``None`` if there is no valid entry for the key.
+
+        :param key: The key built by :func:`cache_key`.
+        :type key: str
+
+        :rtype: dict or bytes or None
+        """
+        value = self._get(key)
+        with self._counter_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return value
+
+    @abstractmethod
+    def _get(self, key):
+        """Returns the cached value for key or None."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Union[dict, bytes]):
+        """
+        Caches a response body.
+
+        :param key: The key built by :func:`cache_key`.
+        :type key: str
+
+        :param value: The parsed JSON response or the binary body, e.g. a GeoTIFF.
+        :type value: dict or bytes
+        """
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """Removes all entries and resets the counters."""
+        pass
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+    @property
+    def stats(self) -> dict:
+        """
+        The cache's hits, misses and number of entries.
+
+        :rtype: dict
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+
+class MemoryCache(BaseCache):
+    """
+    A bounded in-memory cache, which evicts the least recently used entries.
+
+    >>> from routingpy import Valhalla
+    >>> from routingpy.cache import MemoryCache
+    >>> router = Valhalla(cache=MemoryCache(maxsize=10000, ttl=3600))
+
+    The cached JSON responses are shared between all requests for them, so they must not be modified.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """
+        :param maxsize: The maximum number of cached responses. Default 1024.
+        :type maxsize: int
+
+        :param ttl: The number of seconds after which an entry expires. Default None, i.e. never.
+        :type ttl: float
+        """
+        super(MemoryCache, self).__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            try:
+                expires, value = self._entries[key]
+            except KeyError:
+                return None
+
+            if expires is not None and expires < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache(BaseCache):
+    """
+    A persistent cache in a SQLite database file, which survives restarts and can be shared between processes.
+    Entries expire after ``ttl`` seconds and the least recently used entries are evicted once the cached
+    responses exceed ``max_bytes``.
+
+    >>> from routingpy import OSRM
+    >>> from routingpy.cache import SQLiteCache
+    >>> router = OSRM(cache=SQLiteCache("responses.sqlite", ttl=7 * 86400))
+    """
+
+    _JSON = 0
+    _BYTES = 1
+
+    def __init__(self, path: str, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        """
+        :param path: The path of the database file. Created if it doesn't exist.
+        :type path: str
+
+        :param ttl: The number of seconds after which an entry expires. Default None, i.e. never.
+        :type ttl: float
+
+        :param max_bytes: The maximum total size of the cached response bodies in bytes. Default None, i.e.
+            unbounded.
+        :type max_bytes: int
+        """
+        super(SQLiteCache, self).__init__()
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, kind INTEGER, value BLOB, size INTEGER, expires REAL, accessed REAL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def _get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT kind, value, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            kind, value, expires = row
+            if expires is not None and expires < now:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+
+            self._connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+
+        return bytes(value) if kind == self._BYTES else json.loads(value)
+
+    def set(self, key, value):
+        if isinstance(value, (bytes, bytearray)):
+            kind, blob = self._BYTES, bytes(value)
+        else:
+            kind, blob = self._JSON, json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+        now = time.time()
+        expires = now + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, blob, len(blob), expires, now),
+            )
+            if self.max_bytes is not None:
+                self._evict()
+
+    def _evict(self):
+        """Deletes expired entries and the least recently used ones exceeding max_bytes."""
+        self._connection.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+        self._connection.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS total FROM responses) "
+            "WHERE total > ?)",
+            (self.max_bytes,),
+        )
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self.hits = self.misses = 0
+
+    def close(self):
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Circuit breakers, which stop requests to an endpoint that keeps failing.
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from . import exceptions
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _Circuit(object):
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probes = 0
+
+
+class CircuitBreaker(object):
+    """
+    Fails requests fast with :class:`routingpy.exceptions.CircuitOpen` while their endpoint is down, instead
+    of retrying each of them until ``retry_timeout``.
+
+    Each endpoint, i.e. base URL and the first ``path_segments`` segments of the URL path, has its own circuit:
+
+    - ``closed``: requests are sent. After ``failure_threshold`` consecutive server errors, timeouts or
+      connection errors, the circuit opens.
+    - ``open``: requests fail right away, until ``cooldown`` seconds passed.
+    - ``half_open``: up to ``half_open_requests`` probe requests are sent. A success closes the circuit again,
+      a failure opens it for another ``cooldown``.
+
+    >>> from routingpy import Valhalla
+    >>> from routingpy.circuit_breaker import CircuitBreaker
+    >>> breaker = CircuitBreaker(failure_threshold=5, cooldown=30)
+    >>> router = Valhalla("http://localhost:8002", circuit_breaker=breaker)
+    >>> breaker.states
+    {'http://localhost:8002/route': 'open'}
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown: float = 30.0,
+        half_open_requests: int = 1,
+        path_segments: int = 2,
+        on_state_change: Optional[Callable[[str, str, str], None]] = None,
+    ):
+        """
+        :param failure_threshold: The number of consecutive failures which open a circuit. Default 5.
+        :type failure_threshold: int
+
+        :param cooldown: The number of seconds a circuit stays open before probe requests are sent. Default 30.
+        :type cooldown: float
+
+        :param half_open_requests: The number of concurrent probe requests of a half-open circuit. Default 1.
+        :type half_open_requests: int
+
+        :param path_segments: The number of URL path segments identifying an endpoint, e.g. 2 for
+            ``/route/v1`` of OSRM. Default 2.
+        :type path_segments: int
+
+        :param on_state_change: Called with the circuit's key, the old and the new state on every transition.
+        :type on_state_change: callable
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.half_open_requests = half_open_requests
+        self.path_segments = path_segments
+        self.on_state_change = on_state_change
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def key(self, base_url: str, url: str) -> str:
+        """
+        Returns the key of the endpoint's circuit.
+
+        :param base_url: The base URL of the request.
+        :type base_url: str
+
+        :param url: The request's URL path after the base URL, without query string.
+        :type url: str
+
+        :rtype: str
+        """
+        segments = [segment for segment in url.split("?")[0].split("/") if segment]
+        return base_url + "".join("/" + segment for segment in segments[: self.path_segments])
+
+    def _transition(self, key, circuit, state):
+        old, circuit.state = circuit.state, state
+        if old != state and self.on_state_change is not None:
+            self.on_state_change(key, old, state)
+
+    def before_request(self, key: str):
+        """
+        Admits a request to the endpoint.
+
+        :param key: The circuit's key, see :meth:`key`.
+        :type key: str
+
+        :raises routingpy.exceptions.CircuitOpen: if the circuit is open or has no probe requests left.
+        """
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            if circuit.state == CLOSED:
+                return
+
+            if circuit.state == OPEN:
+                remaining = circuit.opened_at + self.cooldown - time.monotonic()
+                if remaining > 0:
+                    raise exceptions.CircuitOpen(key, remaining)
+                circuit.probes = 0
+                self._transition(key, circuit, HALF_OPEN)
+
+            if circuit.probes >= self.half_open_requests:
+                raise exceptions.CircuitOpen(key, 0.0)
+            circuit.probes += 1
+
+    def record_success(self, key: str):
+        """
+        Records a successful request, which closes a half-open circuit.
+
+        :param key: The circuit's key.
+        :type key: str
+        """
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            circuit.failures = 0
+            self._transition(key, circuit, CLOSED)
+
+    def record_failure(self, key: str):
+        """
+        Records a server error, timeout or connection error, which may open the circuit.
+
+        :param key: The circuit's key.
+        :type key: str
+        """
+        with self._lock:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN or circuit.failures >= self.failure_threshold:
+                circuit.opened_at = time.monotonic()
+                self._transition(key, circuit, OPEN)
+
+    def state(self, key: str) -> str:
+        """
+        Returns the state of a circuit: "closed", "open" or "half_open".
+
+        :param key: The circuit's key.
+        :type key: str
+
+        :rtype: str
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            return circuit.state if circuit is not None else CLOSED
+
+    @property
+    def states(self) -> Dict[str, str]:
+        """
+        The states of all circuits by key.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {key: circuit.state for key, circuit in self._circuits.items()}
+
+    def reset(self):
+        """Closes all circuits."""
+        with self._lock:
+            self._circuits.clear()
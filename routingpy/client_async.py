@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Asynchronous client, which makes every router method awaitable.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import cache_key
+from .client_base import DEFAULT
+from .client_default import Client
+
+
+class AsyncClient(Client):
+    """Asynchronous client class for requests handling, which can be passed to each router.
+
+    Every router method returns an awaitable when the router was initialized with this client, e.g.::
+
+        >>> from routingpy import Valhalla
+        >>> from routingpy.client_async import AsyncClient
+        >>> router = Valhalla(client=AsyncClient)
+        >>> routes = await asyncio.gather(*[router.directions(locs, "auto") for locs in all_locations])
+
+    The HTTP requests are executed by :class:`routingpy.client_default.Client` on a thread pool, so
+    retries, the backoff on HTTP 429/503 and ``skip_api_error`` behave exactly the same, while the event
+    loop is never blocked. Up to ``max_concurrency`` requests are in flight at the same time.
+    """
+
+    def __init__(
+        self,
+        base_url,
+        user_agent=None,
+        timeout=DEFAULT,
+        retry_timeout=None,
+        retry_over_query_limit=None,
+        skip_api_error=None,
+        cache=None,
+        max_concurrency=100,
+        executor=None,
+        pool_maxsize=None,
+        **kwargs
+    ):
+        """
+        :param base_url: The base URL for the request. All routers must provide a default.
+            Should not have a trailing slash.
+        :type base_url: string
+
+        :param user_agent: User-Agent to send with the requests to routing API.
+            Overrides ``options.default_user_agent``.
+        :type user_agent: string
+
+        :param timeout: Combined connect and read timeout for HTTP requests, in
+            seconds. Specify "None" for no timeout.
+        :type timeout: int
+
+        :param retry_timeout: Timeout across multiple retriable requests, in
+            seconds.
+        :type retry_timeout: int
+
+        :param retry_over_query_limit: If True, client will not raise an exception
+            on HTTP 429, but instead jitter a sleeping timer to pause between
+            requests until HTTP 200 or retry_timeout is reached.
+        :type retry_over_query_limit: bool
+
+        :param skip_api_error: Continue with batch processing if a :class:`routingpy.exceptions.RouterApiError` is
+            encountered (e.g. no route found). If False, processing will discontinue and raise an error. Default False.
+        :type skip_api_error: bool
+
+        :param cache: A cache for the response bodies, e.g. :class:`routingpy.cache.MemoryCache`. Requests with
+            the same URL and body are then only sent once. ``dry_run`` requests bypass the cache.
+        :type cache: :class:`routingpy.cache.BaseCache`
+
+        :param max_concurrency: The maximum number of requests in flight at the same time. Default 100.
+        :type max_concurrency: int
+
+        :param executor: An executor to run the requests on instead of the client's own thread pool.
+            ``max_concurrency`` is then only used to size the connection pool.
+        :type executor: :class:`concurrent.futures.Executor`
+
+        :param pool_maxsize: The maximum number of connections kept alive per host. Default
+            ``max_concurrency``, i.e. one pooled connection per concurrent request.
+        :type pool_maxsize: int
+
+        :param kwargs: Additional arguments, such as headers or proxies, or the connection pool options
+            of :class:`routingpy.client_default.Client`.
+        :type kwargs: dict
+        """
+        super(AsyncClient, self).__init__(
+            base_url,
+            user_agent=user_agent,
+            timeout=timeout,
+            retry_timeout=retry_timeout,
+            retry_over_query_limit=retry_over_query_limit,
+            skip_api_error=skip_api_error,
+            cache=cache,
+            pool_maxsize=pool_maxsize or max_concurrency,
+            **kwargs
+        )
+
+        self._in_flight = {}
+        self._own_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="routingpy"
+        )
+
+    async def _request(
+        self,
+        url,
+        get_params={},
+        post_params=None,
+        first_request_time=None,
+        retry_counter=0,
+        dry_run=None,
+        stream_to=None,
+    ):
+        """Performs HTTP GET/POST with credentials on the client's thread pool, returning the body as
+        JSON. See :meth:`routingpy.client_default.Client._request` for parameters and exceptions.
+
+        :returns: raw JSON response or GeoTIFF image
+        :rtype: dict or bytes
+        """
+        loop = asyncio.get_running_loop()
+        request = functools.partial(
+            super(AsyncClient, self)._request,
+            url,
+            get_params,
+            post_params,
+            first_request_time,
+            retry_counter,
+            dry_run,
+            stream_to,
+        )
+        if self.single_flight is None or dry_run or retry_counter or stream_to is not None:
+            return await loop.run_in_executor(self._executor, request)
+
+        # Coalesce identical requests on the event loop, so waiting ones don't block a thread
+        key = (
+            loop,
+            cache_key(
+                "GET" if post_params is None else "POST",
+                self.base_url + self._generate_auth_url(url, get_params),
+                post_params,
+            ),
+        )
+        future = self._in_flight.get(key)
+        if future is None:
+            # Counted by the single flight in the thread
+            future = self._in_flight[key] = loop.run_in_executor(self._executor, request)
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.single_flight.record(shared=True)
+
+        return await asyncio.shield(future)
+
+    async def _parse_response(self, parser, response, *args, **kwargs):
+        """Awaits the response of :meth:`_request` and passes it to a router's parser."""
+        return self._parse(parser, await response, *args, **kwargs)
+
+    async def _parse_stream(self, parser, response, *args, **kwargs):
+        """Awaits the response of :meth:`_request` and returns an asynchronous iterator over the results of
+        the parser, which reads the response from the connection on the client's thread pool."""
+        return self._iterate(self._parse(parser, await response, *args, **kwargs))
+
+    async def _iterate(self, iterator):
+        loop = asyncio.get_running_loop()
+        done = object()
+        try:
+            while True:
+                # Reading from the connection blocks, so it must not happen on the event loop
+                item = await loop.run_in_executor(self._executor, next, iterator, done)
+                if item is done:
+                    return
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def close(self):
+        """Shuts down the client's own thread pool and closes its own HTTP session, but not a shared one."""
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
+        if self._own_session:
+            self._session.close()
@@ -24,12 +24,17 @@ try:
 except (ModuleNotFoundError, ImportError):
     __version__ = "None"
 
+import json
+import time
 from abc import ABCMeta, abstractmethod
 from datetime import timedelta
 from urllib.parse import urlencode
 
 import requests
 
+from .hooks import EVENTS, Event
+from .raw import KEEP_RAW, ResponseBody, retain_raw
+
 _DEFAULT_USER_AGENT = "routingpy/v{}".format(__version__)
 _RETRIABLE_STATUSES = set([503])
 
@@ -87,6 +92,9 @@ class options(object):
 # To avoid trouble when respecting timeout for individual routers (i.e. can't be None, since that's no timeout)
 DEFAULT = type("object", (object,), {"__repr__": lambda self: "DEFAULT"})()
 
+#: Pass as a request's ``stream_to`` to get an iterator over the chunks of the response body.
+STREAM_CHUNKS = type("object", (object,), {"__repr__": lambda self: "STREAM_CHUNKS"})()
+
 
 class BaseClient(metaclass=ABCMeta):
     """Abstract base class every client inherits from. Authentication is handled in each subclass."""
@@ -99,6 +107,8 @@ class BaseClient(metaclass=ABCMeta):
         retry_timeout=None,
         retry_over_query_limit=None,
         skip_api_error=None,
+        hooks=None,
+        keep_raw="full",
         **kwargs
     ):
         """
@@ -127,10 +137,22 @@ class BaseClient(metaclass=ABCMeta):
             encountered (e.g. no route found). If False, processing will discontinue and raise an error. Default False.
         :type skip_api_error: bool
 
+        :param hooks: Callbacks by event name, see :meth:`add_hook`.
+        :type hooks: dict
+
+        :param keep_raw: How parsed results keep the raw response: "full" as decoded JSON, "none" not at all
+            or "bytes" as the undecoded response body, which is decoded on first access to ``raw``.
+            Default "full".
+        :type keep_raw: str
+
         :param **kwargs: Additional keyword arguments.
         :type **kwargs: dict
         """
+        if keep_raw not in KEEP_RAW:
+            raise ValueError("keep_raw must be one of {}.".format(", ".join(KEEP_RAW)))
+
         self.base_url = base_url
+        self.keep_raw = keep_raw
 
         self.retry_over_query_limit = (
             retry_over_query_limit
@@ -152,6 +174,78 @@ class BaseClient(metaclass=ABCMeta):
 
         self._req = None
 
+        #: The name of the router using the client, passed with every event.
+        self.router_name = None
+        self.hooks = {event: [] for event in EVENTS}
+        for event, callbacks in (hooks or {}).items():
+            for callback in callbacks if isinstance(callbacks, (list, tuple)) else [callbacks]:
+                self.add_hook(event, callback)
+
+    def add_hook(self, event, callback):
+        """
+        Registers a callback, which is called with a :class:`routingpy.hooks.Event` every time the client
+        emits the event, e.g. to feed a metrics system::
+
+            >>> router = Valhalla()
+            >>> router.client.add_hook("request_end", lambda event: histogram.observe(event.total))
+
+        Callbacks are called on the thread sending the request and must be thread-safe.
+
+        :param event: One of :data:`routingpy.hooks.EVENTS`.
+        :type event: str
+
+        :param callback: Called with the :class:`routingpy.hooks.Event`.
+        :type callback: callable
+        """
+        if event not in self.hooks:
+            raise ValueError("event must be one of {}.".format(", ".join(EVENTS)))
+        self.hooks[event].append(callback)
+
+    def remove_hook(self, event, callback):
+        """
+        Removes a callback registered with :meth:`add_hook`.
+
+        :param event: One of :data:`routingpy.hooks.EVENTS`.
+        :type event: str
+
+        :param callback: The registered callback.
+        :type callback: callable
+        """
+        self.hooks[event].remove(callback)
+
+    def _emit(self, event, **fields):
+        """Calls the event's callbacks, if there are any."""
+        callbacks = self.hooks[event]
+        if callbacks:
+            payload = Event(event, router=self.router_name, **fields)
+            for callback in callbacks:
+                callback(payload)
+
+    def _parse(self, parser, body, *args, **kwargs):
+        """
+        Passes the response body to a router's parser, replaces the result's raw response according to
+        ``keep_raw`` and emits the ``parse`` event.
+        """
+        content = None
+        if isinstance(body, ResponseBody):
+            body, content = body.body, body.content
+
+        started = time.perf_counter()
+        result = parser(body, *args, **kwargs)
+        if self.keep_raw != "full" and isinstance(body, (dict, list)):
+            if self.keep_raw == "bytes" and content is None:
+                # e.g. a response cached by a client which keeps the full raw responses
+                content = json.dumps(body).encode("utf-8")
+            retain_raw(result, self.keep_raw, body, content, self._loads)
+        if self.hooks["parse"]:
+            self._emit("parse", duration=time.perf_counter() - started)
+
+        return result
+
+    def _loads(self, content):
+        """Decodes a raw response body kept for ``keep_raw="bytes"``."""
+        return json.loads(content)
+
     @abstractmethod
     def _request(
         self,
@@ -161,6 +255,7 @@ class BaseClient(metaclass=ABCMeta):
         first_request_time=None,
         retry_counter=0,
         dry_run=None,
+        stream_to=None,
     ):
         """Performs HTTP GET/POST with credentials, returning the body as
         JSON.
@@ -184,6 +279,11 @@ class BaseClient(metaclass=ABCMeta):
         :param dry_run: If true, only prints URL and parameters. true or false.
         :type dry_run: bool
 
+        :param stream_to: A file path or a binary file object to write the response body to in chunks instead
+            of buffering it in memory, or :data:`STREAM_CHUNKS` to get an iterator over the chunks, which
+            releases the connection once it's exhausted or closed. The request bypasses the cache. Default None.
+        :type stream_to: str or os.PathLike or file object
+
         :raises routingpy.exceptions.RouterApiError: when the API returns an error due to faulty configuration.
         :raises routingpy.exceptions.RouterServerError: when the API returns a server error.
         :raises routingpy.exceptions.RouterError: when anything else happened while requesting.
@@ -197,6 +297,35 @@ class BaseClient(metaclass=ABCMeta):
         """
         pass
 
+    def _parse_response(self, parser, response, *args, **kwargs):
+        """Passes the response of :meth:`_request` to a router's parser and returns its result.
+
+        Clients whose :meth:`_request` doesn't return the response body directly (e.g. an awaitable)
+        override this to defer parsing until the body is available.
+
+        :param parser: The router's parser, e.g. :meth:`routingpy.routers.Valhalla.parse_direction_json`.
+        :type parser: callable
+
+        :param response: The return value of :meth:`_request`.
+
+        :param args: Additional positional arguments passed to the parser.
+
+        :param kwargs: Additional keyword arguments passed to the parser.
+
+        :returns: The parsed result, e.g. a :class:`routingpy.direction.Direction`.
+        """
+        return self._parse(parser, response, *args, **kwargs)
+
+    def _parse_stream(self, parser, response, *args, **kwargs):
+        """Like :meth:`_parse_response`, for parsers which return an iterator over a streamed response, see
+        :data:`STREAM_CHUNKS`. The response is read from the connection while the iterator is iterated over.
+
+        Clients which mustn't block on reading the response override this, e.g. to read it on a thread pool.
+
+        :returns: The parser's iterator.
+        """
+        return self._parse_response(parser, response, *args, **kwargs)
+
     @staticmethod
     def _generate_auth_url(path, params):
         """Returns the path and query string portion of the request URL, first
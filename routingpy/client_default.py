@@ -17,17 +17,140 @@
 
 import copy
 import json
-import random
+import os
+import socket
+import threading
 import time
 import warnings
+from concurrent import futures
 from datetime import datetime
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
 from . import exceptions
-from .client_base import _RETRIABLE_STATUSES, DEFAULT, BaseClient, options
+from .balancer import LoadBalancer
+from .cache import cache_key
+from .client_base import DEFAULT, STREAM_CHUNKS, BaseClient, options
+from .hooks import connection_timings
+from .json_codec import get_codec
+from .raw import ResponseBody
+from .retry import RetryPolicy
+from .single_flight import SingleFlight
 from .utils import get_ordinal
 
+#: Socket options which keep idle connections alive with TCP keep-alive probes, where the platform supports them.
+KEEPALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+]
+for _option, _value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 6)):
+    if hasattr(socket, _option):
+        KEEPALIVE_SOCKET_OPTIONS.append((socket.IPPROTO_TCP, getattr(socket, _option), _value))
+
+
+#: The size of the chunks streamed responses are written in.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class _TimedConnectionMixin(object):
+    """Records the connect time of new connections for the ``request_end`` event."""
+
+    def connect(self):
+        # Times urllib3's own connect, i.e. name resolution, the TCP connect and the TLS handshake
+        started = time.perf_counter()
+        super(_TimedConnectionMixin, self).connect()
+        connection_timings.connect = time.perf_counter() - started
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class PoolAdapter(HTTPAdapter):
+    """
+    A :class:`requests.adapters.HTTPAdapter` which additionally sets socket options on its connections, e.g.
+    TCP keep-alive probes for long-lived connections to a self-hosted router, and measures the connect
+    times of new connections.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["socket_options"]
+
+    def __init__(self, socket_options=None, **kwargs):
+        """
+        :param socket_options: Options set on each new socket as ``(level, option, value)`` tuples, see
+            :data:`KEEPALIVE_SOCKET_OPTIONS`. Default None, i.e. urllib3's defaults.
+        :type socket_options: list of tuple
+
+        :param kwargs: Arguments passed to :class:`requests.adapters.HTTPAdapter`, such as
+            ``pool_connections``, ``pool_maxsize`` and ``pool_block``.
+        :type kwargs: dict
+        """
+        self.socket_options = socket_options
+        super(PoolAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs["socket_options"] = self.socket_options
+        super(PoolAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+def create_session(pool_connections=10, pool_maxsize=10, pool_block=False, socket_options=None):
+    """
+    Creates a :class:`requests.Session` with a tuned connection pool, which can be shared by several routers,
+    e.g. for different profiles of the same self-hosted server.
+
+    >>> from routingpy import OSRM
+    >>> from routingpy.client_default import KEEPALIVE_SOCKET_OPTIONS, create_session
+    >>> session = create_session(pool_maxsize=32, socket_options=KEEPALIVE_SOCKET_OPTIONS)
+    >>> car = OSRM("http://localhost:5000", session=session)
+    >>> bike = OSRM("http://localhost:5001", session=session)
+
+    :param pool_connections: The number of hosts to keep connection pools for. Default 10.
+    :type pool_connections: int
+
+    :param pool_maxsize: The maximum number of connections kept per host. Default 10.
+    :type pool_maxsize: int
+
+    :param pool_block: If True, requests wait for a free connection once ``pool_maxsize`` connections are
+        in use, instead of opening extra connections which are discarded afterwards. Default False.
+    :type pool_block: bool
+
+    :param socket_options: Options set on each new socket as ``(level, option, value)`` tuples, e.g.
+        :data:`KEEPALIVE_SOCKET_OPTIONS`. Default None, i.e. urllib3's defaults.
+    :type socket_options: list of tuple
+
+    :rtype: :class:`requests.Session`
+    """
+    session = requests.Session()
+    adapter = PoolAdapter(
+        socket_options=socket_options,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
+
 
 class Client(BaseClient):
     """Default client class for requests handling, which is passed to each router. Uses the requests package."""
@@ -40,12 +163,27 @@ class Client(BaseClient):
         retry_timeout=None,
         retry_over_query_limit=None,
         skip_api_error=None,
+        hooks=None,
+        cache=None,
+        pool_connections=10,
+        pool_maxsize=10,
+        pool_block=False,
+        socket_options=None,
+        session=None,
+        retry_policy=None,
+        rate_limiter=None,
+        hedge_policy=None,
+        circuit_breaker=None,
+        single_flight=None,
+        json_codec=None,
+        keep_raw="full",
         **kwargs
     ):
         """
         :param base_url: The base URL for the request. All routers must provide a default.
-            Should not have a trailing slash.
-        :type base_url: string
+            Should not have a trailing slash. A list of base URLs or a :class:`routingpy.balancer.LoadBalancer`
+            distributes the requests across several replicas and fails over to healthy ones.
+        :type base_url: string or list of string or :class:`routingpy.balancer.LoadBalancer`
 
         :param user_agent: User-Agent to send with the requests to routing API.
             Overrides ``options.default_user_agent``.
@@ -68,11 +206,92 @@ class Client(BaseClient):
             encountered (e.g. no route found). If False, processing will discontinue and raise an error. Default False.
         :type skip_api_error: bool
 
+        :param hooks: Instrumentation callbacks by event name, e.g. ``{"request_end": callback}``, see
+            :meth:`routingpy.client_base.BaseClient.add_hook`.
+        :type hooks: dict
+
+        :param cache: A cache for the response bodies, e.g. :class:`routingpy.cache.MemoryCache`. Requests with
+            the same URL and body are then only sent once. ``dry_run`` requests bypass the cache.
+        :type cache: :class:`routingpy.cache.BaseCache`
+
+        :param pool_connections: The number of hosts to keep connection pools for. Default 10.
+        :type pool_connections: int
+
+        :param pool_maxsize: The maximum number of connections kept alive per host. Should be at least the
+            number of threads requesting concurrently. Default 10.
+        :type pool_maxsize: int
+
+        :param pool_block: If True, requests wait for a free connection once ``pool_maxsize`` connections are
+            in use, instead of opening extra connections which are discarded afterwards. Default False.
+        :type pool_block: bool
+
+        :param socket_options: Options set on each new socket as ``(level, option, value)`` tuples, e.g.
+            :data:`routingpy.client_default.KEEPALIVE_SOCKET_OPTIONS`. Default None, i.e. urllib3's defaults.
+        :type socket_options: list of tuple
+
+        :param session: A session to share with other clients, e.g. one created by
+            :func:`routingpy.client_default.create_session`. Its connection pool is used as is, so the pool
+            arguments are ignored. Default None, i.e. the client creates its own session.
+        :type session: :class:`requests.Session`
+
+        :param retry_policy: Decides which failed requests are retried and how long to wait in between,
+            honoring the ``Retry-After`` header. Default a :class:`routingpy.retry.RetryPolicy` retrying HTTP 503.
+        :type retry_policy: :class:`routingpy.retry.RetryPolicy`
+
+        :param rate_limiter: Paces the requests, including retries, at a provider's quota. Can be shared
+            between routers using the same API key.
+        :type rate_limiter: :class:`routingpy.ratelimit.RateLimiter`
+
+        :param hedge_policy: Sends a duplicate of requests which take longer than usual and uses the first
+            response. Default None, i.e. no hedging.
+        :type hedge_policy: :class:`routingpy.hedging.HedgePolicy`
+
+        :param circuit_breaker: Fails requests fast with :class:`routingpy.exceptions.CircuitOpen` while their
+            endpoint keeps failing. Can be shared between routers.
+        :type circuit_breaker: :class:`routingpy.circuit_breaker.CircuitBreaker`
+
+        :param single_flight: If True, identical requests, i.e. the same URL and body, which are already in
+            flight wait for the first one's response instead of being sent again. Pass a
+            :class:`routingpy.single_flight.SingleFlight` to share it between routers. Default None.
+        :type single_flight: bool or :class:`routingpy.single_flight.SingleFlight`
+
+        :param json_codec: Decodes JSON responses from their raw bytes and encodes JSON request bodies, e.g.
+            "orjson" or "auto" for the fastest installed library, see :func:`routingpy.json_codec.get_codec`.
+            Default None, i.e. the requests package's standard library decoding and encoding.
+        :type json_codec: str or :class:`routingpy.json_codec.JSONCodec`
+
+        :param keep_raw: How parsed results keep the raw response: "full" as decoded JSON, "none" not at all,
+            e.g. for large batches, or "bytes" as the undecoded response body, which is decoded on first access
+            to ``raw``. With "bytes", the ``cache`` holds the undecoded bodies too. Default "full".
+        :type keep_raw: str
+
         :param kwargs: Additional arguments, such as headers or proxies.
         :type kwargs: dict
         """
 
-        self._session = requests.Session()
+        self.balancer = None
+        if isinstance(base_url, LoadBalancer):
+            self.balancer = base_url
+        elif isinstance(base_url, (list, tuple)):
+            self.balancer = LoadBalancer(base_url)
+        if self.balancer is not None:
+            # Used for cache keys and dry runs
+            base_url = self.balancer.base_urls[0]
+
+        self._own_session = session is None
+        self._session = session or create_session(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            socket_options=socket_options,
+        )
+        self.cache = cache
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.hedge_policy = hedge_policy
+        self.circuit_breaker = circuit_breaker
+        self.single_flight = SingleFlight() if single_flight is True else (single_flight or None)
+        self.json_codec = get_codec(json_codec) if isinstance(json_codec, str) else json_codec
         super(Client, self).__init__(
             base_url,
             user_agent=user_agent,
@@ -80,6 +299,8 @@ class Client(BaseClient):
             retry_timeout=retry_timeout,
             retry_over_query_limit=retry_over_query_limit,
             skip_api_error=skip_api_error,
+            hooks=hooks,
+            keep_raw=keep_raw,
             **kwargs
         )
 
@@ -104,6 +325,7 @@ class Client(BaseClient):
         first_request_time=None,
         retry_counter=0,
         dry_run=None,
+        stream_to=None,
     ):
         """Performs HTTP GET/POST with credentials, returning the body as
         JSON.
@@ -127,37 +349,81 @@ class Client(BaseClient):
         :param dry_run: If true, only prints URL and parameters. true or false.
         :type dry_run: bool
 
+        :param stream_to: A file path or a binary file object to write the response body to in chunks instead
+            of buffering it in memory, or :data:`routingpy.client_base.STREAM_CHUNKS` to get an iterator over
+            the chunks, which releases the connection once it's exhausted or closed. The request bypasses the
+            cache. Default None.
+        :type stream_to: str or os.PathLike or file object
+
         :raises routingpy.exceptions.RouterApiError: when the API returns an error due to faulty configuration.
         :raises routingpy.exceptions.RouterServerError: when the API returns a server error.
         :raises routingpy.exceptions.RouterError: when anything else happened while requesting.
         :raises routingpy.exceptions.JSONParseError: when the JSON response can't be parsed.
         :raises routingpy.exceptions.Timeout: when the request timed out.
+        :raises routingpy.exceptions.CircuitOpen: when the circuit breaker of the endpoint is open.
         :raises routingpy.exceptions.TransportError: when something went wrong while trying to
             execute a request.
 
-        :returns: raw JSON response or GeoTIFF image
-        :rtype: dict or bytes
+        :returns: raw JSON response or GeoTIFF image, or ``stream_to`` if the body was written to it, or an
+            iterator over the chunks of the body
+        :rtype: dict or bytes or str or os.PathLike or file object or iterator
         """
 
         if not first_request_time:
             first_request_time = datetime.now()
 
-        elapsed = datetime.now() - first_request_time
-        if elapsed > self.retry_timeout:
-            raise exceptions.Timeout()
-
-        if retry_counter > 0:
-            # 0.5 * (1.5 ^ i) is an increased sleep time of 1.5x per iteration,
-            # starting at 0.5s when retry_counter=1. The first retry will occur
-            # at 1, so subtract that first.
-            delay_seconds = 1.5 ** (retry_counter - 1)
+        authed_url = self._generate_auth_url(url, get_params)
 
-            # Jitter this value by 50% and pause.
-            time.sleep(delay_seconds * (random.random() + 0.5))
+        key = None
+        if (
+            (self.cache is not None or self.single_flight is not None)
+            and not dry_run
+            and stream_to is None
+        ):
+            key = cache_key(
+                "GET" if post_params is None else "POST", self.base_url + authed_url, post_params
+            )
+        if self.cache is not None and key is not None and retry_counter == 0:
+            body = self.cache.get(key)
+            if body is not None:
+                if isinstance(body, bytes):
+                    # Cached as its content by a client with keep_raw="bytes", or an image
+                    return self._cached_content(body)
+                return body
+
+        if self.single_flight is not None and key is not None and retry_counter == 0:
+            # Identical requests in flight wait for the first one's response
+            return self.single_flight.do(
+                key,
+                self._send_request,
+                url,
+                authed_url,
+                post_params,
+                first_request_time,
+                retry_counter,
+                dry_run,
+                key,
+            )
 
-        authed_url = self._generate_auth_url(url, get_params)
+        return self._send_request(
+            url, authed_url, post_params, first_request_time, retry_counter, dry_run, key, stream_to
+        )
 
+    def _send_request(
+        self,
+        url,
+        authed_url,
+        post_params,
+        first_request_time,
+        retry_counter,
+        dry_run,
+        key,
+        stream_to=None,
+    ):
+        """Sends the request, retrying it according to the retry policy, and caches the response body."""
         final_requests_kwargs = copy.copy(self.kwargs)
+        if stream_to is not None:
+            final_requests_kwargs["stream"] = True
 
         # Determine GET/POST.
         requests_method = self._session.get
@@ -178,66 +444,347 @@ class Client(BaseClient):
             )
             return
 
-        try:
-            response = requests_method(self.base_url + authed_url, **final_requests_kwargs)
-            self._req = response.request
+        if self.json_codec is not None and "json" in final_requests_kwargs:
+            final_requests_kwargs["data"] = self.json_codec.dumps(final_requests_kwargs.pop("json"))
+
+        policy = self.retry_policy
+        if retry_counter == 0:
+            policy.record_request()
+
+        delay = None
+        # Endpoints of the load balancer which failed since the last retry
+        failed_endpoints = []
+        while True:
+            if datetime.now() - first_request_time > self.retry_timeout:
+                raise exceptions.Timeout()
+
+            if self.rate_limiter is not None:
+                self._wait_for_rate_limiter(url)
+
+            # Streamed responses aren't hedged, the losing one would hold a connection until it's read
+            if self.hedge_policy is not None and stream_to is None and self.hedge_policy.applies(url):
+                endpoint, response, error = self._send_hedged(
+                    requests_method,
+                    url,
+                    authed_url,
+                    final_requests_kwargs,
+                    failed_endpoints,
+                    retry_counter,
+                )
+            else:
+                endpoint, response, error = self._send(
+                    requests_method,
+                    self._acquire_endpoint(failed_endpoints),
+                    authed_url,
+                    final_requests_kwargs,
+                    retry_counter,
+                )
 
-        except requests.exceptions.Timeout:
-            raise exceptions.Timeout()
+            if error is not None:
+                if endpoint is not None and self._fail_over(endpoint, failed_endpoints):
+                    continue
+                if isinstance(error, requests.exceptions.Timeout):
+                    raise exceptions.Timeout()
+                raise error
 
-        tried = retry_counter + 1
+            self._req = response.request
+            if (
+                endpoint is not None
+                and response.status_code >= 500
+                and self._fail_over(endpoint, failed_endpoints)
+            ):
+                response.close()
+                continue
+
+            tried = retry_counter + 1
+
+            if policy.is_retriable(response.status_code):
+                message = "Server down.\nRetrying for the {}{} time."
+                error = None
+            else:
+                try:
+                    body = self._get_body(response, stream_to)
+
+                except exceptions.RouterApiError:
+                    if self.skip_api_error:
+                        warnings.warn(
+                            "Router {} returned an API error with "
+                            "the following message:\n{}".format(self.__class__.__name__, response.text)
+                        )
+                        return
+
+                    raise
+
+                except exceptions.RetriableRequest as e:
+                    if isinstance(e, exceptions.OverQueryLimit) and not self.retry_over_query_limit:
+                        raise
+
+                    message = "Rate limit exceeded.\nRetrying for the {}{} time."
+                    error = e
+
+                else:
+                    if self.cache is not None and key is not None:
+                        # Caches the undecoded content for keep_raw="bytes", so hits don't encode it again
+                        self.cache.set(key, response.content if self.keep_raw == "bytes" else body)
+                    if self.keep_raw == "bytes" and isinstance(body, (dict, list)):
+                        return ResponseBody(body, response.content)
+
+                    return body
+
+            if not policy.allow_retry(tried):
+                if error is not None:
+                    raise error
+                # Raises the server error
+                return self._get_body(response)
+
+            retry_after = policy.retry_after(response)
+            delay = policy.next_delay(delay, retry_after)
+            remaining = (first_request_time + self.retry_timeout - datetime.now()).total_seconds()
+            if delay > remaining:
+                # Don't wait for the server if it only accepts requests after the retry timeout
+                if retry_after is not None and policy.respect_retry_after:
+                    raise exceptions.Timeout()
+                delay = max(remaining, 0)
+
+            warnings.warn(message.format(tried, get_ordinal(tried)), UserWarning)
+            self._emit(
+                "retry",
+                endpoint=endpoint.url if endpoint is not None else self.base_url,
+                url=url.split("?")[0],
+                retry_count=tried,
+                status=response.status_code,
+                duration=delay,
+                error=error,
+            )
+            # Releases the connection of a streamed response
+            response.close()
+            time.sleep(delay)
+            retry_counter = tried
+            failed_endpoints = []
+
+    def _wait_for_rate_limiter(self, url):
+        """Waits for the rate limiter and emits the ``rate_limit_sleep`` event if it had to."""
+        waited = self.rate_limiter.acquire(url)
+        if waited > 0:
+            self._emit(
+                "rate_limit_sleep", endpoint=self.base_url, url=url.split("?")[0], duration=waited
+            )
 
-        if response.status_code in _RETRIABLE_STATUSES:
-            # Retry request.
-            warnings.warn(
-                "Server down.\nRetrying for the {}{} time.".format(tried, get_ordinal(tried)),
-                UserWarning,
+    def _acquire_endpoint(self, exclude):
+        """Selects the load balancer's endpoint for an attempt, None without a load balancer."""
+        if self.balancer is None:
+            return None
+        return self.balancer.acquire(exclude=exclude)
+
+    def _send(self, requests_method, endpoint, authed_url, requests_kwargs, retry_counter=0):
+        """
+        Sends a single attempt to the endpoint or the base URL and records its outcome.
+        Returns the endpoint, the response and the timeout, connection error or open circuit.
+        """
+        base_url = endpoint.url if endpoint is not None else self.base_url
+        circuit = None
+        if self.circuit_breaker is not None:
+            circuit = self.circuit_breaker.key(base_url, authed_url)
+            try:
+                self.circuit_breaker.before_request(circuit)
+            except exceptions.CircuitOpen as e:
+                if endpoint is not None:
+                    self.balancer.cancel(endpoint)
+                return endpoint, None, e
+
+        event = None
+        if self.hooks["request_start"] or self.hooks["request_end"]:
+            event = dict(
+                endpoint=base_url,
+                url=authed_url.split("?")[0],
+                method=requests_method.__name__.upper(),
+                retry_count=retry_counter,
             )
-            return self._request(url, get_params, post_params, first_request_time, retry_counter + 1)
+            connection_timings.connect = None
+            self._emit("request_start", **event)
 
+        started = time.monotonic()
         try:
-            return self._get_body(response)
+            response = requests_method(base_url + authed_url, **requests_kwargs)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            if endpoint is not None:
+                self.balancer.release(endpoint, failed=True)
+            if circuit is not None:
+                self.circuit_breaker.record_failure(circuit)
+            if event is not None:
+                self._emit("request_end", total=time.monotonic() - started, error=e, **event)
+            return endpoint, None, e
+        except BaseException as e:
+            # e.g. TooManyRedirects or ChunkedEncodingError, which must not keep a half-open circuit's probe
+            if endpoint is not None:
+                self.balancer.cancel(endpoint)
+            if circuit is not None:
+                self.circuit_breaker.record_failure(circuit)
+            if event is not None:
+                self._emit("request_end", total=time.monotonic() - started, error=e, **event)
+            raise
+
+        latency = time.monotonic() - started
+        if event is not None:
+            body = response.request.body
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+            self._emit(
+                "request_end",
+                status=response.status_code,
+                connect=connection_timings.connect,
+                ttfb=response.elapsed.total_seconds(),
+                total=latency,
+                bytes_sent=len(body) if body is not None else 0,
+                bytes_received=(
+                    len(response.content)
+                    if not requests_kwargs.get("stream")
+                    else int(response.headers.get("content-length", 0)) or None
+                ),
+                **event
+            )
+        failed = response.status_code >= 500
+        if endpoint is not None:
+            self.balancer.release(endpoint, latency, failed)
+        if circuit is not None:
+            if failed:
+                self.circuit_breaker.record_failure(circuit)
+            else:
+                self.circuit_breaker.record_success(circuit)
+        if self.hedge_policy is not None:
+            self.hedge_policy.observe(latency)
 
-        except exceptions.RouterApiError:
-            if self.skip_api_error:
-                warnings.warn(
-                    "Router {} returned an API error with "
-                    "the following message:\n{}".format(self.__class__.__name__, response.text)
+        return endpoint, response, None
+
+    def _send_hedged(self, requests_method, url, authed_url, requests_kwargs, exclude, retry_counter=0):
+        """
+        Sends an attempt and, if it doesn't complete within the hedge policy's delay, a duplicate to
+        another endpoint if possible. Returns the first successful result.
+        """
+        hedge_policy = self.hedge_policy
+        delay = hedge_policy.hedge_delay()
+        endpoint = self._acquire_endpoint(exclude)
+        if delay is None:
+            return self._send(requests_method, endpoint, authed_url, requests_kwargs, retry_counter)
+
+        # The primary doesn't queue for the pool, so it's only hedged if the endpoint itself is slow
+        primary = futures.Future()
+
+        def send_primary():
+            try:
+                primary.set_result(
+                    self._send(requests_method, endpoint, authed_url, requests_kwargs, retry_counter)
                 )
-                return
+            except BaseException as e:
+                primary.set_exception(e)
 
-            raise
+        threading.Thread(target=send_primary, name="routingpy-hedge-primary", daemon=True).start()
+        try:
+            return primary.result(timeout=delay)
+        except futures.TimeoutError:
+            pass
 
-        except exceptions.RetriableRequest as e:
-            if isinstance(e, exceptions.OverQueryLimit) and not self.retry_over_query_limit:
-                raise
+        if not hedge_policy.allow_hedge():
+            return primary.result()
+
+        if self.rate_limiter is not None:
+            self._wait_for_rate_limiter(url)
+        hedge_endpoint = None
+        if self.balancer is not None:
+            hedge_endpoint = self.balancer.acquire(
+                exclude=list(exclude) + [endpoint]
+            ) or self.balancer.acquire(exclude=exclude)
+        hedge = hedge_policy.executor.submit(
+            self._send, requests_method, hedge_endpoint, authed_url, requests_kwargs, retry_counter
+        )
 
-            warnings.warn(
-                "Rate limit exceeded.\nRetrying for the {}{} time.".format(tried, get_ordinal(tried)),
-                UserWarning,
-            )
-            # Retry request.
-            return self._request(url, get_params, post_params, first_request_time, retry_counter + 1)
+        # The other request keeps running in the background and its result is ignored
+        pending = {primary, hedge}
+        result = None
+        while pending:
+            done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                _, response, error = future.result()
+                if error is None and response.status_code < 500:
+                    if future is hedge:
+                        hedge_policy.record_win()
+                    return future.result()
+                if result is None or future is primary:
+                    result = future.result()
+
+        return result
+
+    def _fail_over(self, endpoint, failed_endpoints):
+        """Excludes a failed endpoint from the request and returns whether another endpoint is left."""
+        failed_endpoints.append(endpoint)
+        if len(failed_endpoints) >= len(self.balancer):
+            return False
+
+        warnings.warn(
+            "Endpoint {} failed.\nFailing over to another endpoint.".format(endpoint.url), UserWarning
+        )
+        return True
+
+    def _loads(self, content):
+        if self.json_codec is not None:
+            return self.json_codec.loads(content)
+        return super(Client, self)._loads(content)
+
+    @staticmethod
+    def _iter_stream(response):
+        """Yields the chunks of a streamed response body and releases the connection afterwards."""
+        with response:
+            yield from response.iter_content(STREAM_CHUNK_SIZE)
+
+    @staticmethod
+    def _write_stream(response, stream_to):
+        """Writes a streamed response body to a file path or a binary file object in chunks."""
+        with response:
+            if isinstance(stream_to, (str, os.PathLike)):
+                with open(stream_to, "wb") as f:
+                    for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                        f.write(chunk)
+            else:
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    stream_to.write(chunk)
+
+        return stream_to
 
     @property
     def req(self):
         """Holds the :class:`requests.PreparedRequest` property for the last request."""
         return self._req
 
-    @staticmethod
-    def _get_body(response):
+    def _cached_content(self, content):
+        """Decodes a response cached as its content, which clients with ``keep_raw="bytes"`` do."""
+        try:
+            body = self._loads(content)
+        except ValueError:
+            # e.g. a GeoTIFF image
+            return content
+
+        return ResponseBody(body, content) if self.keep_raw == "bytes" else body
+
+    def _get_body(self, response, stream_to=None):
         status_code = response.status_code
         content_type = response.headers["content-type"]
 
         if status_code == 200:
+            if stream_to is STREAM_CHUNKS:
+                return self._iter_stream(response)
+            if stream_to is not None:
+                return self._write_stream(response, stream_to)
+
             if content_type == "image/tiff":
                 return response.content
 
             else:
                 try:
+                    if self.json_codec is not None:
+                        return self.json_codec.loads(response.content)
                     return response.json()
 
-                except json.decoder.JSONDecodeError:
+                except ValueError:
                     raise exceptions.JSONParseError(
                         "Can't decode JSON response:{}".format(response.text)
                     )
@@ -17,6 +17,9 @@
 """Converts Python types to string representations suitable for GET queries.
 """
 import datetime
+from urllib.parse import quote
+
+from . import utils
 
 
 def delimit_list(arg, delimiter=","):
@@ -55,6 +58,43 @@ def format_float(arg):
     return "{}".format(round(float(arg), 6)).rstrip("0").rstrip(".")
 
 
+def format_coordinates(locations, coordinate_encoding=None, quote_polyline=True):
+    """Formats locations as OSRM-style coordinates string.
+
+    For example:
+
+    format_coordinates([[8.68, 49.42], [8.69, 49.41]]) -> "8.68,49.42;8.69,49.41"
+    format_coordinates([[8.68, 49.42], [8.69, 49.41]], "polyline6") -> "polyline6(_mjg%7DA_cxpO~oR_pR)"
+
+    :param locations: The lng/lat coordinates.
+    :type locations: list of list
+
+    :param coordinate_encoding: Encode the coordinates as polyline, which is 3-4 times shorter.
+        One of [None, "polyline", "polyline6"]. Default None.
+    :type coordinate_encoding: str
+
+    :param quote_polyline: URL-quote the polyline, as needed in URL paths. Default True.
+    :type quote_polyline: bool
+
+    :rtype: string
+    """
+    if coordinate_encoding is None:
+        return delimit_list([delimit_list([format_float(f) for f in pair]) for pair in locations], ";")
+
+    if coordinate_encoding == "polyline":
+        encoded = utils.encode_polyline5(locations)
+    elif coordinate_encoding == "polyline6":
+        encoded = utils.encode_polyline6(locations)
+    else:
+        raise ValueError(
+            "coordinate_encoding must be one of None, 'polyline' or 'polyline6', not {}.".format(
+                coordinate_encoding
+            )
+        )
+
+    return "{}({})".format(coordinate_encoding, quote(encoded, safe="") if quote_polyline else encoded)
+
+
 def is_list(arg):
     """Checks if arg is list-like."""
     if isinstance(arg, dict):
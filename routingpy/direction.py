@@ -17,7 +17,80 @@
 """
 :class:`.Direction` returns directions results.
 """
-from typing import List, Optional
+from typing import Callable, List, Optional, Sequence, Union
+
+from .raw import RawBody
+
+#: The values of the routers' ``decode_geometry`` argument.
+DECODE_GEOMETRY = (True, False, "lazy")
+
+
+class EncodedGeometry(object):
+    """
+    The geometry of a route as encoded polylines, e.g. one per leg, which are only decoded and concatenated
+    on first access to :attr:`Direction.geometry`.
+    """
+
+    __slots__ = ("polylines", "decoder")
+
+    def __init__(self, polylines: Union[str, Sequence[str]], decoder: Callable):
+        """
+        :param polylines: The encoded polyline or the encoded polylines of the route's legs or steps.
+        :type polylines: str or list of str
+
+        :param decoder: Decodes a single polyline, e.g. :func:`routingpy.utils.decode_polyline6`.
+        :type decoder: callable
+        """
+        self.polylines = [polylines] if isinstance(polylines, str) else list(polylines)
+        self.decoder = decoder
+
+    @classmethod
+    def parse(
+        cls,
+        polylines: Union[str, Sequence[str]],
+        decoder: Callable,
+        decode_geometry: Union[bool, str] = True,
+    ):
+        """
+        Decodes the polylines according to a router's ``decode_geometry`` argument.
+
+        :param polylines: The encoded polyline or the encoded polylines of the route's legs or steps.
+        :type polylines: str or list of str
+
+        :param decoder: Decodes a single polyline.
+        :type decoder: callable
+
+        :param decode_geometry: True to decode right away, "lazy" to decode on first access or False to skip
+            the geometry.
+        :type decode_geometry: bool or str
+
+        :returns: The decoded geometry, an :class:`EncodedGeometry` for "lazy" or None for False.
+        :rtype: list or :class:`EncodedGeometry` or None
+        """
+        if decode_geometry not in DECODE_GEOMETRY:
+            raise ValueError("decode_geometry must be one of True, False and 'lazy'.")
+        if not decode_geometry:
+            return None
+
+        geometry = cls(polylines, decoder)
+        return geometry if decode_geometry == "lazy" else geometry.decode()
+
+    def decode(self) -> List[List[float]]:
+        """
+        Decodes and concatenates the polylines.
+
+        :rtype: list
+        """
+        if len(self.polylines) == 1:
+            return self.decoder(self.polylines[0])
+
+        geometry = []
+        for polyline in self.polylines:
+            geometry.extend(self.decoder(polyline))
+        return geometry
+
+    def __repr__(self):  # pragma: no cover
+        return "EncodedGeometry({})".format(self.polylines)
 
 
 class Directions(object):
@@ -26,6 +99,8 @@ class Directions(object):
     response, which can be accessed via the property ``raw``.
     """
 
+    __slots__ = ("_directions", "_raw")
+
     def __init__(self, directions=None, raw=None):
         """
         Initialize a :class:`Directions` instance to hold multiple :class:`Direction` instances in a list-like fashion.
@@ -45,6 +120,8 @@ class Directions(object):
         Returns the directions raw, unparsed response. For details, consult the routing engine's API documentation.
         :rtype: dict or None
         """
+        if isinstance(self._raw, RawBody):
+            self._raw = self._raw.decode()
         return self._raw
 
     def __repr__(self):  # pragma: no cover
@@ -65,12 +142,15 @@ class Direction(object):
     Contains a parsed directions' response. Access via properties ``geometry``, ``duration`` and ``distance``.
     """
 
+    __slots__ = ("_geometry", "_duration", "_distance", "_raw")
+
     def __init__(self, geometry=None, duration=None, distance=None, raw=None):
         """
         Initialize a :class:`Direction` object to hold the properties of a directions request.
 
-        :param geometry: The geometry list in [[lon1, lat1], [lon2, lat2]] order.
-        :type geometry: list of list
+        :param geometry: The geometry list in [[lon1, lat1], [lon2, lat2]] order, or the encoded geometry to be
+            decoded on first access.
+        :type geometry: list of list or :class:`EncodedGeometry`
 
         :param duration: The duration of the direction in seconds.
         :type duration: int or float
@@ -90,10 +170,13 @@ class Direction(object):
     @property
     def geometry(self) -> Optional[List[List[float]]]:
         """
-        The geometry of the route as [[lon1, lat1], [lon2, lat2], ...] list.
+        The geometry of the route as [[lon1, lat1], [lon2, lat2], ...] list. An encoded geometry is decoded
+        on first access.
 
         :rtype: list or None
         """
+        if isinstance(self._geometry, EncodedGeometry):
+            self._geometry = self._geometry.decode()
         return self._geometry
 
     @property
@@ -139,6 +222,8 @@ class Direction(object):
 
         :rtype: dict or None
         """
+        if isinstance(self._raw, RawBody):
+            self._raw = self._raw.decode()
         return self._raw
 
     def __repr__(self):  # pragma: no cover
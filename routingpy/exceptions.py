@@ -71,3 +71,14 @@ class OverQueryLimit(RouterError, RetriableRequest):
     """
 
     pass
+
+
+class CircuitOpen(Exception):
+    """Signifies that the request wasn't sent, because the circuit breaker of its endpoint is open."""
+
+    def __init__(self, key, retry_after=None):
+        self.key = key
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return "Circuit for {} is open, retry in {:.1f}s".format(self.key, self.retry_after or 0.0)
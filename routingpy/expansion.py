@@ -17,7 +17,18 @@
 """
 :class:`Expansion` returns expansion results.
 """
-from typing import List, Optional, Tuple, Union
+import math
+from array import array
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .raw import RawBody
+
+#: The typecodes of the numeric columns of :class:`ColumnarExpansions` by expansion property.
+COLUMN_TYPES = {"distance": "d", "duration": "d", "cost": "d", "edge_id": "q", "pred_edge_id": "q"}
+
+#: The values which stand in for missing expansion properties in the columns by typecode.
+MISSING_VALUES = {"d": math.nan, "q": -1}
 
 
 class Edge:
@@ -27,6 +38,8 @@ class Edge:
     ``pred_edge_id``, ``edge_status``.
     """
 
+    __slots__ = ("_geometry", "_distance", "_duration", "_cost", "_edge_id", "_pred_edge_id", "_status")
+
     def __init__(
         self,
         geometry=None,
@@ -110,7 +123,9 @@ class Edge:
         return self._status
 
     def __repr__(self):  # pragma: no cover
-        return "Edge({})".format(", ".join([f"{k[1:]}: {v}" for k, v in vars(self).items() if v]))
+        return "Edge({})".format(
+            ", ".join([f"{k[1:]}: {getattr(self, k)}" for k in self.__slots__ if getattr(self, k)])
+        )
 
 
 class Expansions:
@@ -119,6 +134,8 @@ class Expansions:
     the complete raw response of the expansion request.
     """
 
+    __slots__ = ("_edges", "_center", "_interval_type", "_raw")
+
     def __init__(
         self,
         edges: Optional[List[Edge]] = None,
@@ -139,6 +156,8 @@ class Expansions:
 
         :rtype: dict or None
         """
+        if isinstance(self._raw, RawBody):
+            self._raw = self._raw.decode()
         return self._raw
 
     @property
@@ -160,12 +179,13 @@ class Expansions:
         return self._interval_type
 
     def __repr__(self):  # pragma: no cover
-        if len(self._edges) < 10:
-            return "Expansions({}, {})".format(self._edges, self.raw)
+        if len(self) < 10:
+            return "{}({}, {})".format(type(self).__name__, self[:], self.raw)
         else:
-            return "Expansions({}, ..., {})".format(
-                ", ".join([str(e) for e in self._edges[:3]]),
-                ", ".join(str(e) for e in self._edges[-3:]),
+            return "{}({}, ..., {})".format(
+                type(self).__name__,
+                ", ".join([str(e) for e in self[:3]]),
+                ", ".join(str(e) for e in self[-3:]),
             )
 
     def __getitem__(self, item):
@@ -176,3 +196,150 @@ class Expansions:
 
     def __len__(self):
         return len(self._edges)
+
+
+class ColumnarExpansions(Expansions):
+    """
+    Contains the edges of an expansion in flat typed arrays instead of one :class:`Edge` per edge: the
+    coordinates of all edges in one buffer, the offsets of each edge's first point and one column per
+    expansion property. The ``edge_status`` column holds codes into :attr:`status_categories`.
+
+    Iterating over it or accessing it by index creates :class:`Edge` objects on demand. The arrays support the
+    buffer protocol, so e.g. ``numpy.frombuffer(expansions.coordinates).reshape(-1, 2)`` views the coordinates
+    without copying them. Use the client option ``keep_raw="none"`` to drop the raw response as well.
+    """
+
+    __slots__ = ("_coordinates", "_offsets", "_columns", "_status_categories")
+
+    def __init__(
+        self,
+        coordinates: Optional[array] = None,
+        offsets: Optional[array] = None,
+        columns: Optional[Dict[str, array]] = None,
+        status_categories: Optional[Sequence[str]] = None,
+        center: Optional[Union[List[float], Tuple[float]]] = None,
+        interval_type: Optional[str] = None,
+        raw: Optional[dict] = None,
+    ):
+        super(ColumnarExpansions, self).__init__(None, center, interval_type, raw)
+        self._coordinates = coordinates if coordinates is not None else array("d")
+        self._offsets = offsets if offsets is not None else array("q", [0])
+        self._columns = columns or {}
+        self._status_categories = tuple(status_categories or ())
+
+    @classmethod
+    def from_features(
+        cls,
+        features: Iterable[dict],
+        expansion_properties: Optional[Sequence[str]] = None,
+        center: Optional[Union[List[float], Tuple[float]]] = None,
+        interval_type: Optional[str] = None,
+        raw: Optional[dict] = None,
+    ) -> "ColumnarExpansions":
+        """
+        Builds the columns from the GeoJSON features of an expansion response.
+
+        :param features: The LineString features of the edges.
+        :type features: list of dict
+
+        :param expansion_properties: The properties of the features to keep, e.g. ["duration", "edge_status"].
+        :type expansion_properties: list of str
+
+        :rtype: :class:`ColumnarExpansions`
+        """
+        coordinates = array("d")
+        offsets = array("q", [0])
+        columns = {
+            name: array(COLUMN_TYPES[name])
+            for name in expansion_properties or ()
+            if name in COLUMN_TYPES
+        }
+        statuses = array("H") if "edge_status" in (expansion_properties or ()) else None
+        categories = {}
+
+        for feature in features:
+            coordinates.extend(chain.from_iterable(feature["geometry"]["coordinates"]))
+            offsets.append(len(coordinates) // 2)
+            properties = feature.get("properties") or {}
+            for name, column in columns.items():
+                value = properties.get(name)
+                column.append(MISSING_VALUES[column.typecode] if value is None else value)
+            if statuses is not None:
+                # A missing status becomes the category None
+                statuses.append(categories.setdefault(properties.get("edge_status"), len(categories)))
+
+        if statuses is not None:
+            columns["edge_status"] = statuses
+
+        return cls(coordinates, offsets, columns, list(categories), center, interval_type, raw)
+
+    @property
+    def coordinates(self) -> array:
+        """
+        The coordinates of all edges as flat [lon1, lat1, lon2, lat2, ...] array of doubles.
+
+        :rtype: array.array
+        """
+        return self._coordinates
+
+    @property
+    def offsets(self) -> array:
+        """
+        The index of each edge's first point in :attr:`coordinates`, counted in points, followed by the total
+        number of points. The points of edge ``i`` are ``offsets[i]`` up to ``offsets[i + 1]``.
+
+        :rtype: array.array
+        """
+        return self._offsets
+
+    @property
+    def columns(self) -> Dict[str, array]:
+        """
+        The typed arrays of the requested expansion properties by name, one value per edge. Distances,
+        durations and costs are doubles, edge IDs 64 bit integers and ``edge_status`` the codes of
+        :attr:`status_categories`. Missing values are NaN and -1 respectively, see :data:`MISSING_VALUES`.
+
+        :rtype: dict
+        """
+        return self._columns
+
+    @property
+    def status_categories(self) -> Tuple[str, ...]:
+        """
+        The distinct edge states, e.g. ("r", "s"), indexed by the codes of the ``edge_status`` column.
+
+        :rtype: tuple of str
+        """
+        return self._status_categories
+
+    def _edge(self, index):
+        start, end = self._offsets[index], self._offsets[index + 1]
+        coordinates = self._coordinates
+        properties = {}
+        for name, column in self._columns.items():
+            value = column[index]
+            if name == "edge_status":
+                value = self._status_categories[value]
+            elif column.typecode == "d" and math.isnan(value) or column.typecode == "q" and value == -1:
+                value = None
+            properties[name] = value
+
+        return Edge(
+            geometry=[[coordinates[2 * i], coordinates[2 * i + 1]] for i in range(start, end)],
+            **properties,
+        )
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._edge(index) for index in range(*item.indices(len(self)))]
+
+        length = len(self)
+        if not -length <= item < length:
+            raise IndexError("Edge index out of range.")
+        return self._edge(item % length)
+
+    def __iter__(self):
+        return (self._edge(index) for index in range(len(self)))
+
+    def __len__(self):
+        return len(self._offsets) - 1
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Hedged requests, which cut the tail latency by sending a duplicate of a slow request.
+"""
+import math
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Sequence
+
+
+class HedgePolicy(object):
+    """
+    Decides when a client sends a duplicate of a request which hasn't completed yet. The first successful
+    response wins, the other one is ignored.
+
+    A request is hedged after ``delay`` seconds or, by default, after the ``percentile`` of the latencies
+    observed so far, so only the slowest requests are duplicated. With a
+    :class:`routingpy.balancer.LoadBalancer`, the duplicate is sent to another endpoint.
+
+    >>> from routingpy import Valhalla
+    >>> from routingpy.hedging import HedgePolicy
+    >>> router = Valhalla(["http://valhalla-1:8002", "http://valhalla-2:8002"], hedge_policy=HedgePolicy())
+
+    Hedges are limited to ``budget_ratio`` of the requests, so they can't double the load. Only requests to
+    the URL paths in ``paths`` are hedged; all routers' endpoints are read-only queries, so by default every
+    request may be hedged.
+
+    The hedges run on the policy's thread pool, which can be shared by several clients. The original request
+    starts right away on a thread of its own, so it never waits for the pool and is only hedged if the
+    endpoint is slow.
+    """
+
+    def __init__(
+        self,
+        delay: Optional[float] = None,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        budget_ratio: float = 0.1,
+        paths: Optional[Sequence[str]] = None,
+        max_workers: int = 32,
+        window: int = 1000,
+    ):
+        """
+        :param delay: The number of seconds after which a request is hedged. Default None, i.e. the
+            ``percentile`` of the observed latencies.
+        :type delay: float
+
+        :param percentile: The percentile of the observed latencies after which a request is hedged, if no
+            ``delay`` is given. Default 0.95.
+        :type percentile: float
+
+        :param min_samples: The number of latencies to observe before hedging by ``percentile``. Default 20.
+        :type min_samples: int
+
+        :param budget_ratio: The maximum ratio of hedges to requests. Default 0.1.
+        :type budget_ratio: float
+
+        :param paths: URL path prefixes of the idempotent endpoints which may be hedged, e.g. ``["/route"]``.
+            Default None, i.e. all.
+        :type paths: list of str
+
+        :param max_workers: The size of the thread pool running hedged requests. Default 32.
+        :type max_workers: int
+
+        :param window: The number of latest latencies the percentile is computed from. Default 1000. The
+            percentile is recomputed once 5% of them are new, so a request doesn't sort the whole window.
+        :type window: int
+        """
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.budget_ratio = budget_ratio
+        self.paths = tuple(paths) if paths is not None else None
+        self.max_workers = max_workers
+
+        self.requests = 0
+        self.hedges = 0
+        self.wins = 0
+        self._latencies = deque(maxlen=window)
+        # The percentile of the latencies and the number of latencies observed since it was computed
+        self._percentile_delay = None
+        self._stale = 0
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The thread pool running hedged requests, created on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="routingpy-hedge"
+                )
+            return self._executor
+
+    def applies(self, url: str) -> bool:
+        """
+        Whether requests to this URL path may be hedged.
+
+        :param url: The request's URL path after the base URL.
+        :type url: str
+
+        :rtype: bool
+        """
+        return self.paths is None or url.startswith(self.paths)
+
+    def observe(self, latency: float):
+        """
+        Records the latency of a completed request.
+
+        :param latency: The latency in seconds.
+        :type latency: float
+        """
+        with self._lock:
+            self._latencies.append(latency)
+            self._stale += 1
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Counts a new request towards the budget and returns the number of seconds after which it's hedged.
+
+        :returns: The delay or None if not enough latencies were observed yet.
+        :rtype: float or None
+        """
+        with self._lock:
+            self.requests += 1
+            # Unused budget is capped, so a burst after a quiet period can't hedge every request
+            self._tokens = min(self._tokens + self.budget_ratio, max(1.0, 10 * self.budget_ratio))
+            if self.delay is not None:
+                return self.delay
+            if len(self._latencies) < self.min_samples:
+                return None
+
+            if self._percentile_delay is None or self._stale >= max(len(self._latencies) // 20, 1):
+                latencies = sorted(self._latencies)
+                index = min(len(latencies) - 1, math.ceil(self.percentile * len(latencies)) - 1)
+                self._percentile_delay = latencies[max(index, 0)]
+                self._stale = 0
+            return self._percentile_delay
+
+    def allow_hedge(self) -> bool:
+        """
+        Whether the budget allows another hedge. Withdraws it from the budget if so.
+
+        :rtype: bool
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.hedges += 1
+            return True
+
+    def record_win(self):
+        """Counts a hedge which completed before the original request."""
+        with self._lock:
+            self.wins += 1
+
+    @property
+    def stats(self) -> dict:
+        """
+        The number of requests, hedges and hedges which won.
+
+        :rtype: dict
+        """
+        return {"requests": self.requests, "hedges": self.hedges, "wins": self.wins}
+
+    def close(self):
+        """Shuts down the thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
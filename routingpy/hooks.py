@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Instrumentation events, which a client passes to the callbacks registered with
+:meth:`routingpy.client_base.BaseClient.add_hook`.
+"""
+import threading
+
+#: The events a client emits:
+#:
+#: - ``request_start``: before an HTTP request is sent, once per attempt.
+#: - ``request_end``: after an attempt completed or failed, with its timings, sizes and status.
+#: - ``retry``: before the client sleeps ``duration`` seconds to retry a request.
+#: - ``rate_limit_sleep``: after the rate limiter delayed a request by ``duration`` seconds.
+#: - ``parse``: after a router parsed a response in ``duration`` seconds.
+EVENTS = ("request_start", "request_end", "retry", "rate_limit_sleep", "parse")
+
+# The connection timings of the current thread's request, set by the client's connection pool
+connection_timings = threading.local()
+
+
+class Event(object):
+    """
+    An instrumentation event. Fields which don't apply to an event or couldn't be measured are None.
+
+    :ivar name: The event's name, one of :data:`EVENTS`.
+    :ivar router: The router's name, e.g. "Valhalla".
+    :ivar endpoint: The base URL the request is sent to.
+    :ivar url: The URL path of the request, without query string.
+    :ivar method: "GET" or "POST".
+    :ivar retry_count: The number of the retry, 0 for the first attempt.
+    :ivar status: The HTTP status code.
+    :ivar connect: The seconds spent opening a new connection, including name resolution and the TLS
+        handshake.
+    :ivar ttfb: The seconds until the response headers were received.
+    :ivar total: The seconds until the response body was received.
+    :ivar bytes_sent: The size of the request body in bytes.
+    :ivar bytes_received: The size of the response body.
+    :ivar duration: The seconds slept for ``retry`` and ``rate_limit_sleep``, or spent parsing for ``parse``.
+    :ivar error: The exception of a failed attempt.
+    """
+
+    _FIELDS = (
+        "router",
+        "endpoint",
+        "url",
+        "method",
+        "retry_count",
+        "status",
+        "connect",
+        "ttfb",
+        "total",
+        "bytes_sent",
+        "bytes_received",
+        "duration",
+        "error",
+    )
+
+    def __init__(self, name: str, **fields):
+        unknown = set(fields).difference(self._FIELDS)
+        if unknown:
+            raise TypeError("Unknown event fields: {}".format(", ".join(sorted(unknown))))
+
+        self.name = name
+        for field in self._FIELDS:
+            setattr(self, field, fields.get(field))
+
+    def as_dict(self) -> dict:
+        """
+        Returns the event's name and fields.
+
+        :rtype: dict
+        """
+        return dict(name=self.name, **{field: getattr(self, field) for field in self._FIELDS})
+
+    def __repr__(self):  # pragma: no cover
+        fields = ", ".join(
+            "{}={!r}".format(field, getattr(self, field))
+            for field in self._FIELDS
+            if getattr(self, field) is not None
+        )
+        return "Event({}, {})".format(self.name, fields)
@@ -19,6 +19,8 @@
 """
 from typing import List, Optional, Tuple, Union
 
+from .raw import RawBody
+
 
 class Isochrones(object):
     """
@@ -26,6 +28,8 @@ class Isochrones(object):
     the complete raw response of the isochrones request.
     """
 
+    __slots__ = ("_isochrones", "_raw")
+
     def __init__(self, isochrones=None, raw=None):
         self._isochrones = isochrones
         self._raw = raw
@@ -37,6 +41,8 @@ class Isochrones(object):
 
         :rtype: dict or None
         """
+        if isinstance(self._raw, RawBody):
+            self._raw = self._raw.decode()
         return self._raw
 
     def __repr__(self):  # pragma: no cover
@@ -57,6 +63,8 @@ class Isochrone(object):
     Contains a parsed single isochrone response. Access via properties ``geometry``, ``interval``, ``center``, ``interval_type``.
     """
 
+    __slots__ = ("_geometry", "_interval", "_center", "_interval_type")
+
     def __init__(self, geometry=None, interval=None, center=None, interval_type=None):
         self._geometry = geometry
         self._interval = int(interval)
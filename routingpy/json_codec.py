@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+JSON codecs, which let a client decode responses and encode request bodies with a faster JSON library.
+"""
+import json
+from typing import Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # pragma: no cover
+    simdjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+
+class JSONCodec(object):
+    """
+    Decodes and encodes JSON with the standard library. Base class of the other codecs.
+
+    Decoding errors are raised as :class:`ValueError` by every codec.
+    """
+
+    #: The codec's name, as passed to :func:`get_codec`.
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]):
+        """
+        Decodes a JSON document.
+
+        :param data: The UTF-8 encoded document, e.g. a response's content.
+        :type data: bytes or str
+        """
+        return json.loads(data)
+
+    def dumps(self, obj) -> bytes:
+        """
+        Encodes an object as compact UTF-8 encoded JSON.
+
+        :param obj: The object, e.g. a request's POST parameters.
+
+        :rtype: bytes
+        """
+        return json.dumps(obj, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+    def __repr__(self):  # pragma: no cover
+        return "{}()".format(self.__class__.__name__)
+
+
+class OrjsonCodec(JSONCodec):
+    """Decodes and encodes JSON with `orjson <https://github.com/ijl/orjson>`_, the fastest in both directions."""
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("The orjson codec requires the orjson package.")
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+    def dumps(self, obj):
+        # Like the standard library, dict keys which aren't strings are converted
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+class SimdjsonCodec(JSONCodec):
+    """
+    Decodes JSON with `pysimdjson <https://github.com/TkTech/pysimdjson>`_ and encodes it with the standard
+    library.
+    """
+
+    name = "simdjson"
+
+    def __init__(self):
+        if simdjson is None:
+            raise ImportError("The simdjson codec requires the pysimdjson package.")
+
+    def loads(self, data):
+        return simdjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    """Decodes and encodes JSON with `ujson <https://github.com/ultrajson/ultrajson>`_."""
+
+    name = "ujson"
+
+    def __init__(self):
+        if ujson is None:
+            raise ImportError("The ujson codec requires the ujson package.")
+
+    def loads(self, data):
+        return ujson.loads(data)
+
+    def dumps(self, obj):
+        return ujson.dumps(
+            obj, ensure_ascii=False, escape_forward_slashes=False, reject_bytes=True
+        ).encode("utf-8")
+
+
+# In order of preference for "auto"
+_CODECS = (
+    ("orjson", OrjsonCodec, lambda: orjson),
+    ("simdjson", SimdjsonCodec, lambda: simdjson),
+    ("ujson", UjsonCodec, lambda: ujson),
+    ("json", JSONCodec, lambda: json),
+)
+
+
+def get_codec(name: str = "auto") -> JSONCodec:
+    """
+    Returns a JSON codec by name.
+
+    :param name: One of "orjson", "simdjson", "ujson" and "json" for the standard library, or "auto" for the
+        fastest installed one, falling back to the standard library. Default "auto".
+    :type name: str
+
+    :raises ImportError: If the codec's package isn't installed.
+
+    :rtype: :class:`JSONCodec`
+    """
+    for codec_name, codec, module in _CODECS:
+        if name == codec_name or (name == "auto" and module() is not None):
+            return codec()
+
+    raise ValueError(
+        "Unknown JSON codec {}, must be one of auto, {}.".format(
+            name, ", ".join(codec_name for codec_name, _, _ in _CODECS)
+        )
+    )
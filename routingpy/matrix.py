@@ -17,19 +17,80 @@
 """
 :class:`Matrix` returns matrix results.
 """
-from typing import List, Optional
+from typing import Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from .raw import RawBody
+
+
+def fill_array(rows: Iterable[Iterable[Optional[float]]], dtype, shape=None):
+    """
+    Fills a preallocated NumPy array row by row, so no nested list of the whole matrix is built.
+    Unreachable (``None``) values become NaN.
+
+    :param rows: The matrix rows.
+    :type rows: iterable of iterable
+
+    :param dtype: The array's data type, e.g. ``"float32"`` or ``"float64"``.
+    :type dtype: str or numpy.dtype
+
+    :param shape: The number of rows and columns. Only needed if ``rows`` is not a list of lists.
+    :type shape: tuple of int
+
+    :rtype: numpy.ndarray
+    """
+    if np is None:
+        raise ImportError("Parsing matrices into arrays requires numpy to be installed.")
+
+    if shape is None:
+        shape = (len(rows), len(rows[0]) if rows else 0)
+
+    array = np.empty(shape, dtype=dtype)
+    for index, row in enumerate(rows):
+        array[index] = row if isinstance(row, list) else list(row)
+
+    return array
+
+
+def _array_to_list(array):
+    """Converts an array to nested lists, with NaN converted back to ``None``."""
+    return [[None if value != value else value for value in row] for row in array.tolist()]
+
+
+def _list_to_array(rows):
+    """Converts nested lists to a float64 array, with ``None`` converted to NaN."""
+    if np is None:
+        raise ImportError("Matrix arrays require numpy to be installed.")
+
+    return fill_array(rows, np.float64)
 
 
 class Matrix(object):
     """
-    Contains a parsed matrix response. Access via properties ``geometry`` and ``raw``.
+    Contains a parsed matrix response. Access via properties ``durations``, ``distances`` and ``raw``.
+
+    ``durations`` and ``distances`` may be passed as nested lists or as NumPy arrays. The array
+    accessors ``durations_array`` and ``distances_array`` return the arrays without copying, while the
+    list properties are only computed from them when accessed.
     """
 
+    __slots__ = ("_durations", "_durations_array", "_distances", "_distances_array", "_raw")
+
     def __init__(self, durations=None, distances=None, raw=None):
-        self._durations = durations
-        self._distances = distances
+        self._durations, self._durations_array = self._split(durations)
+        self._distances, self._distances_array = self._split(distances)
         self._raw = raw
 
+    @staticmethod
+    def _split(values):
+        if np is not None and isinstance(values, np.ndarray):
+            return None, values
+        return values, None
+
     @property
     def durations(self) -> Optional[List[List[Optional[float]]]]:
         """
@@ -53,6 +114,8 @@ class Matrix(object):
 
         :rtype: list or None
         """
+        if self._durations is None and self._durations_array is not None:
+            self._durations = _array_to_list(self._durations_array)
         return self._durations
 
     @property
@@ -80,8 +143,36 @@ class Matrix(object):
 
         :rtype: list or None
         """
+        if self._distances is None and self._distances_array is not None:
+            self._distances = _array_to_list(self._distances_array)
         return self._distances
 
+    @property
+    def durations_array(self):
+        """
+        The durations matrix as 2D NumPy array of shape (sources, destinations), NaN where no route was
+        found. If the matrix was parsed with a ``dtype``, this is the parsed array itself, otherwise it is
+        converted once from the ``durations`` list. Requires numpy.
+
+        :rtype: numpy.ndarray or None
+        """
+        if self._durations_array is None and self._durations is not None:
+            self._durations_array = _list_to_array(self._durations)
+        return self._durations_array
+
+    @property
+    def distances_array(self):
+        """
+        The distance matrix in meters as 2D NumPy array of shape (sources, destinations), NaN where no
+        route was found. If the matrix was parsed with a ``dtype``, this is the parsed array itself,
+        otherwise it is converted once from the ``distances`` list. Requires numpy.
+
+        :rtype: numpy.ndarray or None
+        """
+        if self._distances_array is None and self._distances is not None:
+            self._distances_array = _list_to_array(self._distances)
+        return self._distances_array
+
     @property
     def raw(self) -> Optional[dict]:
         """
@@ -89,7 +180,186 @@ class Matrix(object):
 
         :rtype: dict or None
         """
+        if isinstance(self._raw, RawBody):
+            self._raw = self._raw.decode()
         return self._raw
 
     def __repr__(self):  # pragma: no cover
         return "Matrix({}, {})".format(self.durations, self.distances)
+
+
+def _has_metric(matrix, name):
+    """Whether a matrix holds the durations or distances, as list or array."""
+    return (
+        getattr(matrix, "_{}".format(name)) is not None
+        or getattr(matrix, "_{}_array".format(name)) is not None
+    )
+
+
+class IncrementalMatrix(Matrix):
+    """
+    A square matrix between a changing set of locations, which is updated incrementally instead of being
+    requested again for all locations.
+
+    Adding k locations to N only requests the k x (N + k) rows and the N x k columns of the new locations,
+    removing locations drops their rows and columns in place. After an update, ``raw`` holds the list of raw
+    responses of its requests.
+
+    >>> from routingpy import OSRM
+    >>> from routingpy.matrix import IncrementalMatrix
+    >>> matrix = IncrementalMatrix(OSRM(), fleet_locations, profile="driving")
+    >>> matrix.add_locations(new_stops)
+    >>> matrix.remove_locations([3, 17])
+    >>> matrix.durations[0][5]
+    """
+
+    __slots__ = ("router", "locations", "matrix_kwargs", "_array_mode")
+
+    def __init__(
+        self, router, locations: List[List[float]], matrix: Optional[Matrix] = None, **matrix_kwargs
+    ):
+        """
+        :param router: The router to request the matrices from. Its ``matrix`` needs to support ``sources``
+            and ``destinations``.
+
+        :param locations: The initial locations.
+        :type locations: list of list
+
+        :param matrix: The matrix of all initial locations, if it's already available. Otherwise it's requested.
+        :type matrix: :class:`Matrix`
+
+        :param matrix_kwargs: Additional arguments passed to each of the router's ``matrix`` requests, e.g.
+            ``profile``. If ``dtype`` is passed, the matrices are kept as NumPy arrays.
+        :type matrix_kwargs: dict
+        """
+        if "sources" in matrix_kwargs or "destinations" in matrix_kwargs:
+            raise ValueError("An incremental matrix is always between all of its locations.")
+
+        self.router = router
+        self.locations = list(locations)
+        self.matrix_kwargs = matrix_kwargs
+
+        if matrix is None:
+            matrix = router.matrix(self.locations, **matrix_kwargs)
+
+        super(IncrementalMatrix, self).__init__(raw=matrix.raw)
+        # The lists are updated in place, so they're copied to leave the passed matrix untouched
+        self._durations = (
+            [list(row) for row in matrix._durations] if matrix._durations is not None else None
+        )
+        self._distances = (
+            [list(row) for row in matrix._distances] if matrix._distances is not None else None
+        )
+        self._durations_array, self._distances_array = matrix._durations_array, matrix._distances_array
+        # Whether the arrays or the lists are updated, the other representation is only derived from them
+        self._array_mode = (self._durations is None and self._durations_array is not None) or (
+            self._distances is None and self._distances_array is not None
+        )
+
+    def add_locations(self, locations: List[List[float]]) -> bool:
+        """
+        Appends locations and requests only their rows and columns of the matrix.
+
+        :param locations: The locations to add.
+        :type locations: list of list
+
+        :returns: False if a request failed with the router's ``skip_api_error``, i.e. the rows or columns
+            lack a matrix the incremental matrix holds. The locations and matrices are left unchanged then.
+        :rtype: bool
+        """
+        if not locations:
+            return True
+
+        n_old = len(self.locations)
+        all_locations = self.locations + list(locations)
+        new = list(range(n_old, len(all_locations)))
+
+        rows = self.router.matrix(
+            all_locations,
+            sources=new,
+            destinations=list(range(len(all_locations))),
+            **self.matrix_kwargs
+        )
+        columns = (
+            self.router.matrix(
+                all_locations, sources=list(range(n_old)), destinations=new, **self.matrix_kwargs
+            )
+            if n_old
+            else None
+        )
+
+        # Checks both strips before anything is updated
+        names = [name for name in ("durations", "distances") if _has_metric(self, name)]
+        if not n_old:
+            names = [name for name in ("durations", "distances") if _has_metric(rows, name)]
+            if not names:
+                return False
+        for name in names:
+            if not _has_metric(rows, name) or (n_old and not _has_metric(columns, name)):
+                return False
+
+        for name in names:
+            if self._array_mode:
+                values = getattr(self, "_{}_array".format(name))
+                row_values = getattr(rows, "{}_array".format(name))
+                if not n_old:
+                    values = row_values
+                else:
+                    values = np.vstack(
+                        (np.hstack((values, getattr(columns, "{}_array".format(name)))), row_values)
+                    )
+                setattr(self, "_{}_array".format(name), values)
+                setattr(self, "_{}".format(name), None)
+            else:
+                values = getattr(self, "_{}".format(name))
+                row_values = getattr(rows, name)
+                if not n_old:
+                    values = [list(row) for row in row_values]
+                else:
+                    for row, column_values in zip(values, getattr(columns, name)):
+                        row.extend(column_values)
+                    values.extend(row_values)
+                setattr(self, "_{}".format(name), values)
+                setattr(self, "_{}_array".format(name), None)
+
+        self.locations = all_locations
+        self._raw = [rows.raw, columns.raw] if columns is not None else [rows.raw]
+        return True
+
+    def remove_locations(self, indices: Iterable[int]):
+        """
+        Removes locations and drops their rows and columns, without any request.
+
+        :param indices: The indices of the locations to remove.
+        :type indices: list of int
+
+        :raises IndexError: if an index is out of range. Nothing is removed then.
+        """
+        n_locations = len(self.locations)
+        indices = set(indices)
+        for index in indices:
+            if not -n_locations <= index < n_locations:
+                raise IndexError("Location index {} out of range.".format(index))
+        indices = sorted({index % n_locations for index in indices}, reverse=True)
+        if not indices:
+            return
+
+        for name in ("durations", "distances"):
+            if self._array_mode:
+                values = getattr(self, "_{}_array".format(name))
+                if values is not None:
+                    values = np.delete(np.delete(values, indices, axis=0), indices, axis=1)
+                    setattr(self, "_{}_array".format(name), values)
+                    setattr(self, "_{}".format(name), None)
+            else:
+                values = getattr(self, "_{}".format(name))
+                if values is not None:
+                    for index in indices:
+                        del values[index]
+                    for row in values:
+                        for index in indices:
+                            del row[index]
+                    setattr(self, "_{}_array".format(name), None)
+
+        for index in indices:
+            del self.locations[index]
@@ -19,6 +19,9 @@
 """
 from typing import List, Optional
 
+from .direction import EncodedGeometry
+from .raw import RawBody
+
 
 class OptimizedDirection(object):
     """
@@ -26,12 +29,15 @@ class OptimizedDirection(object):
     and ``original_index``.
     """
 
+    __slots__ = ("_geometry", "_duration", "_distance", "_original_indices", "_raw")
+
     def __init__(self, geometry=None, duration=None, distance=None, original_indices=None, raw=None):
         """
         Initialize a :class:`OptimizedDirection` object to hold the properties of an optimized direction request.
 
-        :param geometry: The geometry list in [[lon1, lat1], [lon2, lat2]] order.
-        :type geometry: list of list
+        :param geometry: The geometry list in [[lon1, lat1], [lon2, lat2]] order, or the encoded geometry to be
+            decoded on first access.
+        :type geometry: list of list or :class:`routingpy.direction.EncodedGeometry`
 
         :param duration: The duration of the direction in seconds.
         :type duration: int or float
@@ -55,10 +61,13 @@ class OptimizedDirection(object):
     @property
     def geometry(self) -> Optional[List[List[float]]]:
         """
-        The geometry of the route as [[lon1, lat1], [lon2, lat2], ...] list.
+        The geometry of the route as [[lon1, lat1], [lon2, lat2], ...] list. An encoded geometry is decoded
+        on first access.
 
         :rtype: list or None
         """
+        if isinstance(self._geometry, EncodedGeometry):
+            self._geometry = self._geometry.decode()
         return self._geometry
 
     @property
@@ -112,6 +121,8 @@ class OptimizedDirection(object):
 
         :rtype: dict or None
         """
+        if isinstance(self._raw, RawBody):
+            self._raw = self._raw.decode()
         return self._raw
 
     def __repr__(self):  # pragma: no cover
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Caches routes between snapped coordinates, so requests for nearby origins and destinations share results.
+"""
+import json
+import math
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+from .cache import BaseCache, MemoryCache
+from .matrix import Matrix
+
+_METERS_PER_DEGREE = 111320.0
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def snap_to_grid(location: Sequence[float], grid_size: float) -> Tuple[str, List[float]]:
+    """
+    Snaps a location to the center of its cell in a grid of roughly ``grid_size`` x ``grid_size`` meters.
+    The longitude spacing of each grid row is adjusted to its latitude.
+
+    :param location: The lng/lat coordinate.
+    :type location: list of float
+
+    :param grid_size: The cell size in meters.
+    :type grid_size: float
+
+    :returns: The cell's ID and its center as lng/lat.
+    :rtype: tuple
+    """
+    lat_step = grid_size / _METERS_PER_DEGREE
+    row = round(location[1] / lat_step)
+    lat = row * lat_step
+    lng_step = grid_size / (_METERS_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+    col = round(location[0] / lng_step)
+
+    return "{}:{}".format(row, col), [col * lng_step, lat]
+
+
+def snap_to_geohash(location: Sequence[float], precision: int) -> Tuple[str, List[float]]:
+    """
+    Snaps a location to the center of its geohash cell.
+
+    :param location: The lng/lat coordinate.
+    :type location: list of float
+
+    :param precision: The number of geohash characters, e.g. 8 for cells of about 38 x 19 meters.
+    :type precision: int
+
+    :returns: The geohash and the cell's center as lng/lat.
+    :rtype: tuple
+    """
+    lng_range, lat_range = [-180.0, 180.0], [-90.0, 90.0]
+    chars, bits, n_bits, is_lng = [], 0, 0, True
+    while len(chars) < precision:
+        interval, value = (lng_range, location[0]) if is_lng else (lat_range, location[1])
+        mid = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        is_lng = not is_lng
+        n_bits += 1
+        if n_bits == 5:
+            chars.append(_GEOHASH_BASE32[bits])
+            bits = n_bits = 0
+
+    return "".join(chars), [(lng_range[0] + lng_range[1]) / 2, (lat_range[0] + lat_range[1]) / 2]
+
+
+class QuantizedRouteCache(object):
+    """
+    Wraps a router and caches its ``directions`` and ``matrix`` results between snapped coordinates. Every
+    location is snapped to the center of its grid or geohash cell, which is what gets requested, so any later
+    request with locations in the same cells and the same profile and options reuses the result.
+
+    Matrices are cached cell to cell: a new matrix only requests the cells that aren't cached yet.
+
+    >>> from routingpy import OSRM
+    >>> from routingpy.quantized_cache import QuantizedRouteCache
+    >>> router = QuantizedRouteCache(OSRM(), grid_size=10)
+    >>> matrix = router.matrix(gps_locations, profile="driving")
+    >>> router.stats
+    {'hits': 9120, 'misses': 880, 'hit_rate': 0.912, 'error_bound': 7.07}
+
+    Each location is at most ``error_bound`` meters from the coordinate the result was computed for.
+
+    Directions are cached as :class:`routingpy.direction.Direction` objects, so they need a cache which
+    holds Python objects, like the default :class:`routingpy.cache.MemoryCache`. Matrix cells can be
+    cached in any :class:`routingpy.cache.BaseCache`.
+    """
+
+    def __init__(
+        self,
+        router,
+        grid_size: Optional[float] = 10.0,
+        geohash_precision: Optional[int] = None,
+        cache: Optional[BaseCache] = None,
+    ):
+        """
+        :param router: The router to request uncached results from. Its methods need to be synchronous.
+
+        :param grid_size: The size of the grid cells in meters. Default 10.
+        :type grid_size: float
+
+        :param geohash_precision: Snap to geohash cells of this precision instead of the grid.
+        :type geohash_precision: int
+
+        :param cache: The cache holding the results. Default a :class:`routingpy.cache.MemoryCache`
+            of 100000 entries.
+        :type cache: :class:`routingpy.cache.BaseCache`
+        """
+        if geohash_precision is None and not grid_size:
+            raise ValueError("Either grid_size or geohash_precision must be specified.")
+
+        self.router = router
+        self.grid_size = grid_size
+        self.geohash_precision = geohash_precision
+        self.cache = cache if cache is not None else MemoryCache(maxsize=100000)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _count(self, hits=0, misses=0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def snap(self, location: Sequence[float]) -> Tuple[str, List[float]]:
+        """
+        Snaps a location to its cell.
+
+        :param location: The lng/lat coordinate.
+        :type location: list of float
+
+        :returns: The cell's ID and its center as lng/lat.
+        :rtype: tuple
+        """
+        if self.geohash_precision is not None:
+            return snap_to_geohash(location, self.geohash_precision)
+        return snap_to_grid(location, self.grid_size)
+
+    @property
+    def error_bound(self) -> float:
+        """
+        The maximum distance in meters between a location and the snapped coordinate its result was
+        computed for, i.e. half the diagonal of a cell. For geohashes, the cell size at the equator is used.
+
+        :rtype: float
+        """
+        if self.geohash_precision is not None:
+            lat_bits = 5 * self.geohash_precision // 2
+            lng_bits = 5 * self.geohash_precision - lat_bits
+            height = 180.0 / 2**lat_bits * _METERS_PER_DEGREE
+            width = 360.0 / 2**lng_bits * _METERS_PER_DEGREE
+            return math.hypot(width, height) / 2
+
+        return self.grid_size * math.sqrt(2) / 2
+
+    @property
+    def stats(self) -> dict:
+        """
+        The cache's hits and misses, counted per route or matrix cell, its hit rate and the error bound in meters.
+
+        :rtype: dict
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+            "error_bound": self.error_bound,
+        }
+
+    @staticmethod
+    def _options(method, args, kwargs):
+        return json.dumps([method, args, kwargs], sort_keys=True, default=str)
+
+    def directions(self, locations: Sequence[Sequence[float]], *args, **directions_kwargs):
+        """
+        Returns the cached route between the snapped locations or requests it from the router.
+        Takes the same arguments as the router's ``directions``.
+
+        :returns: One or multiple route(s) between the snapped locations.
+        :rtype: :class:`routingpy.direction.Direction` or :class:`routingpy.direction.Directions`
+        """
+        cells = [self.snap(location) for location in locations]
+        key = json.dumps(
+            [self._options("directions", args, directions_kwargs), [cell for cell, _ in cells]]
+        )
+
+        route = self.cache.get(key)
+        if route is not None:
+            self._count(hits=1)
+            return route
+
+        self._count(misses=1)
+        route = self.router.directions([center for _, center in cells], *args, **directions_kwargs)
+        if route is not None:
+            self.cache.set(key, route)
+
+        return route
+
+    def _request_block(self, row_cells, col_cells, centers, args, matrix_kwargs):
+        """Requests the matrix between the centers of the row and column cells."""
+        request_cells = list(dict.fromkeys(row_cells + col_cells))
+        position = {cell: index for index, cell in enumerate(request_cells)}
+
+        return self.router.matrix(
+            [centers[cell] for cell in request_cells],
+            *args,
+            sources=[position[cell] for cell in row_cells],
+            destinations=[position[cell] for cell in col_cells],
+            **matrix_kwargs
+        )
+
+    def matrix(
+        self,
+        locations: Sequence[Sequence[float]],
+        *args,
+        sources: Optional[Sequence[int]] = None,
+        destinations: Optional[Sequence[int]] = None,
+        **matrix_kwargs
+    ) -> Matrix:
+        """
+        Returns the matrix between the snapped locations, only requesting the cells that aren't cached yet:
+        the rows missing the same columns are requested together, e.g. new locations' rows against all
+        destinations and the other rows against the new locations' columns, so no cached cell is requested
+        again. Takes the same arguments as the router's ``matrix``,
+        ``sources`` and ``destinations`` need to be passed as keyword arguments.
+
+        :returns: A matrix between the snapped locations. Its ``raw`` property holds the list of raw
+            responses of the requests for the missing cells.
+        :rtype: :class:`routingpy.matrix.Matrix`
+        """
+        options = self._options("matrix", args, matrix_kwargs)
+        cells = [self.snap(location) for location in locations]
+        centers = dict(cells)
+        sources = range(len(locations)) if sources is None else sources
+        destinations = range(len(locations)) if destinations is None else destinations
+
+        def key(source_cell, destination_cell):
+            return json.dumps([options, source_cell, destination_cell])
+
+        values = {}
+        # The missing columns by row
+        missing = {}
+        hits = 0
+        for source in sources:
+            for destination in destinations:
+                pair = (cells[source][0], cells[destination][0])
+                if pair in values:
+                    continue
+                value = self.cache.get(key(*pair))
+                if value is None:
+                    missing.setdefault(pair[0], []).append(pair[1])
+                else:
+                    hits += 1
+                values[pair] = value
+        self._count(hits=hits, misses=sum(len(columns) for columns in missing.values()))
+
+        raw = []
+        # New locations miss their whole row, which is requested against all columns, and add the same
+        # column to the other rows, so usually a few blocks cover all missing cells without cached ones.
+        blocks = {}
+        for source_cell, columns in missing.items():
+            blocks.setdefault(tuple(columns), []).append(source_cell)
+
+        # Full rows first
+        for col_cells, row_cells in sorted(blocks.items(), key=lambda block: -len(block[0])):
+            col_cells = list(col_cells)
+            result = self._request_block(row_cells, col_cells, centers, args, matrix_kwargs)
+            raw.append(result.raw)
+            # Don't cache empty results, e.g. of skipped API errors
+            cacheable = result.durations is not None or result.distances is not None
+            for row, source_cell in enumerate(row_cells):
+                for col, destination_cell in enumerate(col_cells):
+                    value = [
+                        result.durations[row][col] if result.durations is not None else None,
+                        result.distances[row][col] if result.distances is not None else None,
+                    ]
+                    if cacheable:
+                        self.cache.set(key(source_cell, destination_cell), value)
+                    values[(source_cell, destination_cell)] = value
+
+        def metric(index):
+            # Like the router, None if none of the cells has the metric, e.g. distances by default
+            if all(value[index] is None for value in values.values()):
+                return None
+            return [
+                [
+                    values[(cells[source][0], cells[destination][0])][index]
+                    for destination in destinations
+                ]
+                for source in sources
+            ]
+
+        return Matrix(durations=metric(0), distances=metric(1), raw=raw)
@@ -17,27 +17,99 @@
 """
 :class:`Raster` returns rasters results.
 """
-from typing import Optional
+import mmap
+import os
+from typing import Optional, Union
 
 
 class Raster(object):
     """
     Contains a parsed single raster response. Access via properties ``image``, ``max_travel_time``
+
+    A raster which was streamed to a file, see the routers' ``stream_to`` argument, only references it by
+    ``path``, so its image isn't held in memory. Use :meth:`mmap` to access it without reading it at once.
     """
 
-    def __init__(self, image=None, max_travel_time=None):
+    __slots__ = ("_image", "_max_travel_time", "_path")
+
+    def __init__(self, image=None, max_travel_time=None, path=None):
         self._image = image
         self._max_travel_time = max_travel_time
+        self._path = path
+
+    @classmethod
+    def from_stream(cls, stream_to, max_travel_time=None) -> "Raster":
+        """
+        Creates a raster referencing the file a response was streamed to.
+
+        :param stream_to: The file path or binary file object passed as ``stream_to``. File objects are
+            referenced by their name, if they have one. Otherwise the image is read back from the file object's
+            start into memory.
+        :type stream_to: str or os.PathLike or file object
+
+        :param max_travel_time: The max travel time of the raster in seconds.
+        :type max_travel_time: int
+
+        :raises ValueError: If a file object has no name and can't be read back, e.g. because it isn't
+            seekable.
+
+        :rtype: :class:`Raster`
+        """
+        if isinstance(stream_to, (str, os.PathLike)):
+            return cls(max_travel_time=max_travel_time, path=stream_to)
+
+        name = getattr(stream_to, "name", None)
+        if isinstance(name, (str, os.PathLike)):
+            # Make sure the file holds the whole image before it's read by path
+            stream_to.flush()
+            return cls(max_travel_time=max_travel_time, path=name)
+
+        try:
+            stream_to.seek(0)
+            image = stream_to.read()
+        except (AttributeError, OSError) as e:
+            raise ValueError(
+                "The raster was streamed to a file object without a name, which can't be read back."
+            ) from e
+
+        return cls(image=image, max_travel_time=max_travel_time)
 
     @property
     def image(self) -> Optional[bytes]:
         """
-        The image of the raster.
+        The image of the raster. Read from the file if the raster was streamed to ``path``.
 
         :rtype: bytes
         """
+        if self._image is None and self._path is not None:
+            with open(self._path, "rb") as f:
+                return f.read()
         return self._image
 
+    @property
+    def path(self) -> Optional[Union[str, os.PathLike]]:
+        """
+        The path of the file the raster was streamed to.
+
+        :rtype: str or os.PathLike
+        """
+        return self._path
+
+    def mmap(self) -> mmap.mmap:
+        """
+        Memory-maps the file the raster was streamed to read-only, so the operating system pages the image in
+        on demand. Close the map, e.g. with a ``with`` statement, when done.
+
+        :raises ValueError: If the raster wasn't streamed to a file.
+
+        :rtype: :class:`mmap.mmap`
+        """
+        if self._path is None:
+            raise ValueError("Only rasters streamed to a file can be memory-mapped.")
+
+        with open(self._path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
     @property
     def max_travel_time(self) -> int:
         """
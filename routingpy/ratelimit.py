@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Client-side rate limiting, which paces requests at a provider's quota instead of running into HTTP 429.
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class TokenBucket(object):
+    """
+    A thread-safe token bucket, which allows ``rate`` requests per ``per`` seconds on average and bursts of
+    up to ``burst`` requests.
+
+    Requests reserve their token right away and wait outside of the lock until it's due, so concurrent
+    requests are paced in the order they arrived.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        per: float = 1.0,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        :param rate: The number of requests allowed per ``per`` seconds.
+        :type rate: float
+
+        :param per: The period of ``rate`` in seconds, e.g. 60 for a quota per minute. Default 1.
+        :type per: float
+
+        :param burst: The number of requests which may be sent at once while the bucket is full.
+            Default 1, i.e. requests are evenly spaced.
+        :type burst: int
+
+        :param clock: Returns the current time in seconds. Default :func:`time.monotonic`.
+        :type clock: callable
+
+        :param sleep: Waits for a number of seconds. Default :func:`time.sleep`.
+        :type sleep: callable
+        """
+        if rate <= 0 or per <= 0:
+            raise ValueError("rate and per must be positive.")
+
+        self.rate = rate / per
+        self.burst = burst or 1
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Takes tokens from the bucket, even if it doesn't hold enough yet.
+
+        :param tokens: The number of tokens to take. Default 1.
+        :type tokens: int
+
+        :returns: The number of seconds to wait until the tokens are available.
+        :rtype: float
+        """
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+
+            return max(-self._tokens / self.rate, 0.0)
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Blocks until tokens are available and takes them.
+
+        :param tokens: The number of tokens to take. Default 1.
+        :type tokens: int
+
+        :returns: The number of seconds waited.
+        :rtype: float
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            self.sleep(wait)
+
+        return wait
+
+
+class RateLimiter(object):
+    """
+    Limits the rate of a client's requests with a global :class:`TokenBucket` and optional buckets for
+    endpoints with their own quota. Endpoints are matched by the longest prefix of the request's URL path,
+    i.e. the path after the router's base URL.
+
+    Pass the same limiter to all routers sharing a quota, e.g. the same API key:
+
+    >>> from routingpy import ORS
+    >>> from routingpy.ratelimit import RateLimiter, TokenBucket
+    >>> limiter = RateLimiter(40, per=60, endpoints={"/v2/matrix": TokenBucket(40, per=60)})
+    >>> car = ORS(api_key, rate_limiter=limiter)
+    >>> bike = ORS(api_key, rate_limiter=limiter)
+
+    A request to an endpoint with its own bucket needs a token from both buckets.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        per: float = 1.0,
+        burst: Optional[int] = None,
+        endpoints: Optional[Dict[str, TokenBucket]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        :param rate: The number of requests allowed per ``per`` seconds across all endpoints.
+            Default None, i.e. only the endpoints are limited.
+        :type rate: float
+
+        :param per: The period of ``rate`` in seconds, e.g. 60 for a quota per minute. Default 1.
+        :type per: float
+
+        :param burst: The number of requests which may be sent at once. Default 1.
+        :type burst: int
+
+        :param endpoints: Buckets for endpoints with their own quota by URL path prefix, e.g.
+            ``{"/v2/matrix": TokenBucket(40, per=60)}``.
+        :type endpoints: dict
+
+        :param clock: Returns the current time in seconds for the global bucket. Default :func:`time.monotonic`.
+        :type clock: callable
+
+        :param sleep: Waits for a number of seconds. Default :func:`time.sleep`.
+        :type sleep: callable
+        """
+        self.bucket = TokenBucket(rate, per=per, burst=burst, clock=clock) if rate is not None else None
+        self.sleep = sleep
+        # Longest prefix first
+        self.endpoints = dict(
+            sorted((endpoints or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        )
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def _endpoint_bucket(self, url):
+        for prefix, bucket in self.endpoints.items():
+            if url.startswith(prefix):
+                return bucket
+
+    def acquire(self, url: str = "") -> float:
+        """
+        Blocks until the request may be sent.
+
+        :param url: The request's URL path after the base URL.
+        :type url: str
+
+        :returns: The number of seconds waited.
+        :rtype: float
+        """
+        wait = 0.0
+        for bucket in (self.bucket, self._endpoint_bucket(url)):
+            if bucket is not None:
+                wait = max(wait, bucket.reserve())
+
+        if wait > 0:
+            with self._lock:
+                self.waited += wait
+            self.sleep(wait)
+
+        return wait
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Retention of the raw responses in parsed results, see the clients' ``keep_raw`` argument.
+"""
+from typing import Callable, Optional, Sequence
+
+#: The values of the clients' ``keep_raw`` argument.
+KEEP_RAW = ("full", "none", "bytes")
+
+
+class RawBody(object):
+    """
+    The undecoded body of a response, which stands in for a result's ``raw`` response until it's accessed.
+    A result of a request with alternatives references the part of the body at ``path``.
+    """
+
+    __slots__ = ("content", "loads", "path")
+
+    def __init__(self, content: bytes, loads: Callable, path: Sequence = ()):
+        """
+        :param content: The response body.
+        :type content: bytes
+
+        :param loads: Decodes the body, e.g. :func:`json.loads`.
+        :type loads: callable
+
+        :param path: The keys and indices of the result's part of the body.
+        :type path: tuple
+        """
+        self.content = content
+        self.loads = loads
+        self.path = tuple(path)
+
+    def decode(self):
+        """Decodes the body and returns the result's part of it."""
+        raw = self.loads(self.content)
+        for key in self.path:
+            raw = raw[key]
+        return raw
+
+
+class ResponseBody(object):
+    """A decoded response body along with its undecoded content, as returned by a client for ``keep_raw="bytes"``."""
+
+    __slots__ = ("body", "content")
+
+    def __init__(self, body, content: bytes):
+        self.body = body
+        self.content = content
+
+
+def locate(body, part) -> Optional[tuple]:
+    """
+    Finds the path of a part of a decoded body by identity. Only dicts are descended into, lists are only
+    searched for the part, so large arrays like coordinates aren't traversed.
+
+    :returns: The keys and indices leading to the part or None if it's not found.
+    :rtype: tuple or None
+    """
+    if part is body:
+        return ()
+
+    pending = [((), body)]
+    while pending:
+        path, value = pending.pop()
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if item is part:
+                    return path + (key,)
+                if isinstance(item, (dict, list)):
+                    pending.append((path + (key,), item))
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                if item is part:
+                    return path + (index,)
+
+    return None
+
+
+def retain_raw(result, keep_raw: str, body, content: Optional[bytes], loads: Callable):
+    """
+    Replaces the raw responses of a parsed result and of the results it contains according to ``keep_raw``:
+    "none" drops them, "bytes" replaces them with a :class:`RawBody` of the response's content.
+    """
+    results = [result]
+    # e.g. the alternative routes of Directions
+    results.extend(getattr(result, "_directions", None) or ())
+
+    for item in results:
+        raw = getattr(item, "_raw", None)
+        if raw is None or keep_raw == "full":
+            continue
+        if keep_raw == "none":
+            item._raw = None
+            continue
+
+        path = locate(body, raw)
+        if path is not None:
+            item._raw = RawBody(content, loads, path)
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Retry policies, which decide whether and when a client retries a failed request.
+"""
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+from .client_base import _RETRIABLE_STATUSES
+
+
+class RetryPolicy(object):
+    """
+    Decides whether and when a client retries a request which failed with a retriable HTTP status or
+    exceeded the rate limit (HTTP 429, if the client's ``retry_over_query_limit`` is set).
+
+    Retries are delayed with decorrelated jitter, i.e. each delay is drawn uniformly between ``base_delay``
+    and three times the previous delay, capped at ``max_delay``. If the server sends a ``Retry-After``
+    header, its delay is used instead. The client's ``retry_timeout`` still bounds the total time.
+
+    Each router can have its own policy:
+
+    >>> from routingpy import Google
+    >>> from routingpy.retry import RetryPolicy
+    >>> router = Google(api_key, retry_policy=RetryPolicy(statuses={500, 503}, max_retries=5, budget_ratio=0.1))
+
+    With ``budget_ratio``, the retries within the last ``budget_window`` seconds are limited to
+    ``budget_min_retries`` plus that ratio of the requests, so a struggling server isn't flooded with retries.
+    The budget is shared by all requests using the policy.
+    """
+
+    def __init__(
+        self,
+        statuses: Iterable[int] = _RETRIABLE_STATUSES,
+        max_retries: Optional[int] = None,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        respect_retry_after: bool = True,
+        budget_ratio: Optional[float] = None,
+        budget_min_retries: int = 10,
+        budget_window: float = 10.0,
+    ):
+        """
+        :param statuses: The HTTP status codes which are retried. Default {503}.
+        :type statuses: set of int
+
+        :param max_retries: The maximum number of retries per request. Default None, i.e. retries are only
+            bounded by the client's ``retry_timeout``.
+        :type max_retries: int
+
+        :param base_delay: The minimum delay between two attempts in seconds. Default 0.5.
+        :type base_delay: float
+
+        :param max_delay: The maximum delay between two attempts in seconds, unless the server asks for a
+            longer one with ``Retry-After``. Default 30.
+        :type max_delay: float
+
+        :param respect_retry_after: Wait as long as the ``Retry-After`` header asks for. Default True.
+        :type respect_retry_after: bool
+
+        :param budget_ratio: The ratio of retries to requests allowed within ``budget_window``, e.g. 0.2.
+            Default None, i.e. no retry budget.
+        :type budget_ratio: float
+
+        :param budget_min_retries: The number of retries always allowed within ``budget_window``. Default 10.
+        :type budget_min_retries: int
+
+        :param budget_window: The time window of the retry budget in seconds. Default 10.
+        :type budget_window: float
+        """
+        self.statuses = frozenset(statuses)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.respect_retry_after = respect_retry_after
+        self.budget_ratio = budget_ratio
+        self.budget_min_retries = budget_min_retries
+        self.budget_window = budget_window
+
+        self._requests = deque()
+        self._retries = deque()
+        self._lock = threading.Lock()
+
+    def is_retriable(self, status_code: int) -> bool:
+        """
+        Whether a response with this HTTP status code is retried.
+
+        :param status_code: The response's HTTP status code.
+        :type status_code: int
+
+        :rtype: bool
+        """
+        return status_code in self.statuses
+
+    def _prune(self, now):
+        for timestamps in (self._requests, self._retries):
+            while timestamps and timestamps[0] < now - self.budget_window:
+                timestamps.popleft()
+
+    def record_request(self):
+        """Counts a new request, i.e. a first attempt, towards the retry budget."""
+        if self.budget_ratio is None:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            self._requests.append(now)
+
+    def allow_retry(self, retry_counter: int) -> bool:
+        """
+        Whether another retry is allowed. Withdraws it from the retry budget if so.
+
+        :param retry_counter: The number of the retry, starting at 1.
+        :type retry_counter: int
+
+        :rtype: bool
+        """
+        if self.max_retries is not None and retry_counter > self.max_retries:
+            return False
+
+        if self.budget_ratio is None:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            if len(self._retries) >= self.budget_min_retries + self.budget_ratio * len(self._requests):
+                return False
+            self._retries.append(now)
+
+        return True
+
+    @staticmethod
+    def retry_after(response) -> Optional[float]:
+        """
+        Parses the ``Retry-After`` header of a response, given in seconds or as an HTTP date.
+
+        :param response: The response.
+        :type response: :class:`requests.Response`
+
+        :returns: The delay in seconds or None if the header is missing or invalid.
+        :rtype: float or None
+        """
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+
+        return max((date - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+    def next_delay(
+        self, previous_delay: Optional[float] = None, retry_after: Optional[float] = None
+    ) -> float:
+        """
+        Returns the delay before the next attempt in seconds.
+
+        :param previous_delay: The delay before the previous attempt, None before the first retry.
+        :type previous_delay: float
+
+        :param retry_after: The delay the server asked for with ``Retry-After``.
+        :type retry_after: float
+
+        :rtype: float
+        """
+        if retry_after is not None and self.respect_retry_after:
+            return retry_after
+
+        upper = max(self.base_delay, (previous_delay or self.base_delay) * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
@@ -19,11 +19,12 @@ from operator import itemgetter
 from typing import List, Optional, Tuple, Union
 
 from .. import convert, utils
+from ..batch import TiledMatrixMixin
 from ..client_base import DEFAULT
 from ..client_default import Client
-from ..direction import Direction, Directions
+from ..direction import Direction, Directions, EncodedGeometry
 from ..exceptions import OverQueryLimit, RouterApiError, RouterServerError
-from ..matrix import Matrix
+from ..matrix import Matrix, fill_array
 
 STATUS_CODES = {
     "NOT_FOUND": {
@@ -65,11 +66,14 @@ STATUS_CODES = {
 }
 
 
-class Google:
+class Google(TiledMatrixMixin):
     """Performs requests to the Google API services."""
 
     _base_url = "https://maps.googleapis.com/maps/api"
 
+    # At most 25 origins, 25 destinations and 100 elements per request
+    _MATRIX_TILE_SIZE = (10, 10)
+
     def __init__(
         self,
         api_key: str,
@@ -79,6 +83,7 @@ class Google:
         retry_over_query_limit=True,
         skip_api_error: Optional[bool] = None,
         client=Client,
+        decode_geometry: Union[bool, str] = True,
         **client_kwargs
     ):
         """
@@ -113,6 +118,11 @@ class Google:
         :param client: A client class for request handling. Needs to be derived from :class:`routingpy.client_base.BaseClient`
         :type client: abc.ABCMeta
 
+        :param decode_geometry: True to decode the routes' encoded polylines right away, "lazy" to decode them on
+            first access to ``geometry`` or False to skip them, e.g. for jobs which only need durations and
+            distances. Default True.
+        :type decode_geometry: bool or str
+
         :param client_kwargs: Additional arguments passed to the client, such as headers or proxies.
         :type client_kwargs: dict
         """
@@ -128,6 +138,8 @@ class Google:
             skip_api_error,
             **client_kwargs
         )
+        self.client.router_name = self.__class__.__name__
+        self.decode_geometry = decode_geometry
 
     class WayPoint(object):
         """
@@ -323,12 +335,15 @@ class Google:
         if transit_routing_preference:
             params["transit_routing_preference"] = transit_routing_preference
 
-        return self.parse_direction_json(
-            self.client._request("/directions/json", get_params=params, dry_run=dry_run), alternatives
+        return self.client._parse_response(
+            self.parse_direction_json,
+            self.client._request("/directions/json", get_params=params, dry_run=dry_run),
+            alternatives,
+            self.decode_geometry,
         )
 
     @staticmethod
-    def parse_direction_json(response, alternatives):
+    def parse_direction_json(response, alternatives, decode_geometry=True):
         if response is None:  # pragma: no cover
             if alternatives:
                 return Directions()
@@ -352,13 +367,13 @@ class Google:
         if alternatives:
             routes = []
             for route in response["routes"]:
-                geometry = []
+                polylines = []
                 duration, distance = 0, 0
                 for leg in route["legs"]:
                     duration += leg["duration"]["value"]
                     distance += leg["distance"]["value"]
-                    for step in leg["steps"]:
-                        geometry.extend(utils.decode_polyline5(step["polyline"]["points"]))
+                    polylines.extend(step["polyline"]["points"] for step in leg["steps"])
+                geometry = EncodedGeometry.parse(polylines, utils.decode_polyline5, decode_geometry)
 
                 routes.append(
                     Direction(
@@ -367,13 +382,13 @@ class Google:
                 )
             return Directions(routes, response)
         else:
-            geometry = []
+            polylines = []
             duration, distance = 0, 0
             for leg in response["routes"][0]["legs"]:
                 duration += leg["duration"]["value"]
                 distance += leg["distance"]["value"]
-                for step in leg["steps"]:
-                    geometry.extend(utils.decode_polyline5(step["polyline"]["points"]))
+                polylines.extend(step["polyline"]["points"] for step in leg["steps"])
+            geometry = EncodedGeometry.parse(polylines, utils.decode_polyline5, decode_geometry)
 
             return Direction(geometry=geometry, duration=duration, distance=distance, raw=response)
 
@@ -396,6 +411,7 @@ class Google:
         transit_mode: Optional[Union[List[str], Tuple[str]]] = None,
         transit_routing_preference: Optional[str] = None,
         dry_run: Optional[bool] = None,
+        dtype: Optional[str] = None,
     ):
         """Gets travel distance and time for a matrix of origins and destinations.
 
@@ -454,6 +470,11 @@ class Google:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param dtype: Parse the durations and distances into NumPy arrays of this data type, e.g. "float32",
+            instead of nested lists, see :attr:`routingpy.matrix.Matrix.durations_array`. Unreachable pairs
+            are NaN. Requires numpy.
+        :type dtype: str
+
         :returns: A matrix from the specified sources and destinations.
         :rtype: :class:`routingpy.matrix.Matrix`
         """
@@ -510,15 +531,45 @@ class Google:
         if transit_routing_preference:
             params["transit_routing_preference"] = transit_routing_preference
 
-        return self.parse_matrix_json(
-            self.client._request("/distancematrix/json", get_params=params, dry_run=dry_run)
+        return self.client._parse_response(
+            self.parse_matrix_json,
+            self.client._request("/distancematrix/json", get_params=params, dry_run=dry_run),
+            dtype,
         )
 
     @staticmethod
-    def parse_matrix_json(response):
+    def parse_matrix_json(response, dtype=None):
         if response is None:  # pragma: no cover
             return Matrix()
 
+        if dtype is not None:
+            rows = response["rows"]
+            shape = (len(rows), len(rows[0]["elements"]) if rows else 0)
+            durations = fill_array(
+                (
+                    [
+                        element["duration"]["value"] if element["status"] == "OK" else None
+                        for element in row["elements"]
+                    ]
+                    for row in rows
+                ),
+                dtype,
+                shape,
+            )
+            distances = fill_array(
+                (
+                    [
+                        element["distance"]["value"] if element["status"] == "OK" else None
+                        for element in row["elements"]
+                    ]
+                    for row in rows
+                ),
+                dtype,
+                shape,
+            )
+
+            return Matrix(durations, distances, response)
+
         durations = []
         distances = []
         for row in response["rows"]:
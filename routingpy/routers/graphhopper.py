@@ -15,21 +15,25 @@
 # the License.
 #
 
+import functools
 from typing import List, Optional, Tuple, Union  # noqa: F401
 
 from .. import convert, utils
+from ..batch import TiledMatrixMixin
 from ..client_base import DEFAULT
 from ..client_default import Client
-from ..direction import Direction, Directions
+from ..direction import Direction, Directions, EncodedGeometry
 from ..isochrone import Isochrone, Isochrones
-from ..matrix import Matrix
+from ..matrix import Matrix, fill_array
 
 
-class Graphhopper:
+class Graphhopper(TiledMatrixMixin):
     """Performs requests to the Graphhopper API services."""
 
     _DEFAULT_BASE_URL = "https://graphhopper.com/api/1"
 
+    _MATRIX_TILE_SIZE = (40, 40)
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -40,6 +44,7 @@ class Graphhopper:
         retry_over_query_limit: Optional[bool] = False,
         skip_api_error: Optional[bool] = None,
         client=Client,
+        decode_geometry: Union[bool, str] = True,
         **client_kwargs
     ):
         """
@@ -78,6 +83,11 @@ class Graphhopper:
         :param client: A client class for request handling. Needs to be derived from :class:`routingpy.client_base.BaseClient`
         :type client: abc.ABCMeta
 
+        :param decode_geometry: True to decode the routes' encoded polylines right away, "lazy" to decode them on
+            first access to ``geometry`` or False to skip them, e.g. for jobs which only need durations and
+            distances. Default True.
+        :type decode_geometry: bool or str
+
         :param client_kwargs: Additional arguments passed to the client, such as headers or proxies.
         :type client_kwargs: dict
 
@@ -96,6 +106,8 @@ class Graphhopper:
             skip_api_error,
             **client_kwargs
         )
+        self.client.router_name = self.__class__.__name__
+        self.decode_geometry = decode_geometry
 
     def directions(  # noqa: C901
         self,
@@ -355,15 +367,17 @@ class Graphhopper:
 
         params = utils.deep_merge_dicts(params, direction_kwargs)
 
-        return self.parse_directions_json(
+        return self.client._parse_response(
+            self.parse_directions_json,
             self.client._request("/route", get_params=get_params, post_params=params, dry_run=dry_run),
             algorithm,
             elevation,
             points_encoded,
+            self.decode_geometry,
         )
 
     @staticmethod
-    def parse_directions_json(response, algorithm, elevation, points_encoded):
+    def parse_directions_json(response, algorithm, elevation, points_encoded, decode_geometry=True):
         if response is None:  # pragma: no cover
             if algorithm == "alternative_route":
                 return Directions()
@@ -374,7 +388,11 @@ class Graphhopper:
             routes = []
             for route in response["paths"]:
                 geometry = (
-                    utils.decode_polyline5(route["points"], elevation)
+                    EncodedGeometry.parse(
+                        route["points"],
+                        functools.partial(utils.decode_polyline5, is3d=elevation),
+                        decode_geometry,
+                    )
                     if points_encoded
                     else route["points"]["coordinates"]
                 )
@@ -389,7 +407,11 @@ class Graphhopper:
             return Directions(routes, response)
         else:
             geometry = (
-                utils.decode_polyline5(response["paths"][0]["points"], elevation)
+                EncodedGeometry.parse(
+                    response["paths"][0]["points"],
+                    functools.partial(utils.decode_polyline5, is3d=elevation),
+                    decode_geometry,
+                )
                 if points_encoded
                 else response["paths"][0]["points"]["coordinates"]
             )
@@ -484,7 +506,8 @@ class Graphhopper:
 
         params.extend(isochrones_kwargs.items())
 
-        return self.parse_isochrone_json(
+        return self.client._parse_response(
+            self.parse_isochrone_json,
             self.client._request("/isochrone", get_params=params, dry_run=dry_run),
             type,
             intervals[0],
@@ -525,6 +548,7 @@ class Graphhopper:
         out_array: Optional[List[str]] = ["times", "distances"],
         debug=None,
         dry_run: Optional[bool] = None,
+        dtype: Optional[str] = None,
         **matrix_kwargs
     ):
         """Gets travel distance and time for a matrix of origins and destinations.
@@ -563,6 +587,11 @@ class Graphhopper:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param dtype: Parse the durations and distances into NumPy arrays of this data type, e.g. "float32",
+            instead of nested lists, see :attr:`routingpy.matrix.Matrix.durations_array`. Unreachable pairs
+            are NaN. Requires numpy.
+        :type dtype: str
+
         :returns: A matrix from the specified sources and destinations.
         :rtype: :class:`routingpy.matrix.Matrix`
         """
@@ -616,15 +645,20 @@ class Graphhopper:
 
         params.extend(matrix_kwargs.items())
 
-        return self.parse_matrix_json(
+        return self.client._parse_response(
+            self.parse_matrix_json,
             self.client._request("/matrix", get_params=params, dry_run=dry_run),
+            dtype,
         )
 
     @staticmethod
-    def parse_matrix_json(response):
+    def parse_matrix_json(response, dtype=None):
         if response is None:  # pragma: no cover
             return Matrix()
         durations = response.get("times")
         distances = response.get("distances")
+        if dtype is not None:
+            durations = fill_array(durations, dtype) if durations is not None else None
+            distances = fill_array(distances, dtype) if distances is not None else None
 
         return Matrix(durations=durations, distances=distances, raw=response)
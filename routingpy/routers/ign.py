@@ -20,13 +20,14 @@ import warnings
 from typing import List, Optional, Tuple, Union  # noqa: F401
 
 from .. import convert, utils
+from ..batch import BatchMixin
 from ..client_base import DEFAULT
 from ..client_default import Client
-from ..direction import Direction
+from ..direction import Direction, EncodedGeometry
 from ..isochrone import Isochrone, Isochrones
 
 
-class IGN:
+class IGN(BatchMixin):
     """Performs requests to the IGN Geoportail "itineraire" geoservices"""
 
     _DEFAULT_BASE_URL = "https://data.geopf.fr/navigation"
@@ -40,6 +41,7 @@ class IGN:
         retry_over_query_limit: Optional[bool] = False,
         skip_api_error: Optional[bool] = None,
         client=Client,
+        decode_geometry: Union[bool, str] = True,
         **client_kwargs,
     ):
         """
@@ -68,6 +70,11 @@ class IGN:
 
         :param client: A client class for request handling. Needs to be derived from :class:`routingpy.client_base.BaseClient`
 
+        :param decode_geometry: True to decode the routes' encoded polylines right away, "lazy" to decode them on
+            first access to ``geometry`` or False to skip them, e.g. for jobs which only need durations and
+            distances. Default True.
+        :type decode_geometry: bool or str
+
         :param client_kwargs: Additional arguments passed to the client, such as headers or proxies.
         """
 
@@ -80,6 +87,8 @@ class IGN:
             skip_api_error,
             **client_kwargs,
         )
+        self.client.router_name = self.__class__.__name__
+        self.decode_geometry = decode_geometry
 
     def directions(
         self,
@@ -151,9 +160,11 @@ class IGN:
             **direction_kwargs,
         )
 
-        return self.parse_direction_json(
+        return self.client._parse_response(
+            self.parse_direction_json,
             self.client._request("/itineraire", get_params=params, dry_run=dry_run),
             geometry_format=geometry_format,
+            decode_geometry=self.decode_geometry,
         )
 
     @staticmethod
@@ -235,18 +246,18 @@ class IGN:
         return params
 
     @classmethod
-    def parse_geometry(cls, geometry, geometry_format):
+    def parse_geometry(cls, geometry, geometry_format, decode_geometry=True):
         if geometry is None:
             return None
         coo = None
         if geometry_format == "geojson" or geometry_format is None:
             coo = geometry.get("coordinates")
         elif geometry_format == "polyline":
-            coo = utils.decode_polyline5(geometry, is3d=False)
+            coo = EncodedGeometry.parse(geometry, utils.decode_polyline5, decode_geometry)
         return coo
 
     @staticmethod
-    def parse_direction_json(response, geometry_format):
+    def parse_direction_json(response, geometry_format, decode_geometry=True):
         if response is None or not isinstance(response, dict):  # pragma: no cover
             return Direction()
 
@@ -256,7 +267,7 @@ class IGN:
                 return int(val)
             return None
 
-        geometry = IGN.parse_geometry(response.get("geometry"), geometry_format)
+        geometry = IGN.parse_geometry(response.get("geometry"), geometry_format, decode_geometry)
 
         return Direction(
             geometry=geometry,
@@ -338,7 +349,8 @@ class IGN:
             crs=crs,
         )
 
-        return self.parse_isochrone_json(
+        return self.client._parse_response(
+            self.parse_isochrone_json,
             self.client._request("/isochrone", get_params=params, dry_run=dry_run),
             geometry_format=geometry_format,
         )
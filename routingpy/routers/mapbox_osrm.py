@@ -20,18 +20,22 @@ Core client functionality, common across all API requests.
 from typing import List, Optional, Tuple, Union
 
 from .. import convert, utils
+from ..batch import TiledMatrixMixin
 from ..client_base import DEFAULT
 from ..client_default import Client
-from ..direction import Direction, Directions
+from ..direction import Direction, Directions, EncodedGeometry
 from ..isochrone import Isochrone, Isochrones
-from ..matrix import Matrix
+from ..matrix import Matrix, fill_array
 
 
-class MapboxOSRM:
+class MapboxOSRM(TiledMatrixMixin):
     """Performs requests to the OSRM API services."""
 
     _base_url = "https://api.mapbox.com"
 
+    # At most 25 coordinates per request
+    _MATRIX_TILE_SIZE = (12, 13)
+
     def __init__(
         self,
         api_key: str,
@@ -41,6 +45,7 @@ class MapboxOSRM:
         retry_over_query_limit: Optional[bool] = False,
         skip_api_error: Optional[bool] = None,
         client=Client,
+        decode_geometry: Union[bool, str] = True,
         **client_kwargs
     ):
         """
@@ -75,6 +80,11 @@ class MapboxOSRM:
         :param client: A client class for request handling. Needs to be derived from :class:`routingpy.client_base.BaseClient`
         :type client: abc.ABCMeta
 
+        :param decode_geometry: True to decode the routes' encoded polylines right away, "lazy" to decode them on
+            first access to ``geometry`` or False to skip them, e.g. for jobs which only need durations and
+            distances. Default True.
+        :type decode_geometry: bool or str
+
         :param client_kwargs: Additional arguments passed to the client, such as headers or proxies.
         :type client_kwargs: dict
         """
@@ -92,6 +102,8 @@ class MapboxOSRM:
             skip_api_error,
             **client_kwargs
         )
+        self.client.router_name = self.__class__.__name__
+        self.decode_geometry = decode_geometry
 
     def directions(  # noqa: C901
         self,
@@ -115,6 +127,7 @@ class MapboxOSRM:
         waypoint_names: Optional[List[str]] = None,
         waypoint_targets: Optional[List[List[float]]] = None,
         dry_run: Optional[bool] = None,
+        coordinate_encoding: Optional[str] = None,
     ):
         """Get directions between an origin point and a destination point.
 
@@ -218,13 +231,15 @@ class MapboxOSRM:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param coordinate_encoding: Send the locations as encoded polyline, which is 3-4 times shorter than
+            plain coordinates. One of [None, "polyline", "polyline6"]. Default None.
+        :type coordinate_encoding: str
+
         :returns: One or multiple route(s) from provided coordinates and restrictions.
         :rtype: :class:`routingpy.direction.Direction` or :class:`routingpy.direction.Directions`
         """
 
-        coords = convert.delimit_list(
-            [convert.delimit_list([convert.format_float(f) for f in pair]) for pair in locations], ";"
-        )
+        coords = convert.format_coordinates(locations, coordinate_encoding, quote_polyline=False)
 
         params = {"coordinates": coords}
 
@@ -289,7 +304,8 @@ class MapboxOSRM:
 
         get_params = {"access_token": self.api_key} if self.api_key else {}
 
-        return self.parse_direction_json(
+        return self.client._parse_response(
+            self.parse_direction_json,
             self.client._request(
                 "/directions/v5/mapbox/" + profile,
                 get_params=get_params,
@@ -298,10 +314,11 @@ class MapboxOSRM:
             ),
             alternatives,
             geometries,
+            self.decode_geometry,
         )
 
     @staticmethod
-    def parse_direction_json(response, alternatives, geometry_format):
+    def parse_direction_json(response, alternatives, geometry_format, decode_geometry=True):
         if response is None:  # pragma: no cover
             if alternatives:
                 return Directions()
@@ -310,9 +327,9 @@ class MapboxOSRM:
 
         def _parse_geometry(route_geometry):
             if geometry_format in (None, "polyline"):
-                geometry = utils.decode_polyline5(route_geometry, is3d=False)
+                geometry = EncodedGeometry.parse(route_geometry, utils.decode_polyline5, decode_geometry)
             elif geometry_format == "polyline6":
-                geometry = utils.decode_polyline6(route_geometry, is3d=False)
+                geometry = EncodedGeometry.parse(route_geometry, utils.decode_polyline6, decode_geometry)
             elif geometry_format == "geojson":
                 geometry = route_geometry["coordinates"]
             else:
@@ -410,7 +427,8 @@ class MapboxOSRM:
 
         profile = profile.replace("mapbox/", "")
 
-        return self.parse_isochrone_json(
+        return self.client._parse_response(
+            self.parse_isochrone_json,
             self.client._request(
                 "/isochrone/v1/mapbox/" + profile + "/" + locations_string,
                 get_params=params,
@@ -445,6 +463,8 @@ class MapboxOSRM:
         annotations: Optional[List[str]] = None,
         fallback_speed: Optional[int] = None,
         dry_run: Optional[bool] = None,
+        dtype: Optional[str] = None,
+        coordinate_encoding: Optional[str] = None,
     ):
         """
         Gets travel distance and time for a matrix of origins and destinations.
@@ -480,13 +500,20 @@ class MapboxOSRM:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param dtype: Parse the durations and distances into NumPy arrays of this data type, e.g. "float32",
+            instead of nested lists, see :attr:`routingpy.matrix.Matrix.durations_array`. Unreachable pairs
+            are NaN. Requires numpy.
+        :type dtype: str
+
+        :param coordinate_encoding: Send the locations as encoded polyline in the URL, which is 3-4 times
+            shorter than plain coordinates. One of [None, "polyline", "polyline6"]. Default None.
+        :type coordinate_encoding: str
+
         :returns: A matrix from the specified sources and destinations.
         :rtype: :class:`routingpy.matrix.Matrix`
         """
 
-        coords = convert.delimit_list(
-            [convert.delimit_list([convert.format_float(f) for f in pair]) for pair in locations], ";"
-        )
+        coords = convert.format_coordinates(locations, coordinate_encoding)
 
         params = {"access_token": self.api_key}
 
@@ -502,19 +529,25 @@ class MapboxOSRM:
         if fallback_speed:
             params["fallback_speed"] = str(fallback_speed)
 
-        return self.parse_matrix_json(
+        return self.client._parse_response(
+            self.parse_matrix_json,
             self.client._request(
                 "/directions-matrix/v1/mapbox/" + profile + "/" + coords,
                 get_params=params,
                 dry_run=dry_run,
-            )
+            ),
+            dtype,
         )
 
     @staticmethod
-    def parse_matrix_json(response):
+    def parse_matrix_json(response, dtype=None):
         if response is None:  # pragma: no cover
             return Matrix()
 
-        return Matrix(
-            durations=response.get("durations"), distances=response.get("distances"), raw=response
-        )
+        durations = response.get("durations")
+        distances = response.get("distances")
+        if dtype is not None:
+            durations = fill_array(durations, dtype) if durations is not None else None
+            distances = fill_array(distances, dtype) if distances is not None else None
+
+        return Matrix(durations=durations, distances=distances, raw=response)
@@ -14,21 +14,30 @@
 # License for the specific language governing permissions and limitations under
 # the License.
 #
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from .. import utils
+from ..batch import TiledMatrixMixin
 from ..client_base import DEFAULT
 from ..client_default import Client
-from ..direction import Direction, Directions
+from ..direction import Direction, Directions, EncodedGeometry
 from ..isochrone import Isochrone, Isochrones
-from ..matrix import Matrix
+from ..matrix import Matrix, fill_array
 
 
-class ORS:
+def _decode_latlng(polyline):
+    # A module-level function rather than a lambda, so lazy geometries can be pickled
+    return [list(reversed(coord)) for coord in utils.decode_polyline5(polyline)]
+
+
+class ORS(TiledMatrixMixin):
     """Performs requests to the ORS API services."""
 
     _DEFAULT_BASE_URL = "https://api.openrouteservice.org"
 
+    # The public API allows 3500 routes per matrix request
+    _MATRIX_TILE_SIZE = (50, 50)
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -39,6 +48,7 @@ class ORS:
         retry_over_query_limit: Optional[bool] = False,
         skip_api_error: Optional[bool] = None,
         client=Client,
+        decode_geometry: Union[bool, str] = True,
         **client_kwargs
     ):
         """
@@ -77,6 +87,11 @@ class ORS:
         :param client: A client class for request handling. Needs to be derived from :class:`routingpy.client_base.BaseClient`
         :type client: abc.ABCMeta
 
+        :param decode_geometry: True to decode the routes' encoded polylines right away, "lazy" to decode them on
+            first access to ``geometry`` or False to skip them, e.g. for jobs which only need durations and
+            distances. Default True.
+        :type decode_geometry: bool or str
+
         :param client_kwargs: Additional arguments passed to the client, such as headers or proxies.
         :type client_kwargs: dict
         """
@@ -98,6 +113,8 @@ class ORS:
             skip_api_error,
             **client_kwargs
         )
+        self.client.router_name = self.__class__.__name__
+        self.decode_geometry = decode_geometry
 
     def directions(  # noqa: C901
         self,
@@ -300,7 +317,8 @@ class ORS:
                     )
             params["options"] = options
 
-        return self.parse_direction_json(
+        return self.client._parse_response(
+            self.parse_direction_json,
             self.client._request(
                 "/v2/directions/" + profile + "/" + format,
                 get_params={},
@@ -309,10 +327,11 @@ class ORS:
             ),
             format,
             alternative_routes,
+            self.decode_geometry,
         )
 
     @staticmethod
-    def parse_direction_json(response, format, alternative_routes):
+    def parse_direction_json(response, format, alternative_routes, decode_geometry=True):
         if response is None:  # pragma: no cover
             return Direction()
 
@@ -338,9 +357,11 @@ class ORS:
             if alternative_routes:
                 routes = []
                 for route in response["routes"]:
-                    geometry = [
-                        list(reversed(coord)) for coord in utils.decode_polyline5(route["geometry"])
-                    ]
+                    geometry = EncodedGeometry.parse(
+                        route["geometry"],
+                        _decode_latlng,
+                        decode_geometry,
+                    )
                     routes.append(
                         Direction(
                             geometry=geometry,
@@ -351,7 +372,9 @@ class ORS:
                     )
                 return Directions(routes, response)
             else:
-                geometry = utils.decode_polyline5(response["routes"][0]["geometry"])
+                geometry = EncodedGeometry.parse(
+                    response["routes"][0]["geometry"], utils.decode_polyline5, decode_geometry
+                )
                 duration = int(response["routes"][0]["summary"]["duration"])
                 distance = int(response["routes"][0]["summary"]["distance"])
 
@@ -432,7 +455,8 @@ class ORS:
         if intersections:
             params["intersections"] = intersections
 
-        return self.parse_isochrone_json(
+        return self.client._parse_response(
+            self.parse_isochrone_json,
             self.client._request(
                 "/v2/isochrones/" + profile + "/geojson",
                 get_params={},
@@ -469,6 +493,7 @@ class ORS:
         metrics: Optional[List[str]] = None,
         resolve_locations: Optional[bool] = None,
         dry_run: Optional[bool] = None,
+        dtype: Optional[str] = None,
     ):
         """Gets travel distance and time for a matrix of origins and destinations.
 
@@ -502,6 +527,11 @@ class ORS:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param dtype: Parse the durations and distances into NumPy arrays of this data type, e.g. "float32",
+            instead of nested lists, see :attr:`routingpy.matrix.Matrix.durations_array`. Unreachable pairs
+            are NaN. Requires numpy.
+        :type dtype: str
+
         :returns: A matrix from the specified sources and destinations.
         :rtype: :class:`routingpy.matrix.Matrix`
         """
@@ -520,16 +550,21 @@ class ORS:
         if resolve_locations is not None:
             params["resolve_locations"] = resolve_locations
 
-        return self.parse_matrix_json(
+        return self.client._parse_response(
+            self.parse_matrix_json,
             self.client._request(
                 "/v2/matrix/" + profile + "/json", get_params={}, post_params=params, dry_run=dry_run
-            )
+            ),
+            dtype,
         )
 
     @staticmethod
-    def parse_matrix_json(response):
+    def parse_matrix_json(response, dtype=None):
         if response is None:  # pragma: no cover
             return Matrix()
         durations = response.get("durations")
         distances = response.get("distances")
+        if dtype is not None:
+            durations = fill_array(durations, dtype) if durations is not None else None
+            distances = fill_array(distances, dtype) if distances is not None else None
         return Matrix(durations=durations, distances=distances, raw=response)
@@ -15,17 +15,23 @@
 # the License.
 #
 import datetime
-from typing import List, Optional  # noqa: F401
+from typing import List, Optional, Union  # noqa: F401
 
 from .. import convert, utils
+from ..batch import BatchMixin
 from ..client_base import DEFAULT
 from ..client_default import Client
-from ..direction import Direction, Directions
+from ..direction import Direction, Directions, EncodedGeometry
 from ..isochrone import Isochrone, Isochrones
 from ..raster import Raster
 
 
-class OpenTripPlannerV2:
+def _decode_reversed(polyline):
+    # A module-level function rather than a lambda, so lazy geometries can be pickled
+    return list(reversed(utils.decode_polyline5(polyline)))
+
+
+class OpenTripPlannerV2(BatchMixin):
     """Performs requests over OpenTripPlannerV2 GraphQL API."""
 
     _DEFAULT_BASE_URL = "http://localhost:8080"
@@ -39,6 +45,7 @@ class OpenTripPlannerV2:
         retry_over_query_limit: Optional[bool] = False,
         skip_api_error: Optional[bool] = None,
         client=Client,
+        decode_geometry: Union[bool, str] = True,
         **client_kwargs,
     ):
         """
@@ -77,6 +84,11 @@ class OpenTripPlannerV2:
             :class:`routingpy.client_base.BaseClient`
         :type client: abc.ABCMeta
 
+        :param decode_geometry: True to decode the routes' encoded polylines right away, "lazy" to decode them on
+            first access to ``geometry`` or False to skip them, e.g. for jobs which only need durations and
+            distances. Default True.
+        :type decode_geometry: bool or str
+
         :param client_kwargs: Additional arguments passed to the client, such as headers or proxies.
         :type client_kwargs: dict
         """
@@ -90,6 +102,8 @@ class OpenTripPlannerV2:
             skip_api_error,
             **client_kwargs,
         )
+        self.client.router_name = self.__class__.__name__
+        self.decode_geometry = decode_geometry
 
     def directions(
         self,
@@ -165,7 +179,7 @@ class OpenTripPlannerV2:
         response = self.client._request(
             "/otp/routers/default/index/graphql", post_params=params, dry_run=dry_run
         )
-        return self._parse_directions_response(response, num_itineraries)
+        return self.client._parse_response(self._parse_directions_response, response, num_itineraries)
 
     def _parse_directions_response(self, response, num_itineraries):
         if response is None:  # pragma: no cover
@@ -194,11 +208,13 @@ class OpenTripPlannerV2:
 
     def _parse_legs(self, legs):
         distance = 0
-        geometry = []
         for leg in legs:
-            points = utils.decode_polyline5(leg["legGeometry"]["points"])
-            geometry.extend(list(reversed(points)))
             distance += int(leg["distance"])
+        geometry = EncodedGeometry.parse(
+            [leg["legGeometry"]["points"] for leg in legs],
+            _decode_reversed,
+            self.decode_geometry,
+        )
 
         return geometry, distance
 
@@ -249,7 +265,7 @@ class OpenTripPlannerV2:
             get_params=params,
             dry_run=dry_run,
         )
-        return self._parse_isochrones_response(response)
+        return self.client._parse_response(self._parse_isochrones_response, response)
 
     def _parse_isochrones_response(self, response):
         if response is None:  # pragma: no cover
@@ -275,6 +291,7 @@ class OpenTripPlannerV2:
         cutoff: Optional[int] = 3600,
         arrive_by: Optional[bool] = False,
         dry_run: Optional[bool] = None,
+        stream_to=None,
     ):
         """Get raster for a time value around a given set of coordinates.
 
@@ -297,6 +314,10 @@ class OpenTripPlannerV2:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param stream_to: A file path or a binary file object to write the GeoTIFF to in chunks, instead of
+            holding it in memory. The returned raster then references the file by its path.
+        :type stream_to: str or os.PathLike or file object
+
         :returns: A raster with the specified range.
         :rtype: :class:`routingpy.raster.Raster`
         """
@@ -311,12 +332,15 @@ class OpenTripPlannerV2:
             "/otp/traveltime/surface",
             get_params=params,
             dry_run=dry_run,
+            stream_to=stream_to,
         )
-        return self._parse_rasters_response(response, cutoff)
+        return self.client._parse_response(self._parse_rasters_response, response, cutoff)
 
     def _parse_rasters_response(self, response, max_travel_time):
         if response is None:  # pragma: no cover
             return Raster()
+        if not isinstance(response, (bytes, bytearray)):
+            return Raster.from_stream(response, max_travel_time=max_travel_time)
 
         return Raster(image=response, max_travel_time=max_travel_time)
 
@@ -18,17 +18,21 @@
 from typing import List, Optional, Union  # noqa: F401
 
 from .. import convert, utils
+from ..batch import TiledMatrixMixin
 from ..client_base import DEFAULT
 from ..client_default import Client
-from ..direction import Direction, Directions
-from ..matrix import Matrix
+from ..direction import Direction, Directions, EncodedGeometry
+from ..matrix import Matrix, fill_array
 
 
-class OSRM:
+class OSRM(TiledMatrixMixin):
     """Performs requests to the OSRM API services."""
 
     _DEFAULT_BASE_URL = "https://routing.openstreetmap.de/routed-bike"
 
+    # OSRM's default max_table_size is 100 locations
+    _MATRIX_TILE_SIZE = (50, 50)
+
     def __init__(
         self,
         base_url: Optional[str] = _DEFAULT_BASE_URL,
@@ -38,6 +42,7 @@ class OSRM:
         retry_over_query_limit: Optional[bool] = False,
         skip_api_error: Optional[bool] = None,
         client=Client,
+        decode_geometry: Union[bool, str] = True,
         **client_kwargs,
     ):
         """
@@ -73,6 +78,11 @@ class OSRM:
         :param client: A client class for request handling. Needs to be derived from :class:`routingpy.client_base.BaseClient`
         :type client: abc.ABCMeta
 
+        :param decode_geometry: True to decode the routes' encoded polylines right away, "lazy" to decode them on
+            first access to ``geometry`` or False to skip them, e.g. for jobs which only need durations and
+            distances. Default True.
+        :type decode_geometry: bool or str
+
         :param client_kwargs: Additional arguments passed to the client, such as headers or proxies.
         :type client_kwargs: dict
         """
@@ -86,6 +96,8 @@ class OSRM:
             skip_api_error,
             **client_kwargs,
         )
+        self.client.router_name = self.__class__.__name__
+        self.decode_geometry = decode_geometry
 
     def directions(
         self,
@@ -100,6 +112,7 @@ class OSRM:
         geometries: Optional[str] = None,
         overview: Optional[str] = None,
         dry_run: Optional[bool] = None,
+        coordinate_encoding: Optional[str] = None,
         **direction_kwargs,
     ):
         """
@@ -164,12 +177,14 @@ class OSRM:
         :param dry_run: Print URL and parameters without sending the request.
         :param dry_run: bool
 
+        :param coordinate_encoding: Send the locations as encoded polyline in the URL, which is 3-4 times
+            shorter than plain coordinates. One of [None, "polyline", "polyline6"]. Default None.
+        :type coordinate_encoding: str
+
         :returns: One or multiple route(s) from provided coordinates and restrictions.
         :rtype: :class:`routingpy.direction.Direction` or :class:`routingpy.direction.Directions`
         """
-        coords = convert.delimit_list(
-            [convert.delimit_list([convert.format_float(f) for f in pair]) for pair in locations], ";"
-        )
+        coords = convert.format_coordinates(locations, coordinate_encoding)
 
         params = self.get_direction_params(
             locations,
@@ -185,10 +200,12 @@ class OSRM:
             **direction_kwargs,
         )
 
-        return self.parse_direction_json(
+        return self.client._parse_response(
+            self.parse_direction_json,
             self.client._request(f"/route/v1/{profile}/{coords}", get_params=params, dry_run=dry_run),
             alternatives,
             geometries,
+            self.decode_geometry,
         )
 
     @staticmethod
@@ -245,7 +262,7 @@ class OSRM:
         return params
 
     @staticmethod
-    def parse_direction_json(response, alternatives, geometry_format):
+    def parse_direction_json(response, alternatives, geometry_format, decode_geometry=True):
         if response is None:  # pragma: no cover
             if alternatives:
                 return Directions()
@@ -254,9 +271,9 @@ class OSRM:
 
         def _parse_geometry(route_geometry):
             if geometry_format in (None, "polyline"):
-                geometry = utils.decode_polyline5(route_geometry, is3d=False)
+                geometry = EncodedGeometry.parse(route_geometry, utils.decode_polyline5, decode_geometry)
             elif geometry_format == "polyline6":
-                geometry = utils.decode_polyline6(route_geometry, is3d=False)
+                geometry = EncodedGeometry.parse(route_geometry, utils.decode_polyline6, decode_geometry)
             elif geometry_format == "geojson":
                 geometry = route_geometry["coordinates"]
             else:
@@ -298,6 +315,8 @@ class OSRM:
         destinations: Optional[List[int]] = None,
         dry_run: Optional[bool] = None,
         annotations: Optional[List[str]] = ("duration", "distance"),
+        dtype: Optional[str] = None,
+        coordinate_encoding: Optional[str] = None,
         **matrix_kwargs,
     ):
         """
@@ -350,6 +369,15 @@ class OSRM:
             One or more of ["duration", "distance"].
         :type annotations: List[str]
 
+        :param dtype: Parse the durations and distances into NumPy arrays of this data type, e.g. "float32",
+            instead of nested lists, see :attr:`routingpy.matrix.Matrix.durations_array`. Unreachable pairs
+            are NaN. Requires numpy.
+        :type dtype: str
+
+        :param coordinate_encoding: Send the locations as encoded polyline in the URL, which is 3-4 times
+            shorter than plain coordinates. One of [None, "polyline", "polyline6"]. Default None.
+        :type coordinate_encoding: str
+
         :returns: A matrix from the specified sources and destinations.
         :rtype: :class:`routingpy.matrix.Matrix`
 
@@ -357,16 +385,16 @@ class OSRM:
            Add annotations parameter to get both distance and duration
         """
 
-        coords = convert.delimit_list(
-            [convert.delimit_list([convert.format_float(f) for f in pair]) for pair in locations], ";"
-        )
+        coords = convert.format_coordinates(locations, coordinate_encoding)
 
         params = self.get_matrix_params(
             locations, profile, radiuses, bearings, sources, destinations, annotations, **matrix_kwargs
         )
 
-        return self.parse_matrix_json(
-            self.client._request(f"/table/v1/{profile}/{coords}", get_params=params, dry_run=dry_run)
+        return self.client._parse_response(
+            self.parse_matrix_json,
+            self.client._request(f"/table/v1/{profile}/{coords}", get_params=params, dry_run=dry_run),
+            dtype,
         )
 
     @staticmethod
@@ -411,10 +439,14 @@ class OSRM:
         return params
 
     @staticmethod
-    def parse_matrix_json(response):
+    def parse_matrix_json(response, dtype=None):
         if response is None:  # pragma: no cover
             return Matrix()
 
-        return Matrix(
-            durations=response.get("durations"), distances=response.get("distances"), raw=response
-        )
+        durations = response.get("durations")
+        distances = response.get("distances")
+        if dtype is not None:
+            durations = fill_array(durations, dtype) if durations is not None else None
+            distances = fill_array(distances, dtype) if distances is not None else None
+
+        return Matrix(durations=durations, distances=distances, raw=response)
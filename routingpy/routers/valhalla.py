@@ -15,26 +15,31 @@
 # the License.
 #
 
+from itertools import islice
 from operator import itemgetter
-from typing import List, Optional, Sequence, Union
+from typing import Iterator, List, Optional, Sequence, Union
 
 from .. import utils
-from ..client_base import DEFAULT
+from ..batch import TiledMatrixMixin
+from ..client_base import DEFAULT, STREAM_CHUNKS
 from ..client_default import Client
-from ..direction import Direction, Directions
-from ..expansion import Edge, Expansions
+from ..direction import Direction, Directions, EncodedGeometry
+from ..expansion import ColumnarExpansions, Edge, Expansions
 from ..isochrone import Isochrone, Isochrones
-from ..matrix import Matrix
+from ..matrix import Matrix, fill_array
 from ..optimized import OptimizedDirection
 from ..raster import Raster
 from ..valhalla_attributes import MatchedResults
 
 
-class Valhalla:
+class Valhalla(TiledMatrixMixin):
     """Performs requests to a Valhalla instance."""
 
     _DEFAULT_BASE_URL = "https://valhalla1.openstreetmap.de"
 
+    # Valhalla's default max_matrix_location_pairs is 2500
+    _MATRIX_TILE_SIZE = (50, 50)
+
     def __init__(
         self,
         base_url: str = _DEFAULT_BASE_URL,
@@ -44,6 +49,7 @@ class Valhalla:
         retry_over_query_limit: Optional[bool] = False,
         skip_api_error: Optional[bool] = None,
         client=Client,
+        decode_geometry: Union[bool, str] = True,
         **client_kwargs: dict
     ):
         """
@@ -73,6 +79,11 @@ class Valhalla:
         :param client: A client class for request handling. Needs to be derived from :class:`routingpy.base.BaseClient`
         :type client: abc.ABCMeta
 
+        :param decode_geometry: True to decode the routes' encoded polylines right away, "lazy" to decode them on
+            first access to ``geometry`` or False to skip them, e.g. for jobs which only need durations and
+            distances. Default True.
+        :type decode_geometry: bool or str
+
         :param client_kwargs: Additional arguments passed to the client, such as headers or proxies.
         """
 
@@ -85,6 +96,8 @@ class Valhalla:
             skip_api_error,
             **client_kwargs
         )
+        self.client.router_name = self.__class__.__name__
+        self.decode_geometry = decode_geometry
 
     class Waypoint(object):
         """
@@ -205,9 +218,11 @@ class Valhalla:
             **kwargs
         )
 
-        return self.parse_direction_json(
+        return self.client._parse_response(
+            self.parse_direction_json,
             self.client._request("/route", post_params=params, dry_run=dry_run),
             alternatives,
+            self.decode_geometry,
         )
 
     @staticmethod
@@ -276,7 +291,7 @@ class Valhalla:
         return params
 
     @staticmethod
-    def parse_direction_json(response, alternatives):
+    def parse_direction_json(response, alternatives, decode_geometry=True):
         if response is None:  # pragma: no cover
             return Directions() if alternatives else Direction()
 
@@ -284,13 +299,15 @@ class Valhalla:
         routes = [response] if not alternatives else [response] + response.get("alternates", [])
 
         for route in routes:
-            geometry, duration, distance = [], 0, 0
+            duration, distance = 0, 0
             for leg in route["trip"]["legs"]:
-                geometry.extend(utils.decode_polyline6(leg["shape"]))
                 duration += leg["summary"]["time"]
                 distance += leg["summary"]["length"]
 
             distance *= 1000  # convert to meters
+            geometry = EncodedGeometry.parse(
+                [leg["shape"] for leg in route["trip"]["legs"]], utils.decode_polyline6, decode_geometry
+            )
 
             directions.append(
                 Direction(
@@ -404,7 +421,8 @@ class Valhalla:
             **kwargs
         )
 
-        return self.parse_isochrone_json(
+        return self.client._parse_response(
+            self.parse_isochrone_json,
             self.client._request("/isochrone", post_params=params, dry_run=dry_run),
             intervals,
             locations,
@@ -530,12 +548,17 @@ class Valhalla:
         show_locations: Optional[List[List[float]]] = None,
         id: Optional[str] = None,
         dry_run: Optional[bool] = None,
+        stream_to=None,
         **kwargs
     ):
         """
         For parameters see docs for isochrones.
 
         Returns isochrones/isodistances as GeoTIFF
+
+        :param stream_to: A file path or a binary file object to write the GeoTIFF to in chunks, instead of
+            holding it in memory. The returned raster then references the file by its path.
+        :type stream_to: str or os.PathLike or file object
         """
         params = self.get_isochrone_params(
             locations,
@@ -557,14 +580,18 @@ class Valhalla:
         )
         params["format"] = "geotiff"
 
-        return self.parse_raster_response(
-            self.client._request("/isochrone", post_params=params, dry_run=dry_run), max(intervals)
+        return self.client._parse_response(
+            self.parse_raster_response,
+            self.client._request("/isochrone", post_params=params, dry_run=dry_run, stream_to=stream_to),
+            max(intervals),
         )
 
     @staticmethod
     def parse_raster_response(response, max_travel_time: int) -> Raster:
         if response is None:  # pragma: no cover
             return Raster()
+        if not isinstance(response, (bytes, bytearray)):
+            return Raster.from_stream(response, max_travel_time=max_travel_time)
 
         return Raster(image=response, max_travel_time=max_travel_time)
 
@@ -581,6 +608,7 @@ class Valhalla:
         date_time: Optional[dict] = None,
         id: Optional[str] = None,
         dry_run: Optional[bool] = None,
+        dtype: Optional[str] = None,
         **kwargs
     ):
         """
@@ -627,6 +655,11 @@ class Valhalla:
 
         :param dry_run: Print URL and parameters without sending the request.
 
+        :param dtype: Parse the durations and distances into NumPy arrays of this data type, e.g. "float32",
+            instead of nested lists, see :attr:`routingpy.matrix.Matrix.durations_array`. Unreachable pairs
+            are NaN. Requires numpy.
+        :type dtype: str
+
         :returns: A matrix from the specified sources and destinations.
         :rtype: :class:`routingpy.matrix.Matrix`
         """
@@ -645,8 +678,10 @@ class Valhalla:
             **kwargs
         )
 
-        return self.parse_matrix_json(
-            self.client._request("/sources_to_targets", post_params=params, dry_run=dry_run)
+        return self.client._parse_response(
+            self.parse_matrix_json,
+            self.client._request("/sources_to_targets", post_params=params, dry_run=dry_run),
+            dtype,
         )
 
     @staticmethod
@@ -718,10 +753,23 @@ class Valhalla:
         return params
 
     @staticmethod
-    def parse_matrix_json(response):
+    def parse_matrix_json(response, dtype=None):
         if response is None:  # pragma: no cover
             return Matrix()
 
+        if dtype is not None:
+            rows = response["sources_to_targets"]
+            shape = (len(rows), len(rows[0]) if rows else 0)
+            durations = fill_array(
+                ([destination["time"] for destination in origin] for origin in rows), dtype, shape
+            )
+            distances = fill_array(
+                ([destination["distance"] for destination in origin] for origin in rows), dtype, shape
+            )
+            distances *= 1000
+
+            return Matrix(durations=durations, distances=distances, raw=response)
+
         durations = [
             [destination["time"] for destination in origin] for origin in response["sources_to_targets"]
         ]
@@ -747,6 +795,8 @@ class Valhalla:
         date_time: Optional[dict] = None,
         id: Optional[str] = None,
         dry_run: Optional[bool] = None,
+        stream_to=None,
+        columnar: bool = False,
         **kwargs
     ) -> Expansions:
         """Gets the expansion tree for a range of time or distance values around a given coordinate.
@@ -783,7 +833,16 @@ class Valhalla:
 
         :param dry_run: Print URL and parameters without sending the request.
 
-        :returns: An expansions object consisting of single line strings and their attributes (if specified).
+        :param stream_to: A file path or a binary file object opened for reading and writing, e.g.
+            :func:`tempfile.TemporaryFile`, to write the GeoJSON response to in chunks instead of buffering it
+            in memory. The edges are then decoded one by one from the file, so only the parsed edges are held
+            in memory, and the expansions don't keep the raw response.
+
+        :param columnar: Parse the edges into flat typed arrays instead of one :class:`routingpy.expansion.Edge`
+            per edge, which takes a fraction of the memory for large expansions. Default False.
+
+        :returns: An expansions object consisting of single line strings and their attributes (if specified),
+            a :class:`routingpy.expansion.ColumnarExpansions` if ``columnar``.
         """
         params = self.get_expansion_params(
             locations,
@@ -797,11 +856,74 @@ class Valhalla:
             id,
             **kwargs
         )
-        return self.parse_expansion_json(
-            self.client._request("/expansion", post_params=params, dry_run=dry_run),
+        return self.client._parse_response(
+            self.parse_expansion_json,
+            self.client._request("/expansion", post_params=params, dry_run=dry_run, stream_to=stream_to),
             locations,
             expansion_properties,
             interval_type,
+            columnar=columnar,
+        )
+
+    def expansion_iter(
+        self,
+        locations: Sequence[float],
+        profile: str,
+        intervals: Sequence[int],
+        skip_opposites: Optional[bool] = None,
+        expansion_properties: Optional[Sequence[str]] = None,
+        interval_type: Optional[str] = "time",
+        options: Optional[dict] = None,
+        date_time: Optional[dict] = None,
+        id: Optional[str] = None,
+        dry_run: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+        columnar: bool = False,
+        **kwargs
+    ) -> Iterator[Union[Edge, Expansions]]:
+        """Gets the expansion tree like :meth:`expansion`, but parses the edges incrementally while the
+        response is read from the connection, so the memory used is bounded by the batch size rather than the
+        size of the response. The connection is released once the iterator is exhausted or closed.
+
+        With :class:`routingpy.client_async.AsyncClient`, awaiting the call returns an asynchronous
+        iterator, which reads from the connection on the client's thread pool, e.g.
+        ``async for edge in await router.expansion_iter(...)``.
+
+        For the parameters not listed here, see :meth:`expansion`.
+
+        :param batch_size: The number of edges per batch. Default None, i.e. the edges are yielded one by one.
+
+        :param columnar: Yield the batches as :class:`routingpy.expansion.ColumnarExpansions`. Requires a
+            ``batch_size``. Default False.
+
+        :returns: An iterator over the edges, or over :class:`routingpy.expansion.Expansions` of up to
+            ``batch_size`` edges. The batches don't keep the raw response.
+        """
+        if columnar and batch_size is None:
+            raise ValueError("columnar requires a batch_size.")
+
+        params = self.get_expansion_params(
+            locations,
+            profile,
+            intervals,
+            skip_opposites,
+            expansion_properties,
+            interval_type,
+            options,
+            date_time,
+            id,
+            **kwargs
+        )
+        return self.client._parse_stream(
+            self.parse_expansion_stream,
+            self.client._request(
+                "/expansion", post_params=params, dry_run=dry_run, stream_to=STREAM_CHUNKS
+            ),
+            locations,
+            expansion_properties,
+            interval_type,
+            batch_size=batch_size,
+            columnar=columnar,
         )
 
     @classmethod
@@ -838,21 +960,68 @@ class Valhalla:
         return params
 
     @staticmethod
-    def parse_expansion_json(response, locations, expansion_properties, interval_type):
+    def parse_expansion_json(response, locations, expansion_properties, interval_type, columnar=False):
+        if response is not None and not isinstance(response, dict):
+            # Decodes the features one by one from the file the response was streamed to
+            features = utils.iter_json_array(utils.read_stream(response), "features")
+            if columnar:
+                return ColumnarExpansions.from_features(
+                    features, expansion_properties, locations, interval_type
+                )
+            edges = [Valhalla._parse_edge(feature, expansion_properties) for feature in features]
+            return Expansions(edges, locations, interval_type)
         if response is None or "features" not in response:  # pragma: no cover
             return Expansions()
 
-        expansions = []
-        for feature in response["features"]:
-            line = feature["geometry"]["coordinates"]
-            properties = {}
-            if expansion_properties:
-                for expansion_prop in expansion_properties:
-                    properties[expansion_prop] = feature["properties"][expansion_prop]
-            expansions.append(Edge(geometry=line, **properties))
+        if columnar:
+            return ColumnarExpansions.from_features(
+                response["features"], expansion_properties, locations, interval_type, response
+            )
+
+        expansions = [
+            Valhalla._parse_edge(feature, expansion_properties) for feature in response["features"]
+        ]
 
         return Expansions(expansions, locations, interval_type, response)
 
+    @staticmethod
+    def _parse_edge(feature, expansion_properties):
+        line = feature["geometry"]["coordinates"]
+        properties = {}
+        if expansion_properties:
+            feature_properties = feature.get("properties") or {}
+            for expansion_prop in expansion_properties:
+                properties[expansion_prop] = feature_properties.get(expansion_prop)
+        return Edge(geometry=line, **properties)
+
+    @staticmethod
+    def parse_expansion_stream(
+        chunks, locations, expansion_properties, interval_type, batch_size=None, columnar=False
+    ):
+        if chunks is None:
+            return iter(())
+
+        features = utils.iter_json_array(chunks, "features")
+        if batch_size is None:
+            return (Valhalla._parse_edge(feature, expansion_properties) for feature in features)
+
+        def batches():
+            while True:
+                # Features are parsed as they're decoded, so only the batch's edges are held in memory
+                batch = islice(features, batch_size)
+                if columnar:
+                    expansions = ColumnarExpansions.from_features(
+                        batch, expansion_properties, locations, interval_type
+                    )
+                else:
+                    edges = [Valhalla._parse_edge(feature, expansion_properties) for feature in batch]
+                    expansions = Expansions(edges, locations, interval_type)
+                if not len(expansions):
+                    return
+                yield expansions
+
+        return batches()
+
     def trace_attributes(
         self,
         locations: Optional[Sequence[Union[Sequence[float], Waypoint]]] = None,
@@ -863,6 +1032,7 @@ class Valhalla:
         filters_action: Optional[str] = None,
         options: Optional[dict] = None,
         dry_run: Optional[bool] = None,
+        coordinate_encoding: Optional[str] = None,
         **kwargs
     ) -> MatchedResults:
         """
@@ -886,6 +1056,8 @@ class Valhalla:
             will be filled automatically. For more information, visit:
             https://valhalla.github.io/valhalla/api/turn-by-turn/api-reference/#costing-options
         :param dry_run: Print URL and parameters without sending the request.
+        :param coordinate_encoding: Send the locations as ``encoded_polyline``, which is 3-4 times shorter than
+            the ``shape``. Only "polyline6" is supported and the locations can't be :class:`Waypoint`. Default None.
 
         :raises: ValueError if 'locations' and 'encoded_polyline' was specified
         :returns: A :class:`MatchedResults` object with matched edges and points set.
@@ -893,12 +1065,24 @@ class Valhalla:
         if locations and encoded_polyline:
             raise ValueError
 
+        if coordinate_encoding is not None:
+            if coordinate_encoding != "polyline6":
+                raise ValueError(
+                    "coordinate_encoding must be 'polyline6', not {}.".format(coordinate_encoding)
+                )
+            if any(isinstance(location, self.Waypoint) for location in locations or []):
+                raise ValueError("Waypoints can't be sent as encoded polyline.")
+            if locations:
+                encoded_polyline = utils.encode_polyline6(locations)
+                locations = None
+
         params = self.get_trace_attributes_params(
             locations, profile, shape_match, encoded_polyline, filters, filters_action, options, **kwargs
         )
 
-        return self.parse_trace_attributes_json(
-            self.client._request("/trace_attributes", post_params=params, dry_run=dry_run)
+        return self.client._parse_response(
+            self.parse_trace_attributes_json,
+            self.client._request("/trace_attributes", post_params=params, dry_run=dry_run),
         )
 
     @classmethod
@@ -1037,25 +1221,29 @@ class Valhalla:
             **kwargs
         )
 
-        return self.parse_optimized_json(
-            self.client._request("/optimized_route", post_params=params, dry_run=dry_run)
+        return self.client._parse_response(
+            self.parse_optimized_json,
+            self.client._request("/optimized_route", post_params=params, dry_run=dry_run),
+            self.decode_geometry,
         )
 
     @staticmethod
-    def parse_optimized_json(response):
+    def parse_optimized_json(response, decode_geometry=True):
         if response is None:  # pragma: no cover
             return OptimizedDirection()
 
-        geometry, duration, distance, original_indices = [], 0, 0, []
+        duration, distance, original_indices = 0, 0, []
         for loc in response["trip"]["locations"]:
             original_indices.append(loc["original_index"])
 
         for leg in response["trip"]["legs"]:
-            geometry.extend(utils.decode_polyline6(leg["shape"]))
             duration += leg["summary"]["time"]
             distance += leg["summary"]["length"]
 
         distance *= 1000  # convert to meters
+        geometry = EncodedGeometry.parse(
+            [leg["shape"] for leg in response["trip"]["legs"]], utils.decode_polyline6, decode_geometry
+        )
 
         return OptimizedDirection(
             geometry=geometry,
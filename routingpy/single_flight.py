@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Coalescing of identical requests in flight.
+"""
+import threading
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Runs a function only once for concurrent calls with the same key: the first call sends the request,
+    the others wait for its result or exception.
+
+    >>> from routingpy import Valhalla
+    >>> from routingpy.single_flight import SingleFlight
+    >>> router = Valhalla("http://localhost:8002", single_flight=SingleFlight())
+
+    Waiting calls get the same response body as the first one, so it must not be modified.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func, *args):
+        """
+        Calls ``func(*args)`` or, if a call with the same key is in flight, waits for its result.
+
+        :param key: The request's key, e.g. built by :func:`routingpy.cache.cache_key`.
+        :type key: str
+
+        :param func: The function sending the request.
+        :type func: callable
+
+        :returns: The function's result.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        self.record(shared=not leader)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def record(self, shared: bool):
+        """
+        Counts a call, e.g. one coalesced by :class:`routingpy.client_async.AsyncClient` on its event loop.
+
+        :param shared: Whether the call waited for another one's result.
+        :type shared: bool
+        """
+        with self._lock:
+            self.calls += 1
+            if shared:
+                self.shared += 1
+
+    @property
+    def stats(self) -> dict:
+        """
+        The number of calls and of calls which waited for another one's result.
+
+        :rtype: dict
+        """
+        return {"calls": self.calls, "shared": self.shared}
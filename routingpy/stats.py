@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Request statistics with latency histograms per endpoint, collected from the clients' instrumentation hooks.
+"""
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+
+_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class LatencyHistogram(object):
+    """
+    A histogram of durations with HDR-style log-linear buckets: every power of two is split into
+    ``2 ** sub_bucket_bits`` linear buckets, so quantiles have a relative error of at most
+    ``2 ** -sub_bucket_bits`` over any range of values, at a small constant memory footprint.
+    """
+
+    def __init__(self, resolution: float = 1e-6, sub_bucket_bits: int = 5):
+        """
+        :param resolution: The smallest distinguishable duration in seconds. Default 1 microsecond.
+        :type resolution: float
+
+        :param sub_bucket_bits: The number of bits of the linear sub-buckets, 5 for buckets ~3% wide, i.e. a
+            relative error of at most ~1.6% around their middle. Default 5.
+        :type sub_bucket_bits: int
+        """
+        self.resolution = resolution
+        self.sub_bucket_bits = sub_bucket_bits
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self._buckets = defaultdict(int)
+
+    def _index(self, units):
+        # Keeps sub_bucket_bits bits below the leading one, i.e. 2 ** sub_bucket_bits buckets per power of
+        # two. Values below 2 ** (sub_bucket_bits + 1) fall into exact buckets.
+        shift = max(units.bit_length() - self.sub_bucket_bits - 1, 0)
+        return shift, units >> shift
+
+    def _value(self, index):
+        shift, sub_bucket = index
+        # The middle of the bucket
+        return ((sub_bucket << shift) + ((1 << shift) - 1) / 2) * self.resolution
+
+    def record(self, value: float):
+        """
+        Records a duration.
+
+        :param value: The duration in seconds.
+        :type value: float
+        """
+        self._buckets[self._index(max(int(value / self.resolution), 0))] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Returns the duration below which the fraction ``q`` of the recorded durations fall.
+
+        :param q: The quantile between 0 and 1, e.g. 0.95.
+        :type q: float
+
+        :rtype: float or None
+        """
+        if not self.count:
+            return None
+
+        rank = max(q * self.count, 1)
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(max(self._value(index), self.min), self.max)
+
+    def snapshot(self) -> dict:
+        """
+        Returns the count, sum, mean, minimum, maximum and the p50, p95 and p99 quantiles.
+
+        :rtype: dict
+        """
+        summary = {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+        }
+        for q in _QUANTILES:
+            summary["p{}".format(int(q * 100))] = self.quantile(q)
+
+        return summary
+
+
+class _EndpointStats(object):
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.rate_limit_sleep = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.statuses = defaultdict(int)
+        self.latency = LatencyHistogram()
+        self.ttfb = LatencyHistogram()
+
+    def snapshot(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": self.errors / self.requests if self.requests else 0.0,
+            "retries": self.retries,
+            "rate_limit_sleep": self.rate_limit_sleep,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "statuses": dict(self.statuses),
+            "latency": self.latency.snapshot(),
+            "ttfb": self.ttfb.snapshot(),
+        }
+
+
+class StatsCollector(object):
+    """
+    Collects request counts, error rates, retries, bytes transferred, latency histograms and parse times
+    of one or more routers, per router and endpoint. An endpoint is the base URL and the first
+    ``path_segments`` segments of the URL path, e.g. ``http://localhost:5000/table/v1``.
+
+    >>> from routingpy import OSRM
+    >>> from routingpy.stats import StatsCollector
+    >>> stats = StatsCollector()
+    >>> router = stats.attach(OSRM("http://localhost:5000"))
+    >>> matrix = router.matrix(locations)
+    >>> stats.snapshot()["endpoints"][("OSRM", "http://localhost:5000/table/v1")]["latency"]["p95"]
+    0.0123
+    >>> print(stats.to_prometheus())
+
+    Attempts count as errors if they failed or got an HTTP status of 400 or above.
+    """
+
+    def __init__(self, path_segments: int = 2):
+        """
+        :param path_segments: The number of URL path segments identifying an endpoint. Default 2.
+        :type path_segments: int
+        """
+        self.path_segments = path_segments
+        self._endpoints: Dict[tuple, _EndpointStats] = defaultdict(_EndpointStats)
+        self._parse: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self._lock = threading.Lock()
+
+    def _callbacks(self):
+        return {
+            "request_end": self._on_request_end,
+            "retry": self._on_retry,
+            "rate_limit_sleep": self._on_rate_limit_sleep,
+            "parse": self._on_parse,
+        }
+
+    def attach(self, router):
+        """
+        Registers the collector's hooks on a router's client.
+
+        :param router: The router, e.g. :class:`routingpy.routers.OSRM`.
+
+        :returns: The router.
+        """
+        for event, callback in self._callbacks().items():
+            router.client.add_hook(event, callback)
+
+        return router
+
+    def detach(self, router):
+        """
+        Removes the collector's hooks from a router's client.
+
+        :param router: The router passed to :meth:`attach`.
+        """
+        for event, callback in self._callbacks().items():
+            router.client.remove_hook(event, callback)
+
+    def _key(self, event):
+        segments = [segment for segment in (event.url or "").split("/") if segment]
+        path = "".join("/" + segment for segment in segments[: self.path_segments])
+        return event.router, (event.endpoint or "") + path
+
+    def _on_request_end(self, event):
+        with self._lock:
+            stats = self._endpoints[self._key(event)]
+            stats.requests += 1
+            if event.error is not None or (event.status or 0) >= 400:
+                stats.errors += 1
+            if event.status is not None:
+                stats.statuses[event.status] += 1
+            stats.bytes_sent += event.bytes_sent or 0
+            stats.bytes_received += event.bytes_received or 0
+            if event.total is not None:
+                stats.latency.record(event.total)
+            if event.ttfb is not None:
+                stats.ttfb.record(event.ttfb)
+
+    def _on_retry(self, event):
+        with self._lock:
+            self._endpoints[self._key(event)].retries += 1
+
+    def _on_rate_limit_sleep(self, event):
+        with self._lock:
+            self._endpoints[self._key(event)].rate_limit_sleep += event.duration
+
+    def _on_parse(self, event):
+        with self._lock:
+            self._parse[event.router].record(event.duration)
+
+    def snapshot(self) -> dict:
+        """
+        Returns the statistics collected so far: under ``endpoints`` by router name and endpoint, under
+        ``parse`` the parse time histograms by router name.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "endpoints": {key: stats.snapshot() for key, stats in self._endpoints.items()},
+                "parse": {router: histogram.snapshot() for router, histogram in self._parse.items()},
+            }
+
+    def reset(self):
+        """Discards the statistics collected so far."""
+        with self._lock:
+            self._endpoints.clear()
+            self._parse.clear()
+
+    def to_prometheus(self, prefix: str = "routingpy") -> str:
+        """
+        Returns the statistics in the Prometheus text exposition format, e.g. to be written to a file for the
+        node exporter's textfile collector. Latencies are exported as summaries with the p50, p95 and p99
+        quantiles.
+
+        :param prefix: The prefix of the metric names. Default "routingpy".
+        :type prefix: str
+
+        :rtype: str
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        def labels(**values):
+            return ",".join(
+                '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+                for name, value in values.items()
+            )
+
+        def metric(name, kind, help_text, samples):
+            lines.append("# HELP {}_{} {}".format(prefix, name, help_text))
+            lines.append("# TYPE {}_{} {}".format(prefix, name, kind))
+            for suffix, sample_labels, value in samples:
+                lines.append("{}_{}{}{{{}}} {}".format(prefix, name, suffix, sample_labels, value))
+
+        def summary(histogram, **values):
+            samples = [
+                ("", labels(quantile=q, **values), histogram["p{}".format(int(q * 100))])
+                for q in _QUANTILES
+                if histogram["count"]
+            ]
+            samples.append(("_sum", labels(**values), histogram["sum"]))
+            samples.append(("_count", labels(**values), histogram["count"]))
+            return samples
+
+        endpoints = sorted(snapshot["endpoints"].items(), key=lambda item: (str(item[0][0]), item[0][1]))
+        for name, field, help_text in (
+            ("requests_total", "requests", "Requests sent."),
+            ("errors_total", "errors", "Requests which failed or got an HTTP status >= 400."),
+            ("retries_total", "retries", "Retried requests."),
+            (
+                "rate_limit_sleep_seconds_total",
+                "rate_limit_sleep",
+                "Time spent waiting for the rate limiter.",
+            ),
+            ("bytes_sent_total", "bytes_sent", "Request body bytes sent."),
+            ("bytes_received_total", "bytes_received", "Response body bytes received."),
+        ):
+            metric(
+                name,
+                "counter",
+                help_text,
+                [
+                    ("", labels(router=router, endpoint=endpoint), stats[field])
+                    for (router, endpoint), stats in endpoints
+                ],
+            )
+
+        for name, field, help_text in (
+            ("request_duration_seconds", "latency", "Request latency."),
+            ("time_to_first_byte_seconds", "ttfb", "Time until the response headers were received."),
+        ):
+            samples = []
+            for (router, endpoint), stats in endpoints:
+                samples.extend(summary(stats[field], router=router, endpoint=endpoint))
+            metric(name, "summary", help_text, samples)
+
+        samples = []
+        for router, histogram in sorted(snapshot["parse"].items(), key=lambda item: str(item[0])):
+            samples.extend(summary(histogram, router=router))
+        metric("parse_duration_seconds", "summary", "Time spent parsing responses.", samples)
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""
+Splits matrices exceeding a provider's limits into tiles and stitches the results back together.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from .exceptions import RouterApiError
+from .matrix import Matrix
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def split_tiles(
+    sources: Sequence[int], destinations: Sequence[int], tile_size: Tuple[int, int]
+) -> List[Tuple[int, int, List[int], List[int]]]:
+    """
+    Splits the sources x destinations index space into blocks of at most ``tile_size``.
+
+    :param sources: The location indices of the matrix rows.
+    :type sources: list of int
+
+    :param destinations: The location indices of the matrix columns.
+    :type destinations: list of int
+
+    :param tile_size: The maximum number of sources and destinations per tile.
+    :type tile_size: tuple of int
+
+    :returns: The row and column offset of each tile in the matrix, and its source and destination indices.
+    :rtype: list of tuple
+    """
+    rows, cols = tile_size
+    if rows < 1 or cols < 1:
+        raise ValueError("tile_size must be at least (1, 1), not {}.".format(tile_size))
+
+    return [
+        (i, j, list(sources[i : i + rows]), list(destinations[j : j + cols]))
+        for i in range(0, len(sources), rows)
+        for j in range(0, len(destinations), cols)
+    ]
+
+
+def _tile_request(tile_sources, tile_destinations, locations):
+    """Returns the locations, sources and destinations arguments to request a single tile."""
+    indices = list(dict.fromkeys(tile_sources))
+    seen = set(indices)
+    indices.extend(idx for idx in dict.fromkeys(tile_destinations) if idx not in seen)
+    position = {idx: pos for pos, idx in enumerate(indices)}
+
+    return (
+        [locations[idx] for idx in indices],
+        {
+            "sources": [position[idx] for idx in tile_sources],
+            "destinations": [position[idx] for idx in tile_destinations],
+        },
+    )
+
+
+def _stitch_arrays(tiles, results, shape, dtype):
+    """Stitches the tiles' arrays into preallocated arrays of the full matrix."""
+    stitched = {}
+    for (row_offset, col_offset, tile_sources, tile_destinations), matrix in zip(tiles, results):
+        block = (
+            slice(row_offset, row_offset + len(tile_sources)),
+            slice(col_offset, col_offset + len(tile_destinations)),
+        )
+        for name, values in (
+            ("durations", matrix.durations_array),
+            ("distances", matrix.distances_array),
+        ):
+            if values is not None:
+                if name not in stitched:
+                    stitched[name] = np.full(shape, np.nan, dtype=dtype)
+                stitched[name][block] = values
+
+    return stitched.get("durations"), stitched.get("distances")
+
+
+def tiled_matrix(
+    router,
+    locations: Sequence,
+    sources: Optional[Sequence[int]] = None,
+    destinations: Optional[Sequence[int]] = None,
+    tile_size: Optional[Tuple[int, int]] = None,
+    max_workers: int = 4,
+    tile_retries: int = 2,
+    **matrix_kwargs
+) -> Matrix:
+    """
+    Requests a matrix of any size by splitting it into tiles the router's provider accepts, requesting
+    the tiles concurrently and stitching them into a single :class:`routingpy.matrix.Matrix`.
+
+    Each tile only sends the locations it needs, so the request size is bounded by ``tile_size``. Tiles
+    failing with anything but a :class:`routingpy.exceptions.RouterApiError` are retried individually.
+
+    >>> from routingpy.tiling import tiled_matrix
+    >>> matrix = tiled_matrix(OSRM(), two_thousand_locations, profile="driving", tile_size=(50, 50))
+
+    :param router: The router to request the tiles from. Needs to support ``sources`` and ``destinations``.
+
+    :param locations: All locations of the matrix.
+    :type locations: list of list
+
+    :param sources: A list of indices that refer to the list of locations
+        (starting with 0). If not passed, all indices are considered.
+    :type sources: list of int
+
+    :param destinations: A list of indices that refer to the list of locations
+        (starting with 0). If not passed, all indices are considered.
+    :type destinations: list of int
+
+    :param tile_size: The maximum number of sources and destinations per tile.
+        Defaults to the router's limits.
+    :type tile_size: tuple of int
+
+    :param max_workers: The number of tiles requested concurrently. Default 4.
+    :type max_workers: int
+
+    :param tile_retries: How many times a failed tile is requested again before giving up. Default 2.
+    :type tile_retries: int
+
+    :param matrix_kwargs: Additional arguments passed to each of the router's ``matrix`` requests, e.g. ``profile``.
+        If ``dtype`` is passed, the tiles are stitched into NumPy arrays of that data type.
+    :type matrix_kwargs: dict
+
+    :returns: The stitched matrix. Its ``raw`` property holds the list of raw tile responses.
+    :rtype: :class:`routingpy.matrix.Matrix`
+    """
+    tile_size = tile_size or getattr(router, "_MATRIX_TILE_SIZE", None)
+    if tile_size is None:
+        raise ValueError("{} has no default tile size, specify tile_size.".format(type(router).__name__))
+
+    sources = list(range(len(locations))) if sources is None else list(sources)
+    destinations = list(range(len(locations))) if destinations is None else list(destinations)
+
+    tiles = split_tiles(sources, destinations, tile_size)
+    tile_requests = [_tile_request(tile[2], tile[3], locations) for tile in tiles]
+    results = [None] * len(tiles)
+
+    def request_tile(tile):
+        tile_locations, tile_kwargs = tile_requests[tile]
+        try:
+            return router.matrix(tile_locations, **dict(matrix_kwargs, **tile_kwargs))
+        except Exception as e:
+            return e
+
+    todo = list(range(len(tiles)))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="routingpy") as executor:
+        for attempt in range(tile_retries + 1):
+            failed = []
+            for tile, result in zip(todo, executor.map(request_tile, todo)):
+                if not isinstance(result, Exception):
+                    results[tile] = result
+                elif isinstance(result, RouterApiError) or attempt == tile_retries:
+                    raise result
+                else:
+                    failed.append(tile)
+
+            if not failed:
+                break
+            todo = failed
+
+    raw = [matrix.raw for matrix in results]
+    if matrix_kwargs.get("dtype") is not None:
+        durations, distances = _stitch_arrays(
+            tiles, results, (len(sources), len(destinations)), matrix_kwargs["dtype"]
+        )
+        return Matrix(durations=durations, distances=distances, raw=raw)
+
+    durations = [[None] * len(destinations) for _ in sources]
+    distances = [[None] * len(destinations) for _ in sources]
+    has_durations = has_distances = False
+
+    for (row_offset, col_offset, _, _), matrix in zip(tiles, results):
+        for values, stitched in ((matrix.durations, durations), (matrix.distances, distances)):
+            for row, row_values in enumerate(values or []):
+                stitched[row_offset + row][col_offset : col_offset + len(row_values)] = row_values
+        has_durations = has_durations or matrix.durations is not None
+        has_distances = has_distances or matrix.distances is not None
+
+    return Matrix(
+        durations=durations if has_durations else None,
+        distances=distances if has_distances else None,
+        raw=raw,
+    )
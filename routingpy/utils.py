@@ -15,63 +15,204 @@
 # the License.
 #
 
+import codecs
+import json
 import logging
+import math
+import os
+import re
+from array import array
+from itertools import accumulate, chain
 
 logger = logging.getLogger("routingpy")
 
 
-def _trans(value, index):
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Polylines shorter than this are decoded in pure Python, where numpy's per-call overhead dominates
+_NUMPY_MIN_LENGTH = 128
+
+
+def _decode_values(expression):
     """
+    Decodes all signed integers of an encoded polyline in a single pass.
+
+    Based on the decoder of
+
     Copyright (c) 2014 Bruno M. Custódio
     Copyright (c) 2016 Frederick Jansen
 
     https://github.com/hicsail/polyline/commit/ddd12e85c53d394404952754e39c91f63a808656
     """
-    byte, result, shift = None, 0, 0
-
-    while byte is None or byte >= 0x20:
-        byte = ord(value[index]) - 63
-        index += 1
+    try:
+        data = expression.encode("ascii")
+    except UnicodeEncodeError:
+        data = map(ord, expression)
+
+    values = []
+    append = values.append
+    result = shift = 0
+    for char in data:
+        byte = char - 63
         result |= (byte & 0x1F) << shift
-        shift += 5
-        comp = result & 1
+        if byte < 0x20:
+            append(~(result >> 1) if result & 1 else result >> 1)
+            result = shift = 0
+        else:
+            shift += 5
+
+    if shift:
+        raise ValueError("The polyline is truncated.")
+
+    return values
+
 
-    return ~(result >> 1) if comp else (result >> 1), index
+def _decode_values_numpy(expression):
+    """Vectorized version of :func:`_decode_values`, returning an int64 array."""
+    try:
+        data = np.frombuffer(expression.encode("ascii"), dtype=np.uint8)
+    except UnicodeEncodeError:
+        data = np.frombuffer(expression.encode("utf-32-le"), dtype="<u4")
 
+    chunks = data.astype(np.int64) - 63
+    ends = np.flatnonzero(chunks < 0x20)
+    if len(ends) == 0 or ends[-1] != len(chunks) - 1:
+        raise ValueError("The polyline is truncated.")
 
-def _decode(expression, precision=5, is3d=False, order="lnglat"):
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts + 1
+    if lengths.max() > 12:
+        # Would overflow int64, which no valid polyline does
+        return np.array(_decode_values(expression), dtype=np.int64)
+
+    shifts = 5 * (np.arange(len(chunks)) - np.repeat(starts, lengths))
+    values = np.add.reduceat((chunks & 0x1F) << shifts, starts)
+
+    return np.where(values & 1, ~(values >> 1), values >> 1)
+
+
+def _decode(expression, precision=5, is3d=False, order="lnglat", as_array=False):
     """
-    Copyright (c) 2014 Bruno M. Custódio
-    Copyright (c) 2016 Frederick Jansen
+    Decodes an encoded polyline in one pass, vectorized with numpy for long polylines if it's installed.
+    """
+    if order not in ("lnglat", "latlng"):
+        raise ValueError(f"order must be either 'latlng' or 'lnglat', not {order}.")
 
-    https://github.com/hicsail/polyline/commit/ddd12e85c53d394404952754e39c91f63a808656
+    factor = float(10**precision)
+    dims = 3 if is3d else 2
+    # the polyline stores latitude first
+    columns = [1, 0, 2][:dims] if order == "lnglat" else [0, 1, 2][:dims]
+
+    if np is not None and (as_array or len(expression) >= _NUMPY_MIN_LENGTH):
+        values = _decode_values_numpy(expression) if expression else np.empty(0, dtype=np.int64)
+        if len(values) % dims:
+            raise ValueError("The polyline is truncated.")
+
+        deltas = values.reshape(-1, dims)
+        coordinates = np.empty(deltas.shape, dtype=np.float64)
+        for target, column in enumerate(columns):
+            coordinates[:, target] = np.cumsum(deltas[:, column]) / (factor if column < 2 else 100)
+
+        return coordinates if as_array else list(map(tuple, coordinates.tolist()))
+
+    values = _decode_values(expression)
+    if len(values) % dims:
+        raise ValueError("The polyline is truncated.")
+
+    first, second = (accumulate(values[column::dims]) for column in columns[:2])
+    if is3d:
+        coordinates = [
+            (a / factor, b / factor, z / 100)
+            for a, b, z in zip(first, second, accumulate(values[2::dims]))
+        ]
+    else:
+        coordinates = [(a / factor, b / factor) for a, b in zip(first, second)]
+
+    return array("d", chain.from_iterable(coordinates)) if as_array else coordinates
+
+
+def _encode_value(value, chars):
+    """Appends the characters of a single signed integer to chars."""
+    value = ~(value << 1) if value < 0 else value << 1
+    while value >= 0x20:
+        chars.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    chars.append(chr(value + 63))
+
+
+def _round(value):
+    """Rounds half away from zero, like the reference polyline implementation."""
+    return int(math.floor(abs(value) + 0.5)) * (1 if value >= 0 else -1)
+
+
+def _encode(coordinates, precision=5, is3d=False, order="lnglat"):
+    """Encodes coordinates as polyline, the inverse of :func:`_decode`."""
+    if order not in ("lnglat", "latlng"):
+        raise ValueError(f"order must be either 'latlng' or 'lnglat', not {order}.")
+
+    factor = 10**precision
+    lat_index, lng_index = (1, 0) if order == "lnglat" else (0, 1)
+    chars = []
+    previous = (0, 0, 0)
+    for coordinate in coordinates:
+        current = (
+            _round(coordinate[lat_index] * factor),
+            _round(coordinate[lng_index] * factor),
+            _round(coordinate[2] * 100) if is3d else 0,
+        )
+        for dimension in range(3 if is3d else 2):
+            _encode_value(current[dimension] - previous[dimension], chars)
+        previous = current
+
+    return "".join(chars)
+
+
+def encode_polyline5(coordinates, is3d=False, order="lnglat"):
+    """Encodes coordinates as polyline string with a precision of 5.
+
+    :param coordinates: The coordinates to encode.
+    :type coordinates: list of list
+
+    :param is3d: Specifies if the coordinates contain a Z component, encoded with a precision of 2.
+        Default False.
+    :type is3d: bool
+
+    :param order: Specifies the order of the coordinates' components.
+                  Options: latlng, lnglat. Defaults to 'lnglat'.
+    :type order: str
+
+    :returns: The encoded polyline.
+    :rtype: str
     """
-    coordinates, index, lat, lng, z, length, factor = (
-        [],
-        0,
-        0,
-        0,
-        0,
-        len(expression),
-        float(10**precision),
-    )
-
-    while index < length:
-        lat_change, index = _trans(expression, index)
-        lng_change, index = _trans(expression, index)
-        lat += lat_change
-        lng += lng_change
-        if not is3d:
-            coordinates.append(_get_coords(lat, lng, factor, order=order))
-        else:
-            z_change, index = _trans(expression, index)
-            z += z_change
-            coordinates.append((*_get_coords(lat, lng, factor, order=order), z / 100))
+    return _encode(coordinates, precision=5, is3d=is3d, order=order)
+
 
-    return coordinates
+def encode_polyline6(coordinates, is3d=False, order="lnglat"):
+    """Encodes coordinates as polyline string with a precision of 6.
 
+    :param coordinates: The coordinates to encode.
+    :type coordinates: list of list
+
+    :param is3d: Specifies if the coordinates contain a Z component, encoded with a precision of 2.
+        Default False.
+    :type is3d: bool
+
+    :param order: Specifies the order of the coordinates' components.
+                  Options: latlng, lnglat. Defaults to 'lnglat'.
+    :type order: str
 
-def decode_polyline5(polyline, is3d=False, order="lnglat"):
+    :returns: The encoded polyline.
+    :rtype: str
+    """
+    return _encode(coordinates, precision=6, is3d=is3d, order=order)
+
+
+def decode_polyline5(polyline, is3d=False, order="lnglat", as_array=False):
     """Decodes an encoded polyline string which was encoded with a precision of 5.
 
     :param polyline: An encoded polyline, only the geometry.
@@ -85,13 +226,17 @@ def decode_polyline5(polyline, is3d=False, order="lnglat"):
                   Options: latlng, lnglat. Defaults to 'lnglat'.
     :type order: str
 
+    :param as_array: Return the coordinates as float64 NumPy array of shape (N, 2) or (N, 3) instead of a
+        list of tuples. Without numpy installed, a flat ``array.array('d')`` is returned. Default False.
+    :type as_array: bool
+
     :returns: List of decoded coordinates with precision 5.
-    :rtype: list
+    :rtype: list or numpy.ndarray
     """
-    return _decode(polyline, precision=5, is3d=is3d, order=order)
+    return _decode(polyline, precision=5, is3d=is3d, order=order, as_array=as_array)
 
 
-def decode_polyline6(polyline, is3d=False, order="lnglat"):
+def decode_polyline6(polyline, is3d=False, order="lnglat", as_array=False):
     """Decodes an encoded polyline string which was encoded with a precision of 6.
 
     :param polyline: An encoded polyline, only the geometry.
@@ -105,11 +250,15 @@ def decode_polyline6(polyline, is3d=False, order="lnglat"):
                   Options: latlng, lnglat. Defaults to 'lnglat'.
     :type order: str
 
+    :param as_array: Return the coordinates as float64 NumPy array of shape (N, 2) or (N, 3) instead of a
+        list of tuples. Without numpy installed, a flat ``array.array('d')`` is returned. Default False.
+    :type as_array: bool
+
     :returns: List of decoded coordinates with precision 6.
-    :rtype: list
+    :rtype: list or numpy.ndarray
     """
 
-    return _decode(polyline, precision=6, is3d=is3d, order=order)
+    return _decode(polyline, precision=6, is3d=is3d, order=order, as_array=as_array)
 
 
 def get_ordinal(number):
@@ -144,8 +293,159 @@ def deep_merge_dicts(d1: dict, d2: dict) -> dict:
     return result
 
 
-def _get_coords(lat, lng, factor, order="lnglat"):
-    """Determines coordinate order."""
-    if order not in ("lnglat", "latlng"):
-        raise ValueError(f"order must be either 'latlng' or 'lnglat', not {order}.")
-    return (lat / factor, lng / factor) if order == "latlng" else (lng / factor, lat / factor)
+def read_stream(source, chunk_size=64 * 1024):
+    """
+    Reads the body a response was streamed to in chunks, from a file path or from the start of a readable
+    binary file object, e.g. for :func:`iter_json_array`.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from iter(lambda: f.read(chunk_size), b"")
+        return
+
+    source.seek(0)
+    yield from iter(lambda: source.read(chunk_size), b"")
+
+
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_CHARS = re.compile(r"[0-9.eE+-]*")
+# The characters which change the nesting outside of strings, and end or escape within them
+_STRUCTURE = re.compile(r'[{}\[\]"]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+def _find_json_array(chunks, decoder, key):
+    """
+    Scans the chunks of a JSON document for the array under ``key`` of its top-level object.
+
+    :returns: The text following the array's opening bracket or None if the document has no such array.
+    """
+    # Longer strings can't be the key, even with every character escaped
+    max_key_length = 12 * len(key) + 2
+    buffer = ""
+    position = 0
+    depth = 0
+    # The start of the string being scanned
+    string_start = None
+    # The last string directly within the top-level object, i.e. the key of a following array
+    last_string = None
+
+    while True:
+        pattern = _STRUCTURE if string_start is None else _STRING_SPECIAL
+        match = pattern.search(buffer, position)
+        if match is None:
+            chunk = next(chunks, None)
+            if chunk is None:
+                decoder.decode(b"", final=True)
+                return None
+            # Keeps only the string being scanned
+            keep = position if string_start is None else string_start
+            buffer = buffer[keep:] + decoder.decode(chunk)
+            position -= keep
+            if string_start is not None:
+                string_start -= keep
+            continue
+
+        index = match.start()
+        char = buffer[index]
+        position = index + 1
+
+        if string_start is not None:
+            if char == "\\":
+                # Skips the escaped character
+                position += 1
+                continue
+            if depth == 1:
+                length = position - string_start
+                last_string = buffer[string_start:position] if length <= max_key_length else None
+            string_start = None
+        elif char == '"':
+            string_start = index
+        elif char in "{[":
+            if depth == 0 and char != "{":
+                # Only objects have keys
+                return None
+            if char == "[" and depth == 1 and last_string and json.loads(last_string) == key:
+                return buffer[position:]
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return None
+
+
+def iter_json_array(chunks, key):
+    """
+    Decodes the items of the array under ``key`` of a JSON document incrementally from the chunks of its
+    bytes, e.g. the ``features`` of a streamed GeoJSON response. Only the current chunk and item are held in
+    memory; the rest of the document is skipped.
+
+    :param chunks: The UTF-8 encoded document in chunks.
+    :type chunks: iterable of bytes
+
+    :param key: The key of the array in the document's top-level object. Keys of nested objects are ignored.
+    :type key: str
+
+    :raises json.JSONDecodeError: when an item can't be decoded or the array is incomplete.
+
+    :returns: The decoded items.
+    :rtype: iterator
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = _find_json_array(chunks, decoder, key)
+    if buffer is None:
+        return
+
+    position = 0
+    exhausted = False
+    expect_separator = False
+    first = True
+    # The buffered length from which an incomplete item is decoded again. It doubles with each attempt, so a
+    # large item arriving in many chunks is decoded a logarithmic number of times instead of once per chunk.
+    retry_length = 0
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+        if position < len(buffer) and (exhausted or len(buffer) - position >= retry_length):
+            char = buffer[position]
+            if expect_separator or (first and char == "]"):
+                if char == "]":
+                    return
+                if char != ",":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position)
+                position += 1
+                expect_separator = False
+                continue
+            if char in ",]":
+                raise json.JSONDecodeError("Expecting value", buffer, position)
+            try:
+                item, end = _JSON_DECODER.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+                retry_length = 2 * (len(buffer) - position)
+            else:
+                # A number which reaches the end of the buffer may continue in the next chunk, e.g. "1." of "1.5"
+                if (
+                    exhausted
+                    or not isinstance(item, (int, float))
+                    or _NUMBER_CHARS.match(buffer, end).end() < len(buffer)
+                ):
+                    yield item
+                    position = end
+                    expect_separator = True
+                    first = False
+                    retry_length = 0
+                    continue
+                retry_length = len(buffer) - position + 1
+        elif exhausted:
+            raise json.JSONDecodeError("Unterminated array", buffer, position)
+
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            buffer = buffer[position:] + decoder.decode(b"", final=True)
+        else:
+            buffer = buffer[position:] + decoder.decode(chunk)
+        position = 0
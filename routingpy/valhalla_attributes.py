@@ -18,6 +18,7 @@
 from enum import Enum
 from typing import List, Optional, Tuple, Union
 
+from .raw import RawBody
 from .utils import decode_polyline6
 
 
@@ -112,6 +113,30 @@ class MatchedEdge:
     Access via properties ``geometry``, ``distances`` ``durations``, ``costs``, ``edge_ids``, ``statuses``.
     """
 
+    __slots__ = (
+        "_geometry",
+        "_traversability",
+        "_toll",
+        "_use",
+        "_tunnel",
+        "_names",
+        "_driving_side",
+        "_roundabout",
+        "_bridge",
+        "_surface",
+        "_edge_id",
+        "_osm_way_id",
+        "_speed_limit",
+        "_cycle_lane",
+        "_sidewalk",
+        "_lane_count",
+        "_mean_elevation",
+        "_weighted_grade",
+        "_road_class",
+        "_speed",
+        "_length",
+    )
+
     def __init__(self, edge: dict, coords: List[List[float]]):
         self._geometry = coords
         self._traversability: Optional[Traversability] = (
@@ -296,7 +321,9 @@ class MatchedEdge:
         return self._length
 
     def __repr__(self):  # pragma: no cover
-        return "Edge({})".format(", ".join([f"{k[1:]}: {v}" for k, v in vars(self).items() if v]))
+        return "Edge({})".format(
+            ", ".join([f"{k[1:]}: {getattr(self, k)}" for k in self.__slots__ if getattr(self, k)])
+        )
 
 
 class MatchedPoint:
@@ -304,6 +331,15 @@ class MatchedPoint:
     A single matched point
     """
 
+    __slots__ = (
+        "_geometry",
+        "_match_type",
+        "_dist_along_edge",
+        "_dist_from_input",
+        "_edge_index",
+        "_discontinuity",
+    )
+
     def __init__(self, point: dict):
         self._geometry: List[float] = [point["lon"], point["lat"]]
         self._match_type = MatchType(point.get("type", "")) or None
@@ -366,6 +402,8 @@ class MatchedResults:
     the complete raw response of the expansion request.
     """
 
+    __slots__ = ("_edges", "_points", "_raw")
+
     def __init__(self, response: Optional[dict] = None):
         self._edges: List[MatchedEdge] = list()
         self._points: List[MatchedPoint] = list()
@@ -395,6 +433,8 @@ class MatchedResults:
 
         :rtype: dict or None
         """
+        if isinstance(self._raw, RawBody):
+            self._raw = self._raw.decode()
         return self._raw
 
     @property
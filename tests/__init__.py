@@ -18,6 +18,13 @@
 import unittest
 from urllib.parse import parse_qsl, urlparse
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+requires_numpy = unittest.skipIf(np is None, "numpy is not installed")
+
 
 class TestCase(unittest.TestCase):
     def assertURLEqual(self, first, second, msg=None):
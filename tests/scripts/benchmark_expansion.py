@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+# Compares the memory and parse time of an expansion parsed into Edge objects against the columnar
+# representation, for a synthetic response of N_EDGES two-point edges with all properties. The memory is
+# what the result retains once the response is released, as with the client option keep_raw="none".
+# Then compares the peak memory of decoding the whole response body against expansion_iter's incremental
+# parsing of the body in chunks, with batches of BATCH_SIZE edges which are discarded after use.
+# Run from the repository root: python tests/scripts/benchmark_expansion.py
+
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from routingpy.routers.valhalla import Valhalla  # noqa: E402
+
+N_EDGES = 200000
+BATCH_SIZE = 10000
+CHUNK_SIZE = 64 * 1024
+
+PROPERTIES = ["distance", "duration", "cost", "edge_id", "pred_edge_id", "edge_status"]
+
+
+def response():
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {
+                    "type": "LineString",
+                    "coordinates": [
+                        [8.5 + i * 1e-6, 47.3 + i * 1e-6],
+                        [8.5 + i * 2e-6, 47.3 - i * 1e-6],
+                    ],
+                },
+                "properties": {
+                    "distance": i * 1.5,
+                    "duration": i * 0.1,
+                    "cost": i * 0.2,
+                    "edge_id": 1000000 + i,
+                    "pred_edge_id": 999999 + i,
+                    "edge_status": "rs"[i % 2],
+                },
+            }
+            for i in range(N_EDGES)
+        ],
+    }
+
+
+def parse(body, columnar):
+    expansions = Valhalla.parse_expansion_json(body, [8.5, 47.3], PROPERTIES, "time", columnar=columnar)
+    expansions._raw = None
+    return expansions
+
+
+def measure(columnar):
+    body = response()
+    start = time.perf_counter()
+    parse(body, columnar)
+    duration = time.perf_counter() - start
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    body = response()
+    expansions = parse(body, columnar)
+    del body
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    assert len(expansions) == N_EDGES
+
+    return size, duration
+
+
+def peak(content, stream):
+    tracemalloc.start()
+    start = time.perf_counter()
+    if stream:
+        chunks = (content[i : i + CHUNK_SIZE] for i in range(0, len(content), CHUNK_SIZE))
+        batches = Valhalla.parse_expansion_stream(
+            chunks, [8.5, 47.3], PROPERTIES, "time", batch_size=BATCH_SIZE, columnar=True
+        )
+        edges = sum(len(batch) for batch in batches)
+    else:
+        edges = len(parse(json.loads(content), True))
+    duration = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert edges == N_EDGES
+
+    return size, duration
+
+
+def main():
+    print(f"{'mode':>10} {'MB':>8} {'parse s':>8}")
+    for columnar in (False, True):
+        size, duration = measure(columnar)
+        print(f"{'columnar' if columnar else 'edges':>10} {size / 1e6:>8.1f} {duration:>8.3f}")
+
+    content = json.dumps(response()).encode()
+    print(f"\n{'mode':>10} {'peak MB':>8} {'parse s':>8}  ({len(content) / 1e6:.1f} MB response)")
+    for stream in (False, True):
+        size, duration = peak(content, stream)
+        print(f"{'stream' if stream else 'loads':>10} {size / 1e6:>8.1f} {duration:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+# Compares the JSON codecs decoding large responses, built by repeating the Valhalla expansion and
+# OSRM matrix fixtures, and encoding a large request body.
+# Run from the repository root: python tests/scripts/benchmark_json.py
+
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from routingpy import json_codec  # noqa: E402
+from tests.data.mock import ENDPOINTS_RESPONSES  # noqa: E402
+
+
+def bench(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def expansion(n_features):
+    features = ENDPOINTS_RESPONSES["valhalla"]["expansion"]["features"]
+    return {
+        "type": "FeatureCollection",
+        "features": (features * (n_features // len(features) + 1))[:n_features],
+    }
+
+
+def matrix(n_locations):
+    row = [i * 10.5 for i in range(n_locations)]
+    return {"code": "Ok", "durations": [row] * n_locations, "distances": [row] * n_locations}
+
+
+def main():
+    codecs = []
+    for name in ("json", "orjson", "simdjson", "ujson"):
+        try:
+            codecs.append(json_codec.get_codec(name))
+        except ImportError:
+            print(f"{name} is not installed")
+
+    documents = (
+        ("expansion 100k edges", expansion(100000)),
+        ("matrix 1000x1000", matrix(1000)),
+    )
+    body = {"locations": [{"lat": 47.38 + i * 1e-4, "lon": 8.51 + i * 1e-4} for i in range(10000)]}
+
+    print(f"{'document':>26} {'MB':>6} " + " ".join(f"{codec.name + ' ms':>12}" for codec in codecs))
+    for name, document in documents:
+        content = json.dumps(document).encode("utf-8")
+        timings = [bench(lambda: codec.loads(content), 3) for codec in codecs]
+        print(
+            f"{'loads ' + name:>26} {len(content) / 1e6:>6.1f} "
+            + " ".join(f"{timing:>12.1f}" for timing in timings)
+        )
+
+    size = len(json.dumps(body)) / 1e6
+    timings = [bench(lambda: codec.dumps(body), 10) for codec in codecs]
+    print(
+        f"{'dumps 10k locations':>26} {size:>6.1f} " + " ".join(f"{timing:>12.1f}" for timing in timings)
+    )
+
+
+if __name__ == "__main__":
+    main()
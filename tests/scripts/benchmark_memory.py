@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+# Compares the memory footprint per object of the slotted result classes against the same classes with an
+# instance __dict__, as they were before. The attribute values are shared, so only the objects are measured.
+# Run from the repository root: python tests/scripts/benchmark_memory.py
+
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from routingpy.direction import Direction, Directions  # noqa: E402
+from routingpy.expansion import Edge, Expansions  # noqa: E402
+from routingpy.isochrone import Isochrone  # noqa: E402
+from routingpy.matrix import Matrix  # noqa: E402
+from routingpy.optimized import OptimizedDirection  # noqa: E402
+from routingpy.valhalla_attributes import MatchedEdge, MatchedPoint  # noqa: E402
+from tests.data.mock import ENDPOINTS_RESPONSES  # noqa: E402
+
+N_OBJECTS = 100000
+
+TRACE = ENDPOINTS_RESPONSES["valhalla"]["trace_attributes"]
+GEOMETRY = [[8.512978, 47.380938], [8.512694, 47.380651]]
+
+CASES = (
+    (Direction, lambda cls: cls(geometry=GEOMETRY, duration=100, distance=1000, raw=TRACE)),
+    (Directions, lambda cls: cls(directions=GEOMETRY, raw=TRACE)),
+    (OptimizedDirection, lambda cls: cls(GEOMETRY, 100, 1000, GEOMETRY, TRACE)),
+    (Matrix, lambda cls: cls(durations=GEOMETRY, distances=GEOMETRY, raw=TRACE)),
+    (
+        Isochrone,
+        lambda cls: cls(geometry=GEOMETRY, interval=600, center=GEOMETRY[0], interval_type="time"),
+    ),
+    (
+        Edge,
+        lambda cls: cls(geometry=GEOMETRY, distance=14, duration=4, cost=8, edge_id=1, pred_edge_id=0),
+    ),
+    (Expansions, lambda cls: cls(edges=GEOMETRY, center=GEOMETRY[0], interval_type="time", raw=TRACE)),
+    (MatchedEdge, lambda cls: cls(TRACE["edges"][0], GEOMETRY)),
+    (MatchedPoint, lambda cls: cls(TRACE["matched_points"][0])),
+)
+
+
+def footprint(cls, factory):
+    objects = [None] * N_OBJECTS
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(N_OBJECTS):
+        objects[i] = factory(cls)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    return size / N_OBJECTS
+
+
+def main():
+    print(f"{'class':>20} {'dict B':>8} {'slots B':>8} {'saved':>6}")
+    for cls, factory in CASES:
+        # A subclass without __slots__ gets an instance __dict__ again
+        unslotted = type(cls.__name__, (cls,), {})
+        before = footprint(unslotted, factory)
+        after = footprint(cls, factory)
+        print(f"{cls.__name__:>20} {before:>8.0f} {after:>8.0f} {1 - after / before:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+# Compares the polyline decoders against the original character by character decoder on long route shapes.
+# Run from the repository root: python tests/scripts/benchmark_polyline.py
+
+import sys
+import timeit
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from routingpy import utils  # noqa: E402
+from tests.test_utils import legacy_decode, random_polyline  # noqa: E402
+
+
+def bench(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def main():
+    print(f"{'points':>8} {'legacy ms':>10} {'python ms':>10} {'numpy ms':>10} {'array ms':>10}")
+    for n_points in (100, 1000, 10000, 100000):
+        polyline = random_polyline(n_points)
+        number = max(1, 20000 // n_points)
+        assert legacy_decode(polyline, 6) == utils.decode_polyline6(polyline)
+
+        legacy = bench(lambda: legacy_decode(polyline, 6), number)
+        with mock.patch.object(utils, "np", None):
+            python = bench(lambda: utils.decode_polyline6(polyline), number)
+        if utils.np is not None:
+            vectorized = bench(lambda: utils.decode_polyline6(polyline), number)
+            as_array = bench(lambda: utils.decode_polyline6(polyline, as_array=True), number)
+        else:
+            vectorized = as_array = float("nan")
+
+        print(f"{n_points:>8} {legacy:>10.3f} {python:>10.3f} {vectorized:>10.3f} {as_array:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the load balancer."""
+
+import time
+
+import requests
+import responses
+
+import routingpy
+import tests as _test
+from routingpy import OSRM
+from routingpy.balancer import LoadBalancer
+from routingpy.matrix import Matrix
+from tests.data.mock import *
+
+PATH = "/table/v1/driving/8.688641,49.420577;8.680916,49.415776"
+
+
+class LoadBalancerTest(_test.TestCase):
+    def add_replica(self, url, **kwargs):
+        kwargs.setdefault("json", ENDPOINTS_RESPONSES["osrm"]["matrix"])
+        responses.add(responses.GET, url + PATH, content_type="application/json", **kwargs)
+
+    @responses.activate
+    def test_round_robin(self):
+        self.add_replica("http://osrm-1")
+        self.add_replica("http://osrm-2")
+        router = OSRM(["http://osrm-1", "http://osrm-2"])
+
+        for _ in range(4):
+            self.assertIsInstance(router.matrix(PARAM_LINE), Matrix)
+
+        hosts = [call.request.url.split("/")[2] for call in responses.calls]
+        self.assertEqual(hosts, ["osrm-1", "osrm-2", "osrm-1", "osrm-2"])
+
+    @responses.activate
+    def test_failover(self):
+        self.add_replica("http://osrm-1", status=500, json={"code": "Error"})
+        self.add_replica("http://osrm-2")
+        self.add_replica("http://osrm-3", json=None, body=requests.exceptions.ConnectionError())
+        balancer = LoadBalancer(
+            ["http://osrm-1", "http://osrm-2", "http://osrm-3"], failure_threshold=2, recovery_time=0.1
+        )
+        router = OSRM(balancer)
+
+        with self.assertWarns(UserWarning):
+            for _ in range(6):
+                self.assertIsInstance(router.matrix(PARAM_LINE), Matrix)
+
+        self.assertEqual(len(responses.calls), 10)
+        self.assertEqual([endpoint.healthy for endpoint in balancer.endpoints], [False, True, False])
+
+        # a single request probes a recovered endpoint
+        time.sleep(0.1)
+        responses.replace(
+            responses.GET,
+            "http://osrm-1" + PATH,
+            json=ENDPOINTS_RESPONSES["osrm"]["matrix"],
+            content_type="application/json",
+        )
+        router.matrix(PARAM_LINE)
+        self.assertEqual(responses.calls[-1].request.url.split("/")[2], "osrm-1")
+        self.assertEqual([endpoint.healthy for endpoint in balancer.endpoints], [True, True, False])
+
+    @responses.activate
+    def test_all_unhealthy(self):
+        self.add_replica("http://osrm-1", status=500, json={"code": "Error"})
+        router = OSRM(LoadBalancer(["http://osrm-1"], failure_threshold=1))
+
+        for _ in range(2):
+            with self.assertRaises(routingpy.exceptions.RouterServerError):
+                router.matrix(PARAM_LINE)
+        self.assertEqual(len(responses.calls), 2)
+
+    def test_strategies(self):
+        balancer = LoadBalancer(["a", "b", "c"], strategy="least_outstanding")
+        first, second = balancer.acquire(), balancer.acquire()
+        self.assertEqual(balancer.acquire().url, "c")
+        balancer.release(second)
+        self.assertIs(balancer.acquire(), second)
+        self.assertIs(balancer.acquire(exclude=[second]), first)
+
+        balancer = LoadBalancer(["a", "b"], strategy="ewma")
+        slow, fast = balancer.endpoints
+        for endpoint, latency in ((slow, 0.5), (fast, 0.1)):
+            endpoint.outstanding += 1
+            balancer.release(endpoint, latency)
+        # the fast endpoint takes requests until 5 are in flight
+        self.assertEqual([balancer.acquire().url for _ in range(5)], ["b", "b", "b", "b", "a"])
+        balancer.release(fast, 0.2)
+        self.assertAlmostEqual(fast.latency, 0.13)
+
+        with self.assertRaises(ValueError):
+            LoadBalancer(["a"], strategy="random")
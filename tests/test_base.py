@@ -16,14 +16,18 @@
 #
 """Tests for client module."""
 
+import io
 import time
+from unittest import mock
 
 import requests
 import responses
 
 import routingpy
 import tests as _test
-from routingpy import client_default
+from routingpy import OSRM, client_default
+from routingpy.cache import MemoryCache
+from routingpy.retry import RetryPolicy
 from routingpy.routers import options
 
 
@@ -189,3 +193,127 @@ class BaseTest(_test.TestCase):
 
         assert isinstance(self.client.req, requests.PreparedRequest)
         self.assertEqual("https://httpbin.org/routes?a=b", self.client.req.url)
+
+    def test_connection_pool(self):
+        client = ClientMock(
+            "https://httpbin.org",
+            pool_maxsize=32,
+            pool_block=True,
+            socket_options=client_default.KEEPALIVE_SOCKET_OPTIONS,
+        )
+        adapter = client._session.get_adapter("https://httpbin.org")
+        pool = adapter.poolmanager.connection_from_url("https://httpbin.org")
+
+        self.assertEqual(pool.pool.maxsize, 32)
+        self.assertTrue(pool.block)
+        self.assertEqual(pool.conn_kw["socket_options"], client_default.KEEPALIVE_SOCKET_OPTIONS)
+        self.assertNotIn("pool_maxsize", client.kwargs)
+
+    def test_shared_session(self):
+        session = client_default.create_session(pool_maxsize=4)
+        car = OSRM("https://httpbin.org/car", session=session)
+        bike = OSRM("https://httpbin.org/bike", session=session)
+
+        self.assertIs(car.client._session, session)
+        self.assertIs(bike.client._session, session)
+        self.assertIsNot(self.client._session, session)
+
+    @responses.activate
+    def test_retry_after(self):
+        responses.add(
+            responses.GET, "https://httpbin.org/routes", status=503, headers={"Retry-After": "0.2"}
+        )
+        responses.add(
+            responses.GET,
+            "https://httpbin.org/routes",
+            json={},
+            status=200,
+            content_type="application/json",
+        )
+        client = ClientMock("https://httpbin.org", retry_policy=RetryPolicy(base_delay=5))
+
+        start = time.time()
+        with self.assertWarns(UserWarning):
+            self.assertEqual(client.directions(url="/routes"), {})
+        self.assertTrue(0.2 <= time.time() - start < 1)
+        self.assertEqual(2, len(responses.calls))
+
+        responses.replace(
+            responses.GET, "https://httpbin.org/routes", status=503, headers={"Retry-After": "120"}
+        )
+        with self.assertRaises(routingpy.exceptions.Timeout):
+            ClientMock("https://httpbin.org", retry_timeout=5).directions(url="/routes")
+
+    @responses.activate
+    def test_retry_after_ignored(self):
+        responses.add(
+            responses.GET, "https://httpbin.org/routes", status=503, headers={"Retry-After": "120"}
+        )
+        responses.add(
+            responses.GET,
+            "https://httpbin.org/routes",
+            json={},
+            status=200,
+            content_type="application/json",
+        )
+        policy = RetryPolicy(base_delay=10, max_delay=10, respect_retry_after=False)
+        client = ClientMock("https://httpbin.org", retry_timeout=5, retry_policy=policy)
+
+        # The backoff is cut to the remaining retry timeout instead of giving up because of Retry-After
+        with mock.patch("routingpy.client_default.time.sleep") as sleep, self.assertWarns(UserWarning):
+            self.assertEqual(client.directions(url="/routes"), {})
+        self.assertLessEqual(sleep.call_args[0][0], 5)
+        self.assertEqual(2, len(responses.calls))
+
+    @responses.activate
+    def test_retry_policy(self):
+        responses.add(responses.GET, "https://httpbin.org/routes", status=500)
+        policy = RetryPolicy(statuses={500}, max_retries=2, base_delay=0.01, max_delay=0.01)
+        client = ClientMock("https://httpbin.org", retry_policy=policy)
+
+        with self.assertRaises(routingpy.exceptions.RouterServerError):
+            client.directions(url="/routes")
+        self.assertEqual(3, len(responses.calls))
+
+        # only one retry within the budget's window
+        budget = RetryPolicy(statuses={500}, base_delay=0.01, budget_ratio=0, budget_min_retries=1)
+        client = ClientMock("https://httpbin.org", retry_policy=budget)
+        for _ in range(2):
+            with self.assertRaises(routingpy.exceptions.RouterServerError):
+                client.directions(url="/routes")
+        self.assertEqual(6, len(responses.calls))
+
+    @responses.activate
+    def test_stream_to(self):
+        responses.add(responses.GET, "https://httpbin.org/routes", status=503)
+        responses.add(
+            responses.GET,
+            "https://httpbin.org/routes",
+            body=b"x" * 200000,
+            status=200,
+            content_type="application/octet-stream",
+        )
+        cache = MemoryCache()
+        client = ClientMock(
+            "https://httpbin.org", cache=cache, retry_policy=RetryPolicy(base_delay=0.01, max_delay=0.01)
+        )
+
+        stream = io.BytesIO()
+        with self.assertWarns(UserWarning):
+            self.assertIs(client.directions(url="/routes", stream_to=stream), stream)
+        self.assertEqual(stream.getvalue(), b"x" * 200000)
+        self.assertEqual(len(cache), 0)
+
+    def test_retry_delays(self):
+        policy = RetryPolicy(base_delay=1, max_delay=10)
+        delay = None
+        for _ in range(20):
+            delay = policy.next_delay(delay)
+            self.assertTrue(1 <= delay <= 10)
+        self.assertEqual(policy.next_delay(delay, retry_after=42), 42)
+
+        response = requests.Response()
+        response.headers["Retry-After"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+        self.assertEqual(policy.retry_after(response), 0)
+        response.headers["Retry-After"] = "3"
+        self.assertEqual(policy.retry_after(response), 3)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the batch module."""
+
+import time
+import warnings
+
+import responses
+
+import routingpy
+import tests as _test
+from routingpy import Valhalla
+from routingpy.batch import run_many
+from routingpy.direction import Direction
+from routingpy.routers import get_router_by_name
+from tests.data.mock import *
+
+
+class BatchTest(_test.TestCase):
+    def setUp(self):
+        self.router = Valhalla("https://api.mapbox.com/valhalla/v1")
+        self.locations = [PARAM_LINE, PARAM_LINE_MULTI, PARAM_LINE, PARAM_LINE_MULTI, PARAM_LINE]
+
+    @responses.activate
+    def test_directions_many(self):
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/route",
+            status=200,
+            json=ENDPOINTS_RESPONSES["valhalla"]["directions"],
+            content_type="application/json",
+        )
+
+        results = list(self.router.directions_many(self.locations, profile="auto", max_workers=3))
+
+        self.assertEqual(len(self.locations), len(responses.calls))
+        self.assertEqual(sorted(index for index, _ in results), list(range(len(self.locations))))
+        for _, route in results:
+            self.assertIsInstance(route, Direction)
+
+    def test_ordered(self):
+        def directions(locations, delay):
+            time.sleep(delay)
+            return locations
+
+        delays = [{"delay": 0.2}, {"delay": 0.1}, {"delay": 0}, {"delay": 0.05}]
+        results = list(
+            run_many(directions, ["a", "b", "c", "d"], kwargs=delays, max_workers=4, ordered=True)
+        )
+
+        self.assertEqual(results, [(0, "a"), (1, "b"), (2, "c"), (3, "d")])
+
+    def test_kwargs_length(self):
+        def directions(locations, delay):
+            return locations
+
+        with self.assertRaises(ValueError):
+            list(run_many(directions, ["a", "b", "c"], kwargs=[{"delay": 0}] * 2))
+        with self.assertRaises(ValueError):
+            list(run_many(directions, iter(["a", "b"]), kwargs=iter([{"delay": 0}] * 3)))
+
+    def test_max_in_flight(self):
+        in_flight = []
+
+        def directions(locations, profile):
+            in_flight.append(locations)
+            time.sleep(0.01)
+            return profile
+
+        consumed = 0
+        for index, result in run_many(
+            directions, range(20), max_workers=2, max_in_flight=3, profile="car"
+        ):
+            consumed += 1
+            self.assertEqual(result, "car")
+            # never more than max_in_flight items submitted ahead of the consumer
+            self.assertLessEqual(len(in_flight) - consumed, 3)
+
+        self.assertEqual(consumed, 20)
+
+    @responses.activate
+    def test_errors_per_item(self):
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/route",
+            status=200,
+            json=ENDPOINTS_RESPONSES["valhalla"]["directions"],
+            content_type="application/json",
+        )
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/route",
+            status=400,
+            json={"error": "No path could be found"},
+            content_type="application/json",
+        )
+
+        results = dict(self.router.directions_many(self.locations[:2], profile="auto", max_workers=1))
+
+        self.assertIsInstance(results[0], Direction)
+        self.assertIsInstance(results[1], routingpy.exceptions.RouterApiError)
+
+        router = Valhalla("https://api.mapbox.com/valhalla/v1", skip_api_error=True)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            results = dict(router.directions_many(self.locations[:2], profile="auto", max_workers=1))
+
+        self.assertIsInstance(results[1], Direction)
+        self.assertIsNone(results[1].geometry)
+
+    @responses.activate
+    def test_router_by_name(self):
+        responses.add(
+            responses.GET,
+            "https://routing.openstreetmap.de/routed-bike/table/v1/driving/8.688641,49.420577;8.680916,49.415776",
+            status=200,
+            json=ENDPOINTS_RESPONSES["osrm"]["matrix"],
+            content_type="application/json",
+        )
+
+        router = get_router_by_name("osrm")()
+        results = list(run_many(router.matrix, [PARAM_LINE] * 3, ordered=True))
+
+        self.assertEqual([index for index, _ in results], [0, 1, 2])
+        self.assertEqual(results[0][1].durations, ENDPOINTS_RESPONSES["osrm"]["matrix"]["durations"])
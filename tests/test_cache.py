@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the response caches."""
+
+import os
+import tempfile
+import time
+from copy import deepcopy
+
+import responses
+
+import routingpy
+import tests as _test
+from routingpy import OSRM, Valhalla
+from routingpy.cache import MemoryCache, SQLiteCache, cache_key
+from tests.data.mock import *
+
+
+class CacheTest(_test.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_cache_key(self):
+        self.assertEqual(
+            cache_key("POST", "https://a/route", {"a": 1, "b": [1, 2]}),
+            cache_key("POST", "https://a/route", {"b": [1, 2], "a": 1}),
+        )
+        self.assertNotEqual(cache_key("GET", "https://a/route"), cache_key("POST", "https://a/route"))
+        self.assertNotEqual(
+            cache_key("GET", "https://a/route?x=1"), cache_key("GET", "https://a/route?x=2")
+        )
+
+    def test_memory_lru(self):
+        cache = MemoryCache(maxsize=2)
+        cache.set("a", {"a": 1})
+        cache.set("b", {"b": 1})
+        cache.get("a")
+        cache.set("c", {"c": 1})
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), {"a": 1})
+        self.assertEqual(cache.stats, {"hits": 2, "misses": 1, "size": 2})
+
+    def test_memory_ttl(self):
+        cache = MemoryCache(ttl=0.01)
+        cache.set("a", {"a": 1})
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_sqlite(self):
+        cache = SQLiteCache(self.path)
+        cache.set("json", {"a": [1, 2.5, None]})
+        cache.set("tiff", b"II*\x00binary")
+        cache.close()
+
+        cache = SQLiteCache(self.path)
+        self.assertEqual(cache.get("json"), {"a": [1, 2.5, None]})
+        self.assertEqual(cache.get("tiff"), b"II*\x00binary")
+        self.assertIsNone(cache.get("missing"))
+        self.assertEqual(cache.stats, {"hits": 2, "misses": 1, "size": 2})
+        cache.close()
+
+    def test_sqlite_eviction(self):
+        cache = SQLiteCache(self.path, max_bytes=25)
+        for key in ("a", "b", "c"):
+            cache.set(key, b"0123456789")
+            time.sleep(0.01)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("a"))
+
+        cache = SQLiteCache(self.path, ttl=0.01)
+        cache.set("d", {"d": 1})
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("d"))
+
+    @responses.activate
+    def test_client_cache(self):
+        responses.add(
+            responses.GET,
+            "https://routing.openstreetmap.de/routed-bike/table/v1/driving/8.688641,49.420577;8.680916,49.415776",
+            status=200,
+            json=ENDPOINTS_RESPONSES["osrm"]["matrix"],
+            content_type="application/json",
+        )
+        cache = MemoryCache()
+        router = OSRM(cache=cache)
+
+        first = router.matrix(PARAM_LINE)
+        second = router.matrix(PARAM_LINE)
+        router.matrix(PARAM_LINE, dry_run=True)
+
+        self.assertEqual(1, len(responses.calls))
+        self.assertEqual(first.durations, second.durations)
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 1, "size": 1})
+
+    @responses.activate
+    def test_client_cache_errors(self):
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/route",
+            status=400,
+            json={"error": "No path could be found"},
+            content_type="application/json",
+        )
+        cache = MemoryCache()
+        router = Valhalla("https://api.mapbox.com/valhalla/v1", cache=cache)
+
+        for _ in range(2):
+            with self.assertRaises(routingpy.exceptions.RouterApiError):
+                router.directions(**ENDPOINTS_QUERIES["valhalla"]["directions"])
+
+        self.assertEqual(2, len(responses.calls))
+        self.assertEqual(len(cache), 0)
+
+    @responses.activate
+    def test_client_cache_raster(self):
+        query = deepcopy(ENDPOINTS_QUERIES["valhalla"]["isochrones"])
+        query["format"] = "geotiff"
+        with open("tests/raster_valhalla.tif", "rb") as raster_file:
+            image = raster_file.read()
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/isochrone",
+            status=200,
+            body=image,
+            content_type="image/tiff",
+        )
+        cache = SQLiteCache(self.path)
+        router = Valhalla("https://api.mapbox.com/valhalla/v1", cache=cache)
+
+        router.raster(**query)
+        raster = router.raster(**query)
+
+        self.assertEqual(1, len(responses.calls))
+        self.assertEqual(raster.image, image)
+        cache.close()
+
+    @responses.activate
+    def test_client_cache_shared_keep_raw(self):
+        response = ENDPOINTS_RESPONSES["valhalla"]["directions"]
+        query = ENDPOINTS_QUERIES["valhalla"]["directions"]
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/route",
+            status=200,
+            json=response,
+            content_type="application/json",
+        )
+        cache = SQLiteCache(self.path)
+
+        # The first router caches the undecoded content, the others decode it on their hits
+        for keep_raw in ("bytes", "full", "none", "bytes"):
+            router = Valhalla("https://api.mapbox.com/valhalla/v1", cache=cache, keep_raw=keep_raw)
+            route = router.directions(**query)
+            self.assertEqual(route.duration, 57)
+            self.assertEqual(route.raw, None if keep_raw == "none" else response)
+
+        self.assertEqual(1, len(responses.calls))
+        cache.close()
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the circuit breaker."""
+
+import time
+
+import requests
+import responses
+
+import routingpy
+import tests as _test
+from routingpy import OSRM
+from routingpy.balancer import LoadBalancer
+from routingpy.circuit_breaker import CircuitBreaker
+from routingpy.matrix import Matrix
+from routingpy.retry import RetryPolicy
+from tests.data.mock import *
+
+PATH = "/table/v1/driving/8.688641,49.420577;8.680916,49.415776"
+
+
+class CircuitBreakerTest(_test.TestCase):
+    def setUp(self):
+        self.transitions = []
+        self.breaker = CircuitBreaker(
+            failure_threshold=2,
+            cooldown=0.2,
+            on_state_change=lambda key, old, new: self.transitions.append((old, new)),
+        )
+
+    def test_key(self):
+        self.assertEqual(
+            self.breaker.key("http://osrm", PATH + "?annotations=duration"), "http://osrm/table/v1"
+        )
+        self.assertEqual(self.breaker.key("http://valhalla", "/route"), "http://valhalla/route")
+
+    @responses.activate
+    def test_states(self):
+        responses.add(responses.GET, "http://osrm" + PATH, status=503)
+        router = OSRM(
+            "http://osrm",
+            circuit_breaker=self.breaker,
+            retry_policy=RetryPolicy(base_delay=0.01, max_delay=0.01),
+        )
+
+        start = time.monotonic()
+        with self.assertWarns(UserWarning):
+            with self.assertRaises(routingpy.exceptions.CircuitOpen):
+                router.matrix(PARAM_LINE)
+        # fails fast on the open circuit without a request
+        with self.assertRaises(routingpy.exceptions.CircuitOpen) as context:
+            router.matrix(PARAM_LINE)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(len(responses.calls), 2)
+        self.assertGreater(context.exception.retry_after, 0)
+        self.assertEqual(self.breaker.states, {"http://osrm/table/v1": "open"})
+
+        # a failed probe opens the circuit again, a successful one closes it
+        time.sleep(0.2)
+        with self.assertRaises(routingpy.exceptions.CircuitOpen):
+            router.matrix(PARAM_LINE)
+        time.sleep(0.2)
+        responses.replace(
+            responses.GET,
+            "http://osrm" + PATH,
+            json=ENDPOINTS_RESPONSES["osrm"]["matrix"],
+            content_type="application/json",
+        )
+        self.assertIsInstance(router.matrix(PARAM_LINE), Matrix)
+        self.assertEqual(self.breaker.state("http://osrm/table/v1"), "closed")
+        self.assertEqual(
+            self.transitions,
+            [
+                ("closed", "open"),
+                ("open", "half_open"),
+                ("half_open", "open"),
+                ("open", "half_open"),
+                ("half_open", "closed"),
+            ],
+        )
+
+    def test_half_open_probes(self):
+        for _ in range(2):
+            self.breaker.record_failure("a")
+        time.sleep(0.2)
+
+        self.breaker.before_request("a")
+        with self.assertRaises(routingpy.exceptions.CircuitOpen):
+            self.breaker.before_request("a")
+        self.breaker.before_request("b")
+
+    @responses.activate
+    def test_fail_over(self):
+        responses.add(
+            responses.GET,
+            "http://osrm-2" + PATH,
+            json=ENDPOINTS_RESPONSES["osrm"]["matrix"],
+            content_type="application/json",
+        )
+        for _ in range(2):
+            self.breaker.record_failure("http://osrm-1/table/v1")
+        router = OSRM(["http://osrm-1", "http://osrm-2"], circuit_breaker=self.breaker)
+
+        with self.assertWarns(UserWarning):
+            self.assertIsInstance(router.matrix(PARAM_LINE), Matrix)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_open_circuit_keeps_endpoint_unhealthy(self):
+        responses.add(responses.GET, "http://osrm-1" + PATH, status=500)
+        responses.add(
+            responses.GET,
+            "http://osrm-2" + PATH,
+            json=ENDPOINTS_RESPONSES["osrm"]["matrix"],
+            content_type="application/json",
+        )
+        balancer = LoadBalancer(["http://osrm-1", "http://osrm-2"], failure_threshold=1, recovery_time=0)
+        router = OSRM(balancer, circuit_breaker=CircuitBreaker(failure_threshold=1, cooldown=60))
+
+        for _ in range(3):
+            with self.assertWarns(UserWarning):
+                self.assertIsInstance(router.matrix(PARAM_LINE), Matrix)
+
+        # The probes of osrm-1 were stopped by its open circuit, which doesn't make it healthy again
+        self.assertEqual(len(responses.calls), 4)
+        self.assertFalse(balancer.endpoints[0].healthy)
+        self.assertEqual([endpoint.outstanding for endpoint in balancer.endpoints], [0, 0])
+
+    @responses.activate
+    def test_unexpected_error_frees_probe(self):
+        responses.add(responses.GET, "http://osrm" + PATH, body=requests.exceptions.TooManyRedirects())
+        for _ in range(2):
+            self.breaker.record_failure("http://osrm/table/v1")
+        time.sleep(0.2)
+        router = OSRM("http://osrm", circuit_breaker=self.breaker)
+
+        with self.assertRaises(requests.exceptions.TooManyRedirects):
+            router.matrix(PARAM_LINE)
+
+        # The failed probe opened the circuit again instead of leaving it half-open for good
+        self.assertEqual(self.breaker.state("http://osrm/table/v1"), "open")
+        time.sleep(0.2)
+        with self.assertRaises(requests.exceptions.TooManyRedirects):
+            router.matrix(PARAM_LINE)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the asynchronous client."""
+
+import asyncio
+import threading
+import warnings
+from unittest import mock
+
+import responses
+
+import routingpy
+import tests as _test
+from routingpy import OSRM, Valhalla
+from routingpy.client_async import AsyncClient
+from routingpy.direction import Direction
+from routingpy.matrix import Matrix
+from tests.data.mock import *
+
+
+class AsyncClientTest(_test.TestCase):
+    def setUp(self):
+        self.router = Valhalla("https://api.mapbox.com/valhalla/v1", client=AsyncClient)
+
+    def tearDown(self):
+        self.router.client.close()
+
+    @responses.activate
+    def test_directions_awaitable(self):
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/route",
+            status=200,
+            json=ENDPOINTS_RESPONSES["valhalla"]["directions"],
+            content_type="application/json",
+        )
+
+        async def run():
+            query = ENDPOINTS_QUERIES["valhalla"]["directions"]
+            return await asyncio.gather(*[self.router.directions(**query) for _ in range(5)])
+
+        routes = asyncio.run(run())
+
+        self.assertEqual(5, len(responses.calls))
+        for route in routes:
+            self.assertIsInstance(route, Direction)
+            self.assertEqual(route.duration, 57)
+
+    @responses.activate
+    def test_matrix_awaitable(self):
+        router = OSRM(client=AsyncClient)
+        responses.add(
+            responses.GET,
+            "https://routing.openstreetmap.de/routed-bike/table/v1/driving/8.688641,49.420577;8.680916,49.415776",
+            status=200,
+            json=ENDPOINTS_RESPONSES["osrm"]["matrix"],
+            content_type="application/json",
+        )
+
+        matrix = asyncio.run(router.matrix(PARAM_LINE))
+
+        self.assertIsInstance(matrix, Matrix)
+        self.assertEqual(matrix.durations, ENDPOINTS_RESPONSES["osrm"]["matrix"]["durations"])
+        router.client.close()
+
+    @responses.activate
+    def test_expansion_iter(self):
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/expansion",
+            status=200,
+            json=ENDPOINTS_RESPONSES["valhalla"]["expansion"],
+            content_type="application/json",
+        )
+        query = ENDPOINTS_QUERIES["valhalla"]["expansion"]
+        loop_thread = []
+
+        async def run():
+            loop_thread.append(threading.current_thread())
+            return [batch async for batch in await self.router.expansion_iter(**query, batch_size=4)]
+
+        with mock.patch(
+            "routingpy.client_default.Client._iter_stream", side_effect=self.record_iter_stream
+        ):
+            batches = asyncio.run(run())
+
+        expected = Valhalla("https://api.mapbox.com/valhalla/v1").expansion(**query)
+        self.assertEqual(
+            [edge.geometry for batch in batches for edge in batch],
+            [edge.geometry for edge in expected],
+        )
+        # The response was read on the thread pool, not on the event loop's thread
+        self.assertTrue(self.read_threads)
+        self.assertNotIn(loop_thread[0], self.read_threads)
+
+    def record_iter_stream(self, response):
+        self.read_threads = set()
+        for chunk in response.iter_content(64):
+            self.read_threads.add(threading.current_thread())
+            yield chunk
+
+    @responses.activate
+    def test_retry_server_down(self):
+        responses.add(responses.POST, "https://api.mapbox.com/valhalla/v1/route", status=503)
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/route",
+            status=200,
+            json=ENDPOINTS_RESPONSES["valhalla"]["directions"],
+            content_type="application/json",
+        )
+
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            route = asyncio.run(self.router.directions(**ENDPOINTS_QUERIES["valhalla"]["directions"]))
+
+        self.assertEqual(2, len(responses.calls))
+        self.assertIn("Server down", str(w[0].message))
+        self.assertEqual(route.duration, 57)
+
+    @responses.activate
+    def test_skip_api_error(self):
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/route",
+            status=400,
+            json={"error": "No path could be found"},
+            content_type="application/json",
+        )
+
+        with self.assertRaises(routingpy.exceptions.RouterApiError):
+            asyncio.run(self.router.directions(**ENDPOINTS_QUERIES["valhalla"]["directions"]))
+
+        router = Valhalla("https://api.mapbox.com/valhalla/v1", client=AsyncClient, skip_api_error=True)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            route = asyncio.run(router.directions(**ENDPOINTS_QUERIES["valhalla"]["directions"]))
+        self.assertIsInstance(route, Direction)
+        self.assertIsNone(route.geometry)
+        router.client.close()
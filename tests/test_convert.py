@@ -31,3 +31,17 @@ class UtilsTest(_test.TestCase):  # noqa: E741
         for f in falses:
             with self.assertRaises(TypeError):
                 convert.delimit_list(f)
+
+    def test_format_coordinates(self):
+        locations = [(8.68864, 49.42058), (8.68092, 49.41578)]
+
+        self.assertEqual(convert.format_coordinates(locations), "8.68864,49.42058;8.68092,49.41578")
+        self.assertEqual(
+            convert.format_coordinates(locations, "polyline"), r"polyline(smslH__%60t%40~%5Cfo%40)"
+        )
+        self.assertEqual(
+            convert.format_coordinates(locations, "polyline", quote_polyline=False),
+            r"polyline(smslH__`t@~\fo@)",
+        )
+        with self.assertRaises(ValueError):
+            convert.format_coordinates(locations, "geojson")
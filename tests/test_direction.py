@@ -1,6 +1,9 @@
 import unittest
+from unittest import mock
 
-from routingpy.direction import Direction
+from routingpy import utils
+from routingpy.direction import Direction, Directions, EncodedGeometry
+from routingpy.optimized import OptimizedDirection
 
 
 class DirectionTest(unittest.TestCase):
@@ -21,3 +24,30 @@ class DirectionTest(unittest.TestCase):
         self.assertAlmostEqual(more_than_one.mi, 1.9883878)
         self.assertAlmostEqual(exactly_one.mi, 1)
         self.assertAlmostEqual(less_than_one.mi, 0.51884492)
+
+    def test_encoded_geometry(self):
+        coordinates = [[8.68864, 49.42058], [8.68092, 49.41578], [8.78092, 49.44578]]
+        polylines = [utils.encode_polyline5(coordinates[:2]), utils.encode_polyline5(coordinates[1:])]
+        decoder = mock.Mock(side_effect=utils.decode_polyline5)
+
+        direction = Direction(geometry=EncodedGeometry.parse(polylines, decoder, "lazy"), distance=835)
+        self.assertEqual(direction.km, 0.835)
+        decoder.assert_not_called()
+
+        expected = utils.decode_polyline5(polylines[0]) + utils.decode_polyline5(polylines[1])
+        self.assertEqual(direction.geometry, expected)
+        self.assertIs(direction.geometry, direction.geometry)
+        self.assertEqual(decoder.call_count, 2)
+
+        self.assertEqual(
+            EncodedGeometry.parse(polylines[0], decoder), utils.decode_polyline5(polylines[0])
+        )
+        self.assertIsNone(EncodedGeometry.parse(polylines, decoder, False))
+        with self.assertRaises(ValueError):
+            EncodedGeometry.parse(polylines, decoder, "eager")
+
+    def test_slots(self):
+        for direction in (Direction(), Directions(), OptimizedDirection(), EncodedGeometry("", list)):
+            self.assertFalse(hasattr(direction, "__dict__"))
+            with self.assertRaises(AttributeError):
+                direction.duration_in_traffic = 100
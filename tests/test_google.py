@@ -171,6 +171,28 @@ class GoogleTest(_test.TestCase):
         self.assertIsInstance(matrix.durations, list)
         self.assertIsInstance(matrix.distances, list)
 
+    @_test.requires_numpy
+    @responses.activate
+    def test_matrix_array(self):
+        query = ENDPOINTS_QUERIES[self.name]["matrix"]
+        response = deepcopy(ENDPOINTS_RESPONSES[self.name]["matrix"])
+        response["rows"][0]["elements"].append({"status": "ZERO_RESULTS"})
+
+        responses.add(
+            responses.GET,
+            "https://maps.googleapis.com/maps/api/distancematrix/json",
+            status=200,
+            json=response,
+            content_type="application/json",
+        )
+
+        matrix = self.client.matrix(**query, dtype="float64")
+
+        self.assertEqual(matrix.durations_array.dtype, _test.np.float64)
+        self.assertEqual(matrix.durations_array[0, 0], 13813)
+        self.assertTrue(_test.np.isnan(matrix.distances_array[0, 1]))
+        self.assertEqual(matrix.distances, [[361957, None]])
+
     @responses.activate
     def test_few_sources_destinations_matrix(self):
         query = deepcopy(ENDPOINTS_QUERIES[self.name]["matrix"])
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for hedged requests."""
+
+import json
+import re
+import threading
+import time
+
+import responses
+
+import tests as _test
+from routingpy import OSRM
+from routingpy.hedging import HedgePolicy
+from tests.data.mock import *
+
+
+def slow_replica_callback(request):
+    # osrm-1 is slow, osrm-2 is fast
+    if "osrm-1" in request.url:
+        time.sleep(0.5)
+    return 200, {"Content-Type": "application/json"}, json.dumps(ENDPOINTS_RESPONSES["osrm"]["matrix"])
+
+
+class HedgePolicyTest(_test.TestCase):
+    def setUp(self):
+        responses.start()
+        responses.add_callback(
+            responses.GET, re.compile(r"http://osrm-\d/.*"), callback=slow_replica_callback
+        )
+
+    def tearDown(self):
+        responses.stop()
+        responses.reset()
+
+    def test_hedge_to_other_endpoint(self):
+        policy = HedgePolicy(delay=0.05, budget_ratio=1)
+        router = OSRM(["http://osrm-1", "http://osrm-2"], hedge_policy=policy)
+
+        start = time.monotonic()
+        matrix = router.matrix(PARAM_LINE)
+
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(matrix.durations, ENDPOINTS_RESPONSES["osrm"]["matrix"]["durations"])
+        self.assertEqual(policy.stats, {"requests": 1, "hedges": 1, "wins": 1})
+        self.assertEqual(router.client.req.url.split("/")[2], "osrm-2")
+        # wait for the ignored request, so it's not recorded by the next test's mock
+        for thread in threading.enumerate():
+            if thread.name == "routingpy-hedge-primary":
+                thread.join()
+        policy.executor.shutdown(wait=True)
+
+    def test_primary_doesnt_wait_for_pool(self):
+        policy = HedgePolicy(delay=0.2, budget_ratio=1, max_workers=1)
+        busy = threading.Event()
+        policy.executor.submit(busy.wait, 2)
+        router = OSRM("http://osrm-2", hedge_policy=policy)
+
+        start = time.monotonic()
+        router.matrix(PARAM_LINE)
+
+        self.assertLess(time.monotonic() - start, 0.2)
+        self.assertEqual(policy.stats, {"requests": 1, "hedges": 0, "wins": 0})
+        busy.set()
+        policy.close()
+
+    def test_budget_and_paths(self):
+        policy = HedgePolicy(delay=0.05, budget_ratio=0)
+        router = OSRM(["http://osrm-1", "http://osrm-2"], hedge_policy=policy)
+        router.matrix(PARAM_LINE)
+        self.assertEqual(policy.stats, {"requests": 1, "hedges": 0, "wins": 0})
+
+        policy = HedgePolicy(delay=0.05, budget_ratio=1, paths=["/route"])
+        router = OSRM("http://osrm-1", hedge_policy=policy)
+        router.matrix(PARAM_LINE)
+        self.assertEqual(policy.stats, {"requests": 0, "hedges": 0, "wins": 0})
+        self.assertEqual(len(responses.calls), 2)
+
+    def test_percentile_delay(self):
+        policy = HedgePolicy(percentile=0.9, min_samples=10)
+        for latency in range(1, 10):
+            policy.observe(latency / 10)
+        self.assertIsNone(policy.hedge_delay())
+
+        policy.observe(1.0)
+        self.assertEqual(policy.hedge_delay(), 0.9)
+        policy.observe(2.0)
+        self.assertEqual(policy.hedge_delay(), 1.0)
+
+        # The percentile is only recomputed once 5% of the window are new latencies
+        for _ in range(89):
+            policy.observe(0.1)
+        self.assertEqual(policy.hedge_delay(), 0.1)
+        for _ in range(4):
+            policy.observe(10.0)
+        self.assertEqual(policy.hedge_delay(), 0.1)
+        policy.observe(10.0)
+        self.assertEqual(policy.hedge_delay(), 0.6)
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the client's instrumentation hooks."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import responses
+
+import tests as _test
+from routingpy import OSRM, Valhalla
+from routingpy.json_codec import JSONCodec
+from routingpy.ratelimit import RateLimiter
+from routingpy.retry import RetryPolicy
+from tests.data.mock import *
+
+
+class MatrixHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps(ENDPOINTS_RESPONSES["osrm"]["matrix"]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HooksTest(_test.TestCase):
+    def setUp(self):
+        self.events = []
+
+    def record(self, event):
+        self.events.append(event)
+
+    @responses.activate
+    def test_request_events(self):
+        responses.add(responses.POST, "https://api.mapbox.com/valhalla/v1/route", status=503)
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/route",
+            status=200,
+            json=ENDPOINTS_RESPONSES["valhalla"]["directions"],
+            content_type="application/json",
+        )
+        hooks = {event: self.record for event in ("request_start", "request_end", "retry", "parse")}
+        router = Valhalla(
+            "https://api.mapbox.com/valhalla/v1",
+            hooks=hooks,
+            retry_policy=RetryPolicy(base_delay=0.01, max_delay=0.01),
+        )
+
+        with self.assertWarns(UserWarning):
+            router.directions(**ENDPOINTS_QUERIES["valhalla"]["directions"])
+
+        self.assertEqual(
+            [event.name for event in self.events],
+            ["request_start", "request_end", "retry", "request_start", "request_end", "parse"],
+        )
+        failed, retry, end, parse = self.events[1], self.events[2], self.events[4], self.events[5]
+        self.assertEqual(failed.status, 503)
+        self.assertEqual((retry.retry_count, retry.status), (1, 503))
+        self.assertEqual(
+            (end.router, end.endpoint, end.url, end.method, end.retry_count, end.status),
+            ("Valhalla", "https://api.mapbox.com/valhalla/v1", "/route", "POST", 1, 200),
+        )
+        self.assertGreater(end.bytes_sent, 0)
+        self.assertEqual(
+            end.bytes_received, len(json.dumps(ENDPOINTS_RESPONSES["valhalla"]["directions"]))
+        )
+        self.assertGreaterEqual(end.total, 0)
+        self.assertGreaterEqual(parse.duration, 0)
+        self.assertEqual(parse.as_dict()["router"], "Valhalla")
+
+    @responses.activate
+    def test_bytes_sent(self):
+        class TextCodec(JSONCodec):
+            def dumps(self, obj):
+                return json.dumps(obj, ensure_ascii=False)
+
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/route",
+            status=200,
+            json=ENDPOINTS_RESPONSES["valhalla"]["directions"],
+            content_type="application/json",
+        )
+        router = Valhalla(
+            "https://api.mapbox.com/valhalla/v1",
+            hooks={"request_end": self.record},
+            json_codec=TextCodec(),
+        )
+        query = dict(ENDPOINTS_QUERIES["valhalla"]["directions"], id="Köln")
+        router.directions(**query)
+
+        body = responses.calls[0].request.body
+        self.assertIsInstance(body, str)
+        self.assertEqual(self.events[0].bytes_sent, len(body.encode("utf-8")))
+        self.assertGreater(self.events[0].bytes_sent, len(body))
+
+    @responses.activate
+    def test_rate_limit_event(self):
+        responses.add(
+            responses.GET,
+            "https://routing.openstreetmap.de/routed-bike/table/v1/driving/8.688641,49.420577;8.680916,49.415776",
+            status=200,
+            json=ENDPOINTS_RESPONSES["osrm"]["matrix"],
+            content_type="application/json",
+        )
+        router = OSRM(rate_limiter=RateLimiter(20))
+        router.client.add_hook("rate_limit_sleep", self.record)
+
+        router.matrix(PARAM_LINE)
+        router.matrix(PARAM_LINE)
+
+        self.assertEqual(len(self.events), 1)
+        self.assertGreater(self.events[0].duration, 0)
+
+        router.client.remove_hook("rate_limit_sleep", self.record)
+        router.matrix(PARAM_LINE)
+        self.assertEqual(len(self.events), 1)
+
+        with self.assertRaises(ValueError):
+            router.client.add_hook("response", self.record)
+
+    def test_connection_timings(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), MatrixHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        router = OSRM(
+            "http://localhost:{}".format(server.server_port), hooks={"request_end": self.record}
+        )
+
+        router.matrix(PARAM_LINE)
+        router.matrix(PARAM_LINE)
+        server.shutdown()
+        server.server_close()
+
+        first, second = self.events
+        self.assertEqual(first.status, 200)
+        self.assertGreaterEqual(first.connect, 0)
+        self.assertGreaterEqual(first.ttfb, 0)
+        self.assertGreaterEqual(first.total, first.ttfb)
+        # the second request reuses the connection
+        self.assertIsNone(second.connect)
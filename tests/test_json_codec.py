@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the JSON codecs."""
+
+import contextlib
+import io
+import json
+import unittest
+
+import responses
+
+import tests as _test
+from routingpy import Valhalla, exceptions, json_codec
+from routingpy.direction import Direction
+from tests.data.mock import *
+
+requires_orjson = unittest.skipIf(json_codec.orjson is None, "orjson is not installed")
+
+
+class JSONCodecTest(_test.TestCase):
+    document = {"a": [1, 2.5, None, True], "b": {"c": "ü/€"}, 3: "d"}
+
+    def assertRoundTrip(self, codec):
+        encoded = codec.dumps(self.document)
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(json.loads(encoded), {"a": [1, 2.5, None, True], "b": {"c": "ü/€"}, "3": "d"})
+        self.assertEqual(codec.loads(encoded), json.loads(encoded))
+        with self.assertRaises(ValueError):
+            codec.loads(b'{"a": ')
+
+    def test_stdlib(self):
+        self.assertRoundTrip(json_codec.get_codec("json"))
+        with self.assertRaises(ValueError):
+            json_codec.get_codec("json").dumps(float("nan"))
+
+    @requires_orjson
+    def test_orjson(self):
+        self.assertRoundTrip(json_codec.get_codec("orjson"))
+        self.assertIsInstance(json_codec.get_codec(), json_codec.OrjsonCodec)
+
+    def test_get_codec(self):
+        with self.assertRaises(ValueError):
+            json_codec.get_codec("yaml")
+
+        for name, module in (("orjson", json_codec.orjson), ("ujson", json_codec.ujson)):
+            if module is None:
+                with self.assertRaises(ImportError):
+                    json_codec.get_codec(name)
+
+
+class ClientJSONCodecTest(_test.TestCase):
+    name = "valhalla"
+    url = "https://api.mapbox.com/valhalla/v1/route"
+
+    @responses.activate
+    def test_directions(self):
+        responses.add(
+            responses.POST,
+            self.url,
+            status=200,
+            json=ENDPOINTS_RESPONSES[self.name]["directions"],
+            content_type="application/json",
+        )
+        default = Valhalla("https://api.mapbox.com/valhalla/v1").directions(
+            **ENDPOINTS_QUERIES[self.name]["directions"]
+        )
+        router = Valhalla("https://api.mapbox.com/valhalla/v1", json_codec="auto")
+        routes = router.directions(**ENDPOINTS_QUERIES[self.name]["directions"])
+
+        self.assertIsInstance(routes, Direction)
+        self.assertEqual((routes.distance, routes.duration), (default.distance, default.duration))
+        self.assertEqual(routes.raw, default.raw)
+        self.assertEqual(
+            json.loads(responses.calls[1].request.body), json.loads(responses.calls[0].request.body)
+        )
+        self.assertEqual(responses.calls[1].request.headers["Content-Type"], "application/json")
+
+    @responses.activate
+    def test_invalid_response(self):
+        responses.add(responses.POST, self.url, status=200, body="{", content_type="application/json")
+        router = Valhalla("https://api.mapbox.com/valhalla/v1", json_codec=json_codec.JSONCodec())
+
+        with self.assertRaises(exceptions.JSONParseError):
+            router.directions(**ENDPOINTS_QUERIES[self.name]["directions"])
+
+    def test_dry_run(self):
+        router = Valhalla("https://api.mapbox.com/valhalla/v1", json_codec="auto")
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            router.directions(**ENDPOINTS_QUERIES[self.name]["directions"], dry_run=True)
+
+        self.assertIn('"json": {', stdout.getvalue())
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the matrix module."""
+
+import re
+from urllib.parse import parse_qs, urlsplit
+
+import responses
+
+import tests as _test
+from routingpy import OSRM
+from routingpy.matrix import IncrementalMatrix
+from tests.test_tiling import osrm_table_callback
+
+
+class IncrementalMatrixTest(_test.TestCase):
+    def setUp(self):
+        responses.start()
+        responses.add_callback(
+            responses.GET,
+            re.compile(r"https://routing.openstreetmap.de/routed-bike/table/v1/driving/.*"),
+            callback=osrm_table_callback,
+        )
+        self.locations = [[float(i), 49.0] for i in range(6)]
+
+    def tearDown(self):
+        responses.stop()
+        responses.reset()
+
+    def expected(self, longitudes):
+        return [[float(d - s) for d in longitudes] for s in longitudes]
+
+    def test_add_locations(self):
+        matrix = IncrementalMatrix(OSRM(), self.locations[:4])
+        matrix.add_locations(self.locations[4:])
+
+        self.assertEqual(3, len(responses.calls))
+        rows = parse_qs(urlsplit(responses.calls[1].request.url).query)
+        self.assertEqual(rows["sources"], ["4;5"])
+        columns = parse_qs(urlsplit(responses.calls[2].request.url).query)
+        self.assertEqual(columns["destinations"], ["4;5"])
+        self.assertEqual(matrix.durations, self.expected(range(6)))
+        self.assertEqual(matrix.distances[5][0], -50.0)
+        self.assertEqual(len(matrix.raw), 2)
+
+    def test_remove_locations(self):
+        matrix = IncrementalMatrix(OSRM(), self.locations)
+        matrix.remove_locations([4, 1])
+
+        self.assertEqual(1, len(responses.calls))
+        self.assertEqual(matrix.locations, [self.locations[i] for i in (0, 2, 3, 5)])
+        self.assertEqual(matrix.durations, self.expected([0, 2, 3, 5]))
+
+        matrix.add_locations([[1.0, 49.0]])
+        self.assertEqual(matrix.durations, self.expected([0, 2, 3, 5, 1]))
+
+    def test_leaves_passed_matrix_untouched(self):
+        initial = OSRM().matrix(self.locations[:4])
+        matrix = IncrementalMatrix(OSRM(), self.locations[:4], matrix=initial)
+        matrix.add_locations(self.locations[4:])
+        matrix.remove_locations([0])
+
+        self.assertEqual(initial.durations, self.expected(range(4)))
+        self.assertEqual(matrix.durations, self.expected(range(1, 6)))
+
+    def test_remove_invalid_index(self):
+        matrix = IncrementalMatrix(OSRM(), self.locations)
+        with self.assertRaises(IndexError):
+            matrix.remove_locations([1, 6])
+
+        # Nothing was removed
+        self.assertEqual(matrix.locations, self.locations)
+        self.assertEqual(matrix.durations, self.expected(range(6)))
+
+        matrix.remove_locations([-1])
+        self.assertEqual(matrix.durations, self.expected(range(5)))
+
+    def test_failed_request_leaves_matrix_unchanged(self):
+        matrix = IncrementalMatrix(OSRM(skip_api_error=True), self.locations[:2])
+
+        for failing in ("sources=2", "destinations=2"):
+
+            def callback(request):
+                if failing in request.url:
+                    return 400, {"content-type": "application/json"}, '{"code": "InvalidQuery"}'
+                return osrm_table_callback(request)
+
+            responses.reset()
+            responses.add_callback(
+                responses.GET,
+                re.compile(r"https://routing.openstreetmap.de/routed-bike/table/v1/driving/.*"),
+                callback=callback,
+            )
+            with self.assertWarns(UserWarning):
+                self.assertFalse(matrix.add_locations(self.locations[2:3]))
+
+            self.assertEqual(matrix.locations, self.locations[:2])
+            self.assertEqual(matrix.durations, self.expected(range(2)))
+            self.assertEqual(len(matrix.distances), 2)
+
+    @_test.requires_numpy
+    def test_array_mode(self):
+        matrix = IncrementalMatrix(OSRM(), self.locations[:3], dtype="float32")
+        matrix.add_locations(self.locations[3:])
+        matrix.remove_locations([0])
+
+        self.assertEqual(matrix.durations_array.dtype, _test.np.float32)
+        self.assertEqual(matrix.durations_array.shape, (5, 5))
+        self.assertEqual(matrix.durations, self.expected(range(1, 6)))
+
+    def test_sources_not_allowed(self):
+        with self.assertRaises(ValueError):
+            IncrementalMatrix(OSRM(), self.locations, sources=[0])
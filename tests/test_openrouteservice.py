@@ -17,6 +17,7 @@
 """Tests for the openrouteservice module."""
 
 import json
+import pickle
 from copy import deepcopy
 
 import responses
@@ -64,6 +65,14 @@ class ORSTest(_test.TestCase):
         self.assertEqual(routes.distance, 2439)
         self.assertIsInstance(routes.raw, dict)
 
+    def test_lazy_geometry_pickle(self):
+        response = ENDPOINTS_RESPONSES[self.name]["directions"]["json"]
+        eager = ORS.parse_direction_json(response, "json", {"target_count": 2})
+        lazy = ORS.parse_direction_json(response, "json", {"target_count": 2}, "lazy")
+
+        routes = pickle.loads(pickle.dumps(lazy))
+        self.assertEqual(routes[0].geometry, eager[0].geometry)
+
     @responses.activate
     def test_directions_geojson(self):
         query = deepcopy(ENDPOINTS_QUERIES[self.name]["directions"])
@@ -16,6 +16,9 @@
 #
 """Tests for the OpenTripPlannerV2 module."""
 
+import os
+import pickle
+import tempfile
 import urllib.parse
 from copy import deepcopy
 
@@ -57,6 +60,9 @@ class OpenTripPlannerV2Test(_test.TestCase):
         self.assertIsInstance(routes.geometry, list)
         self.assertIsInstance(routes.raw, dict)
 
+        lazy = OpenTripPlannerV2(decode_geometry="lazy").directions(**query)
+        self.assertEqual(pickle.loads(pickle.dumps(lazy)).geometry, routes.geometry)
+
     @responses.activate
     def test_directions_alternative(self):
         query = ENDPOINTS_QUERIES[self.name]["directions_alternative"]
@@ -137,3 +143,26 @@ class OpenTripPlannerV2Test(_test.TestCase):
             self.assertIsInstance(raster, Raster)
             self.assertEqual(raster.image, image)
             self.assertEqual(raster.max_travel_time, query["cutoff"])
+
+    @responses.activate
+    def test_raster_stream(self):
+        query = deepcopy(ENDPOINTS_QUERIES[self.name]["raster"])
+        with open("tests/raster_otp.tiff", "rb") as raster_file:
+            image = raster_file.read()
+        responses.add(
+            responses.GET,
+            "http://localhost:8080/otp/traveltime/surface",
+            status=200,
+            body=image,
+            content_type="image/tiff",
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "raster.tiff")
+            with open(path, "w+b") as f:
+                raster = self.client.raster(**query, stream_to=f)
+
+            self.assertIsInstance(raster, Raster)
+            self.assertEqual(raster.path, path)
+            self.assertEqual(raster.image, image)
+            self.assertEqual(raster.max_travel_time, query["cutoff"])
@@ -22,8 +22,10 @@ import responses
 
 import tests as _test
 from routingpy import OSRM, convert
+from routingpy.cache import MemoryCache
 from routingpy.direction import Direction, Directions
 from routingpy.matrix import Matrix
+from routingpy.raw import RawBody
 from tests.data.mock import *
 
 
@@ -92,6 +94,46 @@ class OSRMTest(_test.TestCase):
             self.assertIsInstance(route.geometry, list)
             self.assertIsInstance(route.raw, dict)
 
+    @responses.activate
+    def test_keep_raw(self):
+        query = ENDPOINTS_QUERIES[self.name]["directions"]
+        coords = convert.delimit_list([convert.delimit_list(pair) for pair in query["locations"]], ";")
+        response = ENDPOINTS_RESPONSES[self.name]["directions_geojson"]
+
+        responses.add(
+            responses.GET,
+            f"https://routing.openstreetmap.de/routed-bike/route/v1/{query['profile']}/{coords}",
+            status=200,
+            json=response,
+            content_type="application/json",
+        )
+
+        routes = OSRM(keep_raw="none").directions(**query)
+        self.assertIsNone(routes.raw)
+        self.assertIsNone(routes[0].raw)
+        self.assertIsInstance(routes[0].geometry, list)
+
+        routes = OSRM(keep_raw="bytes").directions(**query)
+        self.assertIsInstance(routes._raw, RawBody)
+        self.assertIsInstance(routes[0]._raw, RawBody)
+        self.assertEqual(routes.raw, response)
+        self.assertEqual(routes[0].raw, response["routes"][0])
+        self.assertIsInstance(routes[0].raw, dict)
+
+        # Responses are cached as their content, which hits keep without encoding it again
+        cache = MemoryCache()
+        router = OSRM(keep_raw="bytes", cache=cache)
+        router.directions(**query)
+        routes = router.directions(**query)
+        self.assertEqual(3, len(responses.calls))
+        ((_, content),) = cache._entries.values()
+        self.assertIsInstance(content, bytes)
+        self.assertIs(routes._raw.content, content)
+        self.assertEqual(routes[0].raw, response["routes"][0])
+
+        with self.assertRaises(ValueError):
+            OSRM(keep_raw="some")
+
     @responses.activate
     def test_directions_polyline5(self):
         query = deepcopy(ENDPOINTS_QUERIES[self.name]["directions"])
@@ -249,6 +291,44 @@ class OSRMTest(_test.TestCase):
         self.assertIsInstance(matrix.distances, list)
         self.assertIsInstance(matrix.raw, dict)
 
+    @_test.requires_numpy
+    @responses.activate
+    def test_matrix_array(self):
+        query = ENDPOINTS_QUERIES[self.name]["matrix"]
+        coords = convert.delimit_list([convert.delimit_list(pair) for pair in query["locations"]], ";")
+
+        responses.add(
+            responses.GET,
+            f"https://routing.openstreetmap.de/routed-bike/table/v1/{query['profile']}/{coords}",
+            status=200,
+            json=ENDPOINTS_RESPONSES[self.name]["matrix"],
+            content_type="application/json",
+        )
+
+        matrix = self.client.matrix(**query, dtype="float32")
+
+        expected = ENDPOINTS_RESPONSES[self.name]["matrix"]["durations"]
+        self.assertEqual(matrix.durations_array.dtype, _test.np.float32)
+        self.assertEqual(matrix.durations_array.tolist(), expected)
+        self.assertEqual(matrix.durations, expected)
+
+    @responses.activate
+    def test_matrix_polyline6(self):
+        query = deepcopy(ENDPOINTS_QUERIES[self.name]["matrix"])
+
+        responses.add(
+            responses.GET,
+            f"https://routing.openstreetmap.de/routed-bike/table/v1/{query['profile']}/polyline6(aqkg%7DAa_iqO%60kHxaN_ry%40_ibE)",
+            status=200,
+            json=ENDPOINTS_RESPONSES[self.name]["matrix"],
+            content_type="application/json",
+        )
+
+        matrix = self.client.matrix(**query, coordinate_encoding="polyline6")
+
+        self.assertEqual(1, len(responses.calls))
+        self.assertIsInstance(matrix, Matrix)
+
     @responses.activate
     def test_few_sources_destinations_matrix(self):
         query = deepcopy(ENDPOINTS_QUERIES[self.name]["matrix"])
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the quantized route cache."""
+
+import json
+import re
+from urllib.parse import parse_qs, urlsplit
+
+import responses
+
+import tests as _test
+from routingpy import OSRM
+from routingpy.direction import Direction
+from routingpy.quantized_cache import QuantizedRouteCache, snap_to_geohash, snap_to_grid
+from tests.data.mock import *
+from tests.test_tiling import osrm_table_callback
+
+
+class QuantizedRouteCacheTest(_test.TestCase):
+    def setUp(self):
+        self.router = QuantizedRouteCache(OSRM(), grid_size=10)
+
+    def test_snap(self):
+        cell, center = snap_to_grid([8.688641, 49.420577], 10)
+
+        self.assertEqual(cell, snap_to_grid([8.688651, 49.420567], 10)[0])
+        self.assertNotEqual(cell, snap_to_grid([8.688641, 49.420777], 10)[0])
+        self.assertLess(abs(center[0] - 8.688641) * 111320 * 0.65, 5)
+        self.assertLess(abs(center[1] - 49.420577) * 111320, 5)
+
+        self.assertEqual(snap_to_geohash([-5.6, 42.6], 5), ("ezs42", [-5.60302734375, 42.60498046875]))
+
+    def test_error_bound(self):
+        self.assertAlmostEqual(self.router.error_bound, 7.071, places=3)
+        self.assertAlmostEqual(
+            QuantizedRouteCache(OSRM(), geohash_precision=8).error_bound, 21.36, places=2
+        )
+
+    @responses.activate
+    def test_directions(self):
+        responses.add(
+            responses.GET,
+            re.compile(r"https://routing.openstreetmap.de/routed-bike/route/v1/driving/.*"),
+            status=200,
+            json=ENDPOINTS_RESPONSES["osrm"]["directions_geojson"],
+            content_type="application/json",
+        )
+
+        first = self.router.directions(
+            [[8.688641, 49.420577], [8.680916, 49.415776]], geometries="geojson"
+        )
+        second = self.router.directions(
+            [[8.688651, 49.420567], [8.680917, 49.415777]], geometries="geojson"
+        )
+        self.router.directions(
+            [[8.688651, 49.420567], [8.680917, 49.415777]], geometries="geojson", steps=True
+        )
+
+        self.assertIsInstance(first, Direction)
+        self.assertIs(first, second)
+        self.assertEqual(2, len(responses.calls))
+        self.assertEqual(self.router.stats["hits"], 1)
+        self.assertEqual(self.router.stats["misses"], 2)
+
+    @responses.activate
+    def test_matrix_missing_cells(self):
+        responses.add_callback(
+            responses.GET,
+            re.compile(r"https://routing.openstreetmap.de/routed-bike/table/v1/driving/.*"),
+            callback=osrm_table_callback,
+        )
+        locations = [[8.68, 49.42], [8.69, 49.42], [8.70, 49.42]]
+
+        first = self.router.matrix(locations)
+        # the first two are in the same cells again, the third one is new
+        second = self.router.matrix([[8.680001, 49.42], [8.690001, 49.42], [8.71, 49.42]])
+
+        # only the new location's row and column are requested
+        self.assertEqual(3, len(responses.calls))
+        row = parse_qs(urlsplit(responses.calls[1].request.url).query)
+        self.assertEqual(len(row["sources"][0].split(";")), 1)
+        self.assertEqual(len(row["destinations"][0].split(";")), 3)
+        column = parse_qs(urlsplit(responses.calls[2].request.url).query)
+        self.assertEqual(len(column["sources"][0].split(";")), 2)
+        self.assertEqual(len(column["destinations"][0].split(";")), 1)
+
+        self.assertEqual(second.durations[0][:2], first.durations[0][:2])
+        self.assertAlmostEqual(second.durations[0][2], 0.03, places=3)
+        self.assertAlmostEqual(second.durations[2][2], 0, places=3)
+        self.assertEqual(self.router.stats["hits"], 4)
+        self.assertEqual(self.router.stats["misses"], 14)
+        self.assertEqual(len(second.raw), 2)
+
+    @responses.activate
+    def test_matrix_skips_cached_cells(self):
+        responses.add_callback(
+            responses.GET,
+            re.compile(r"https://routing.openstreetmap.de/routed-bike/table/v1/driving/.*"),
+            callback=osrm_table_callback,
+        )
+        locations = [[8.68, 49.42], [8.70, 49.42]]
+
+        self.router.matrix(locations, sources=[0], destinations=[1])
+        self.router.matrix(locations, sources=[1], destinations=[0])
+        matrix = self.router.matrix(locations)
+
+        # The diagonal misses different columns per row, which are requested separately, instead of a block
+        # which requests the cached cells again
+        self.assertEqual(4, len(responses.calls))
+        for call in responses.calls[2:]:
+            query = parse_qs(urlsplit(call.request.url).query)
+            self.assertEqual(len(query["sources"][0].split(";")), 1)
+            self.assertEqual(len(query["destinations"][0].split(";")), 1)
+        self.assertAlmostEqual(matrix.durations[0][1], 0.02, places=3)
+        self.assertEqual(self.router.stats["hits"], 2)
+        self.assertEqual(self.router.stats["misses"], 4)
+
+    @responses.activate
+    def test_matrix_without_distances(self):
+        def durations_callback(request):
+            status, headers, body = osrm_table_callback(request)
+            return status, headers, json.dumps({"durations": json.loads(body)["durations"]})
+
+        responses.add_callback(
+            responses.GET,
+            re.compile(r"https://routing.openstreetmap.de/routed-bike/table/v1/driving/.*"),
+            callback=durations_callback,
+        )
+        locations = [[8.68, 49.42], [8.70, 49.42]]
+
+        first = self.router.matrix(locations, sources=[0])
+        second = self.router.matrix(locations)
+
+        self.assertIsNone(first.distances)
+        self.assertIsNone(second.distances)
+        self.assertAlmostEqual(second.durations[1][0], -0.02, places=3)
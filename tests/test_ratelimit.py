@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the client-side rate limiter."""
+
+import threading
+
+import responses
+
+import tests as _test
+from routingpy import ORS
+from routingpy.ratelimit import RateLimiter, TokenBucket
+from tests.data.mock import *
+
+
+class FakeClock(object):
+    """A clock which only advances when told to, recording the sleeps instead of sleeping."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+
+class RateLimiterTest(_test.TestCase):
+    def test_token_bucket(self):
+        clock = FakeClock()
+        bucket = TokenBucket(20, burst=3, clock=clock, sleep=clock.sleep)
+
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(bucket.reserve(), 0.05)
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+
+        # Refills while time passes, but not beyond the burst
+        clock.now += 10
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(bucket.acquire(), 0.05)
+        self.assertEqual(len(clock.sleeps), 1)
+
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+    def test_threads(self):
+        clock = FakeClock()
+        limiter = RateLimiter(100, burst=1, clock=clock, sleep=clock.sleep)
+        waits = []
+
+        def request():
+            for _ in range(5):
+                waits.append(limiter.acquire())
+
+        threads = [threading.Thread(target=request) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Every request reserved its own token, so they're spaced by 10 ms whatever the order of the threads
+        self.assertEqual(len(waits), 20)
+        for index, wait in enumerate(sorted(waits)):
+            self.assertAlmostEqual(wait, index * 0.01)
+
+    def test_endpoints(self):
+        clock = FakeClock()
+        limiter = RateLimiter(
+            endpoints={
+                "/v2/matrix": TokenBucket(10, clock=clock),
+                "/v2/matrix/driving-car": TokenBucket(1, per=60, clock=clock),
+            },
+            sleep=clock.sleep,
+        )
+
+        self.assertEqual(limiter.acquire("/v2/directions/driving-car"), 0)
+        self.assertEqual(limiter.acquire("/v2/matrix/driving-car/json"), 0)
+        self.assertEqual(limiter.acquire("/v2/matrix/cycling-regular/json"), 0)
+        self.assertAlmostEqual(limiter.acquire("/v2/matrix/foot-walking/json"), 0.1)
+        # the longest prefix only
+        self.assertAlmostEqual(limiter._endpoint_bucket("/v2/matrix/driving-car/json").reserve(), 60)
+        self.assertEqual(len(clock.sleeps), 1)
+
+    @responses.activate
+    def test_shared_between_routers(self):
+        query = ENDPOINTS_QUERIES["ors"]["directions"]
+        responses.add(
+            responses.POST,
+            "https://api.openrouteservice.org/v2/directions/{}/geojson".format(query["profile"]),
+            status=200,
+            json=ENDPOINTS_RESPONSES["ors"]["directions"]["geojson"],
+            content_type="application/json",
+        )
+        clock = FakeClock()
+        limiter = RateLimiter(600, per=60, burst=2, clock=clock, sleep=clock.sleep)
+        first, second = ORS(api_key="key", rate_limiter=limiter), ORS(
+            api_key="key", rate_limiter=limiter
+        )
+
+        for router in (first, second, first, second):
+            router.directions(**query)
+
+        self.assertEqual(4, len(responses.calls))
+        self.assertEqual(len(clock.sleeps), 2)
+        self.assertAlmostEqual(limiter.waited, 0.3)
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the coalescing of identical requests."""
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import responses
+
+import routingpy
+import tests as _test
+from routingpy import OSRM, Valhalla
+from routingpy.client_async import AsyncClient
+from routingpy.single_flight import SingleFlight
+from tests.data.mock import *
+
+
+def slow_callback(status, body):
+    def callback(request):
+        time.sleep(0.2)
+        return status, {"Content-Type": "application/json"}, json.dumps(body)
+
+    return callback
+
+
+class SingleFlightTest(_test.TestCase):
+    @responses.activate
+    def test_threads(self):
+        responses.add_callback(
+            responses.GET,
+            "https://routing.openstreetmap.de/routed-bike/table/v1/driving/8.688641,49.420577;8.680916,49.415776",
+            callback=slow_callback(200, ENDPOINTS_RESPONSES["osrm"]["matrix"]),
+        )
+        router = OSRM(single_flight=True)
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            matrices = list(executor.map(lambda _: router.matrix(PARAM_LINE), range(5)))
+        # a later identical request is sent again
+        router.matrix(PARAM_LINE)
+
+        self.assertEqual(2, len(responses.calls))
+        for matrix in matrices:
+            self.assertEqual(matrix.durations, ENDPOINTS_RESPONSES["osrm"]["matrix"]["durations"])
+        self.assertEqual(router.client.single_flight.stats, {"calls": 6, "shared": 4})
+
+    @responses.activate
+    def test_errors_are_shared(self):
+        responses.add_callback(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/route",
+            callback=slow_callback(400, {"error": "No path could be found"}),
+        )
+        single_flight = SingleFlight()
+        router = Valhalla("https://api.mapbox.com/valhalla/v1", single_flight=single_flight)
+
+        def directions(_):
+            try:
+                router.directions(**ENDPOINTS_QUERIES["valhalla"]["directions"])
+            except routingpy.exceptions.RouterApiError as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            errors = list(executor.map(directions, range(3)))
+
+        self.assertEqual(1, len(responses.calls))
+        self.assertEqual(len(set(map(id, errors))), 1)
+
+    @responses.activate
+    def test_async(self):
+        responses.add_callback(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/route",
+            callback=slow_callback(200, ENDPOINTS_RESPONSES["valhalla"]["directions"]),
+        )
+        router = Valhalla("https://api.mapbox.com/valhalla/v1", client=AsyncClient, single_flight=True)
+
+        async def run():
+            query = ENDPOINTS_QUERIES["valhalla"]["directions"]
+            return await asyncio.gather(*[router.directions(**query) for _ in range(5)])
+
+        routes = asyncio.run(run())
+        router.client.close()
+
+        self.assertEqual(1, len(responses.calls))
+        self.assertEqual([route.duration for route in routes], [57] * 5)
+        self.assertEqual(router.client.single_flight.stats, {"calls": 5, "shared": 4})
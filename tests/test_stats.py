@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the statistics collector."""
+
+import random
+
+import responses
+
+import tests as _test
+from routingpy import OSRM
+from routingpy.retry import RetryPolicy
+from routingpy.stats import LatencyHistogram, StatsCollector
+from tests.data.mock import *
+
+URL = (
+    "https://routing.openstreetmap.de/routed-bike/table/v1/driving/8.688641,49.420577;8.680916,49.415776"
+)
+ENDPOINT = ("OSRM", "https://routing.openstreetmap.de/routed-bike/table/v1")
+
+
+class StatsTest(_test.TestCase):
+    def test_histogram(self):
+        histogram = LatencyHistogram()
+        self.assertIsNone(histogram.quantile(0.5))
+
+        values = [random.uniform(0.001, 10) for _ in range(10000)]
+        for value in values:
+            histogram.record(value)
+        values.sort()
+
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * len(values)) - 1]
+            self.assertAlmostEqual(histogram.quantile(q), exact, delta=exact * 0.04)
+        self.assertEqual(histogram.quantile(1), max(values))
+        self.assertEqual(histogram.snapshot()["count"], 10000)
+        self.assertLess(len(histogram._buckets), 1000)
+
+    def test_histogram_bucket_width(self):
+        histogram = LatencyHistogram(resolution=1, sub_bucket_bits=5)
+
+        for units in (1, 63, 64, 65, 1000, 123456, 2**40 + 12345):
+            middle = histogram._value(histogram._index(units))
+            self.assertLessEqual(abs(middle - units) / units, 2**-6)
+        # 32 buckets per power of two
+        self.assertEqual(len({histogram._index(units) for units in range(1024, 2048)}), 32)
+
+    @responses.activate
+    def test_collector(self):
+        responses.add(responses.GET, URL, status=503)
+        responses.add(
+            responses.GET,
+            URL,
+            status=200,
+            json=ENDPOINTS_RESPONSES["osrm"]["matrix"],
+            content_type="application/json",
+        )
+        stats = StatsCollector()
+        router = stats.attach(OSRM(retry_policy=RetryPolicy(base_delay=0.01, max_delay=0.01)))
+
+        with self.assertWarns(UserWarning):
+            router.matrix(PARAM_LINE)
+        router.matrix(PARAM_LINE)
+
+        snapshot = stats.snapshot()
+        endpoint = snapshot["endpoints"][ENDPOINT]
+        self.assertEqual(
+            (endpoint["requests"], endpoint["errors"], endpoint["retries"]),
+            (3, 1, 1),
+        )
+        self.assertAlmostEqual(endpoint["error_rate"], 1 / 3)
+        self.assertEqual(endpoint["statuses"], {503: 1, 200: 2})
+        self.assertGreater(endpoint["bytes_received"], 0)
+        self.assertEqual(endpoint["latency"]["count"], 3)
+        self.assertEqual(snapshot["parse"]["OSRM"]["count"], 2)
+
+        stats.detach(router)
+        router.matrix(PARAM_LINE)
+        self.assertEqual(stats.snapshot()["endpoints"][ENDPOINT]["requests"], 3)
+
+    @responses.activate
+    def test_prometheus(self):
+        responses.add(
+            responses.GET,
+            URL,
+            status=200,
+            json=ENDPOINTS_RESPONSES["osrm"]["matrix"],
+            content_type="application/json",
+        )
+        stats = StatsCollector()
+        stats.attach(OSRM()).matrix(PARAM_LINE)
+
+        text = stats.to_prometheus()
+        labels = 'router="OSRM",endpoint="{}"'.format(ENDPOINT[1])
+
+        self.assertIn("# TYPE routingpy_requests_total counter\n", text)
+        self.assertIn("routingpy_requests_total{%s} 1\n" % labels, text)
+        self.assertIn("# TYPE routingpy_request_duration_seconds summary\n", text)
+        self.assertIn('routingpy_request_duration_seconds{quantile="0.95",%s} ' % labels, text)
+        self.assertIn("routingpy_request_duration_seconds_count{%s} 1\n" % labels, text)
+        self.assertIn('routingpy_parse_duration_seconds_count{router="OSRM"} 1\n', text)
+
+        stats.reset()
+        self.assertEqual(stats.snapshot(), {"endpoints": {}, "parse": {}})
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2021 GIS OPS UG
+#
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License. You may obtain a copy of
+# the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+#
+"""Tests for the tiling module."""
+
+import json
+import re
+from urllib.parse import parse_qs, urlsplit
+
+import responses
+
+import routingpy
+import tests as _test
+from routingpy import OSRM, MapboxOSRM
+from routingpy.matrix import Matrix
+from routingpy.tiling import split_tiles
+
+
+def osrm_table_callback(request):
+    """Mocks an OSRM table response, where the duration between two locations is the difference of their
+    longitudes."""
+    url = urlsplit(request.url)
+    coords = [[float(c) for c in pair.split(",")] for pair in url.path.rsplit("/", 1)[1].split(";")]
+    query = parse_qs(url.query)
+    sources = (
+        [int(i) for i in query["sources"][0].split(";")] if "sources" in query else range(len(coords))
+    )
+    destinations = (
+        [int(i) for i in query["destinations"][0].split(";")]
+        if "destinations" in query
+        else range(len(coords))
+    )
+    durations = [[coords[d][0] - coords[s][0] for d in destinations] for s in sources]
+    body = {"durations": durations, "distances": [[10 * v for v in row] for row in durations]}
+
+    return 200, {"content-type": "application/json"}, json.dumps(body)
+
+
+class TilingTest(_test.TestCase):
+    def setUp(self):
+        self.locations = [[float(i), 49.0] for i in range(23)]
+        self.expected = [[float(d - s) for d in range(23)] for s in range(23)]
+
+    def test_split_tiles(self):
+        tiles = split_tiles(list(range(5)), list(range(3)), (2, 2))
+
+        self.assertEqual(6, len(tiles))
+        self.assertEqual(tiles[0], (0, 0, [0, 1], [0, 1]))
+        self.assertEqual(tiles[-1], (4, 2, [4], [2]))
+
+        with self.assertRaises(ValueError):
+            split_tiles([0], [0], (0, 1))
+
+    @responses.activate
+    def test_tiled_matrix(self):
+        responses.add_callback(
+            responses.GET,
+            re.compile(r"https://routing.openstreetmap.de/routed-bike/table/v1/driving/.*"),
+            callback=osrm_table_callback,
+        )
+
+        matrix = OSRM().matrix_tiled(self.locations, tile_size=(5, 7), max_workers=3)
+
+        # 5 row blocks x 4 column blocks
+        self.assertEqual(20, len(responses.calls))
+        self.assertIsInstance(matrix, Matrix)
+        self.assertEqual(matrix.durations, self.expected)
+        self.assertEqual(matrix.distances, [[10 * v for v in row] for row in self.expected])
+        self.assertEqual(20, len(matrix.raw))
+
+    @responses.activate
+    def test_sources_destinations(self):
+        responses.add_callback(
+            responses.GET,
+            re.compile(r"https://routing.openstreetmap.de/routed-bike/table/v1/driving/.*"),
+            callback=osrm_table_callback,
+        )
+        sources = [22, 3, 7]
+        destinations = [1, 1, 20, 5]
+
+        matrix = OSRM().matrix_tiled(
+            self.locations, sources=sources, destinations=destinations, tile_size=(2, 3)
+        )
+
+        self.assertEqual(
+            matrix.durations, [[self.expected[s][d] for d in destinations] for s in sources]
+        )
+
+    @_test.requires_numpy
+    @responses.activate
+    def test_tiled_matrix_array(self):
+        responses.add_callback(
+            responses.GET,
+            re.compile(r"https://routing.openstreetmap.de/routed-bike/table/v1/driving/.*"),
+            callback=osrm_table_callback,
+        )
+
+        matrix = OSRM().matrix_tiled(self.locations, tile_size=(5, 7), dtype="float32")
+
+        self.assertEqual(matrix.durations_array.dtype, _test.np.float32)
+        self.assertEqual(matrix.durations_array.shape, (23, 23))
+        self.assertEqual(matrix.durations_array.tolist(), self.expected)
+
+    @responses.activate
+    def test_default_tile_size(self):
+        responses.add_callback(
+            responses.GET,
+            re.compile(r"https://api.mapbox.com/directions-matrix/v1/mapbox/driving/.*"),
+            callback=osrm_table_callback,
+        )
+
+        matrix = MapboxOSRM(api_key="sample_key").matrix_tiled(self.locations, profile="driving")
+
+        for call in responses.calls:
+            coords = urlsplit(call.request.url).path.rsplit("/", 1)[1].split(";")
+            self.assertLessEqual(len(coords), 25)
+        self.assertEqual(matrix.durations, self.expected)
+
+    def test_routers_without_sources(self):
+        # Their matrix can't be requested in tiles
+        self.assertFalse(hasattr(routingpy.IGN(), "matrix_tiled"))
+        self.assertFalse(hasattr(routingpy.OpenTripPlannerV2(), "matrix_tiled"))
+        self.assertTrue(hasattr(routingpy.IGN(), "directions_many"))
+
+    @responses.activate
+    def test_retry_failed_tile(self):
+        url = re.compile(r"https://routing.openstreetmap.de/routed-bike/table/v1/driving/.*")
+        responses.add(responses.GET, url, status=500, json={}, content_type="application/json")
+        responses.add_callback(responses.GET, url, callback=osrm_table_callback)
+
+        matrix = OSRM().matrix_tiled(self.locations, tile_size=(12, 12), max_workers=1)
+
+        self.assertEqual(5, len(responses.calls))
+        self.assertEqual(matrix.durations, self.expected)
+
+    @responses.activate
+    def test_api_error_not_retried(self):
+        responses.add(
+            responses.GET,
+            re.compile(r"https://routing.openstreetmap.de/routed-bike/table/v1/driving/.*"),
+            status=400,
+            json={"code": "TooBig"},
+            content_type="application/json",
+        )
+
+        with self.assertRaises(routingpy.exceptions.RouterApiError):
+            OSRM().matrix_tiled(self.locations, tile_size=(12, 12), max_workers=1)
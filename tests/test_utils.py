@@ -16,10 +16,58 @@
 #
 """Tests for utils module."""
 
+import json
+import random
+from unittest import mock
+
 import tests as _test
 from routingpy import utils
 
 
+def legacy_decode(expression, precision=5, is3d=False, order="lnglat"):
+    """The original character by character decoder, as reference for the fast decoders."""
+
+    def trans(value, index):
+        byte, result, shift = None, 0, 0
+        while byte is None or byte >= 0x20:
+            byte = ord(value[index]) - 63
+            index += 1
+            result |= (byte & 0x1F) << shift
+            shift += 5
+            comp = result & 1
+        return ~(result >> 1) if comp else (result >> 1), index
+
+    coordinates, index, lat, lng, z, factor = [], 0, 0, 0, 0, float(10**precision)
+    while index < len(expression):
+        lat_change, index = trans(expression, index)
+        lng_change, index = trans(expression, index)
+        lat += lat_change
+        lng += lng_change
+        point = (lat / factor, lng / factor) if order == "latlng" else (lng / factor, lat / factor)
+        if is3d:
+            z_change, index = trans(expression, index)
+            z += z_change
+            point = (*point, z / 100)
+        coordinates.append(point)
+
+    return coordinates
+
+
+def random_polyline(n_points, dims=2, seed=0):
+    """Encodes a random walk of n_points with precision 6."""
+    rng = random.Random(seed)
+    chars = []
+    for _ in range(n_points * dims):
+        value = rng.randint(-(10**7), 10**7)
+        value = ~(value << 1) if value < 0 else value << 1
+        while value >= 0x20:
+            chars.append(chr((0x20 | (value & 0x1F)) + 63))
+            value >>= 5
+        chars.append(chr(value + 63))
+
+    return "".join(chars)
+
+
 class UtilsTest(_test.TestCase):
     def setUp(self):
         self.coords2d_5prec = r"smslH__`t@~\fo@"
@@ -47,6 +95,63 @@ class UtilsTest(_test.TestCase):
         decoded = [(49.420577, 8.688641, 120.96), (49.415776, 8.680916, 1491.39)]
         self.assertEqual(decoded, utils.decode_polyline6(self.coords3d_6prec, True, order="latlng"))
 
+    def test_polyline_decoding_identical(self):
+        for dims in (2, 3):
+            polyline = random_polyline(500, dims, seed=dims)
+            for order in ("lnglat", "latlng"):
+                expected = legacy_decode(polyline, 6, dims == 3, order)
+
+                self.assertEqual(expected, utils.decode_polyline6(polyline, dims == 3, order))
+                with mock.patch.object(utils, "np", None):
+                    self.assertEqual(expected, utils.decode_polyline6(polyline, dims == 3, order))
+                    flat = utils.decode_polyline6(polyline, dims == 3, order, as_array=True)
+                    self.assertEqual([c for point in expected for c in point], flat.tolist())
+
+    @_test.requires_numpy
+    def test_polyline_decoding_array(self):
+        polyline = random_polyline(300, 3)
+        expected = legacy_decode(polyline, 5, True)
+
+        decoded = utils.decode_polyline5(polyline, True, as_array=True)
+
+        self.assertEqual(decoded.shape, (300, 3))
+        self.assertEqual(decoded.dtype, _test.np.float64)
+        self.assertEqual([tuple(point) for point in decoded.tolist()], expected)
+        self.assertEqual(utils.decode_polyline5("", as_array=True).shape, (0, 2))
+
+    def test_polyline_decoding_invalid(self):
+        with self.assertRaises(ValueError):
+            utils.decode_polyline5(self.coords2d_5prec[:-1])
+        with self.assertRaises(ValueError):
+            utils.decode_polyline5(self.coords2d_5prec, order="xy")
+
+    def test_polyline_encoding(self):
+        # reference example of the polyline algorithm
+        self.assertEqual(
+            "_p~iF~ps|U_ulLnnqC_mqNvxq`@",
+            utils.encode_polyline5([(-120.2, 38.5), (-120.95, 40.7), (-126.453, 43.252)]),
+        )
+        self.assertEqual(
+            self.coords2d_6prec, utils.encode_polyline6(utils.decode_polyline6(self.coords2d_6prec))
+        )
+        self.assertEqual(
+            self.coords3d_5prec,
+            utils.encode_polyline5(utils.decode_polyline5(self.coords3d_5prec, True), True),
+        )
+        self.assertEqual(
+            self.coords2d_5prec,
+            utils.encode_polyline5([(49.42058, 8.68864), (49.41578, 8.68092)], order="latlng"),
+        )
+
+    def test_polyline_encoding_rounding(self):
+        # halves are rounded away from zero
+        self.assertEqual(
+            utils.encode_polyline5([(0.000005, -0.000005)]), utils.encode_polyline5([(1e-5, -1e-5)])
+        )
+
+        polyline = random_polyline(200)
+        self.assertEqual(polyline, utils.encode_polyline6(utils.decode_polyline6(polyline)))
+
     def test_get_ordinal(self):
         self.assertEqual(utils.get_ordinal(0), "th")
         self.assertEqual(utils.get_ordinal(1), "st")
@@ -72,3 +177,66 @@ class UtilsTest(_test.TestCase):
         self.assertEqual(d, {"k": {"k1": 0, "k2": 2}, "l": []})
         d = utils.deep_merge_dicts(d, {"l": [1]})
         self.assertEqual(d, {"k": {"k1": 0, "k2": 2}, "l": [1]})
+
+    def test_iter_json_array(self):
+        items = [{"edge_id": i, "name": "ü" * i} for i in range(20)] + [1, 23, "x"]
+        document = json.dumps({"type": "FeatureCollection", "features": items, "id": [0]}).encode()
+
+        for size in (1, 3, 64, len(document)):
+            chunks = [document[i : i + size] for i in range(0, len(document), size)]
+            self.assertEqual(list(utils.iter_json_array(chunks, "features")), items)
+
+        self.assertEqual(list(utils.iter_json_array([b'{"type": "x"}'], "features")), [])
+        self.assertEqual(list(utils.iter_json_array([b'{"features": []}'], "features")), [])
+        with self.assertRaises(json.JSONDecodeError):
+            list(utils.iter_json_array([b'{"features": [{"a": 1}, {"b"'], "features"))
+        with self.assertRaises(json.JSONDecodeError):
+            list(utils.iter_json_array([b'{"features": [1, , 2]}'], "features"))
+
+    def test_iter_json_array_numbers(self):
+        self.assertEqual(
+            list(utils.iter_json_array([b'{"features": [1.', b"5, 2]}"], "features")), [1.5, 2]
+        )
+        # Every split point, e.g. after "1.", "1.5E", "1.5E+" or "-"
+        document = b'{"features": [1.5E+3, -2, 10, 2e-1]}'
+        for index in range(1, len(document)):
+            chunks = [document[:index], document[index:]]
+            self.assertEqual(list(utils.iter_json_array(chunks, "features")), [1500.0, -2, 10, 0.2])
+
+        items = [
+            random.choice([0, -1, 12, 3.25, -0.5e-3, 6.02e23, True, None, "1.5"]) for _ in range(50)
+        ]
+        document = json.dumps({"features": items}).encode()
+        for _ in range(200):
+            cuts = sorted(random.sample(range(1, len(document)), 20))
+            chunks = [document[i:j] for i, j in zip([0] + cuts, cuts + [len(document)])]
+            self.assertEqual(list(utils.iter_json_array(chunks, "features")), items)
+
+        with self.assertRaises(json.JSONDecodeError):
+            list(utils.iter_json_array([b'{"features": [1.x, 2]}'], "features"))
+
+    def test_iter_json_array_top_level_key(self):
+        document = (
+            rb'{"meta": {"features": [0]}, "name": "features", "note": ["features", ["x"]], '
+            rb'"escaped \"features": [1], "features": [{"features": [2]}, "]", 3]}'
+        )
+
+        for size in (1, 7, len(document)):
+            chunks = [document[i : i + size] for i in range(0, len(document), size)]
+            self.assertEqual(
+                list(utils.iter_json_array(chunks, "features")), [{"features": [2]}, "]", 3]
+            )
+        self.assertEqual(list(utils.iter_json_array([rb'{"\u0066eatures": [1]}'], "features")), [1])
+        self.assertEqual(list(utils.iter_json_array([b'[{"features": [1]}]'], "features")), [])
+
+    def test_iter_json_array_large_item(self):
+        item = {"coordinates": [[i, i] for i in range(20000)]}
+        document = json.dumps({"features": [item, item]}).encode()
+        chunks = [document[i : i + 16] for i in range(0, len(document), 16)]
+
+        with mock.patch.object(
+            utils._JSON_DECODER, "raw_decode", wraps=utils._JSON_DECODER.raw_decode
+        ) as raw_decode:
+            self.assertEqual(list(utils.iter_json_array(chunks, "features")), [item, item])
+        # The incomplete item is decoded again once the buffer doubled, not on each of its ~15000 chunks
+        self.assertLess(raw_decode.call_count, 50)
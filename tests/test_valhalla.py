@@ -16,15 +16,18 @@
 #
 """Tests for the Valhalla module."""
 
+import io
 import json
+import os
+import tempfile
 from copy import deepcopy
 
 import responses
 
 import tests as _test
 from routingpy import Valhalla
-from routingpy.direction import Direction, Directions
-from routingpy.expansion import Expansions
+from routingpy.direction import Direction, Directions, EncodedGeometry
+from routingpy.expansion import ColumnarExpansions, Expansions
 from routingpy.isochrone import Isochrone, Isochrones
 from routingpy.matrix import Matrix
 from routingpy.optimized import OptimizedDirection
@@ -70,6 +73,38 @@ class ValhallaTest(_test.TestCase):
         self.assertIsInstance(routes.geometry, list)
         self.assertIsInstance(routes.raw, dict)
 
+    @responses.activate
+    def test_decode_geometry(self):
+        query = ENDPOINTS_QUERIES[self.name]["directions"]
+        for endpoint, response in (
+            ("route", ENDPOINTS_RESPONSES[self.name]["directions"]),
+            ("optimized_route", ENDPOINTS_RESPONSES[self.name]["optimized_route"]),
+        ):
+            responses.add(
+                responses.POST,
+                "https://api.mapbox.com/valhalla/v1/" + endpoint,
+                status=200,
+                json=response,
+                content_type="application/json",
+            )
+
+        for method in ("directions", "optimized_directions"):
+            expected = getattr(self.client, method)(**query)
+            lazy = getattr(
+                Valhalla("https://api.mapbox.com/valhalla/v1", decode_geometry="lazy"), method
+            )(**query)
+            summary = getattr(
+                Valhalla("https://api.mapbox.com/valhalla/v1", decode_geometry=False), method
+            )(**query)
+
+            self.assertIsInstance(lazy._geometry, EncodedGeometry)
+            self.assertEqual(lazy.geometry, expected.geometry)
+            self.assertIsNone(summary.geometry)
+            self.assertEqual(
+                (summary.duration, summary.distance, lazy.duration, lazy.distance),
+                (expected.duration, expected.distance) * 2,
+            )
+
     @responses.activate
     def test_full_optimized_directions(self):
         query = ENDPOINTS_QUERIES[self.name]["optimized_route"]
@@ -225,6 +260,49 @@ class ValhallaTest(_test.TestCase):
             self.assertEqual(raster.image, image)
             self.assertEqual(raster.max_travel_time, max(query["intervals"]))
 
+    @responses.activate
+    def test_raster_stream(self):
+        query = deepcopy(ENDPOINTS_QUERIES[self.name]["isochrones"])
+        with open("tests/raster_valhalla.tif", "rb") as raster_file:
+            image = raster_file.read()
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/isochrone",
+            status=200,
+            body=image,
+            content_type="image/tiff",
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "raster.tif")
+            raster = self.client.raster(**query, stream_to=path)
+
+            self.assertEqual(raster.path, path)
+            self.assertIsNone(raster._image)
+            self.assertEqual(raster.image, image)
+            with raster.mmap() as image_map:
+                self.assertEqual(image_map[:], image)
+
+        with tempfile.NamedTemporaryFile() as f:
+            raster = self.client.raster(**query, stream_to=f)
+            self.assertEqual(raster.path, f.name)
+            self.assertEqual(raster.image, image)
+
+        # Without a name, the image is read back into memory
+        stream = io.BytesIO()
+        raster = self.client.raster(**query, stream_to=stream)
+        self.assertIsNone(raster.path)
+        self.assertEqual(raster.image, image)
+        with self.assertRaises(ValueError):
+            raster.mmap()
+
+        class WriteOnly(object):
+            def write(self, chunk):
+                pass
+
+        with self.assertRaises(ValueError):
+            self.client.raster(**query, stream_to=WriteOnly())
+
     # TODO: test colors having less items than range
     @responses.activate
     def test_full_matrix(self):
@@ -250,6 +328,31 @@ class ValhallaTest(_test.TestCase):
         self.assertEqual(matrix.distances, [[0, int(83.62 * 1000)], [int(38.10 * 1000), 0]])
         self.assertIsInstance(matrix.raw, dict)
 
+    @_test.requires_numpy
+    @responses.activate
+    def test_matrix_array(self):
+        query = ENDPOINTS_QUERIES[self.name]["matrix"]
+        response = deepcopy(ENDPOINTS_RESPONSES[self.name]["matrix"])
+        response["sources_to_targets"][1][0] = {"distance": None, "time": None}
+
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/sources_to_targets",
+            status=200,
+            json=response,
+            content_type="application/json",
+        )
+
+        matrix = self.client.matrix(**query, dtype="float32")
+
+        self.assertEqual(matrix.durations_array.dtype, _test.np.float32)
+        self.assertEqual(matrix.durations_array.shape, (2, 2))
+        self.assertTrue(_test.np.isnan(matrix.durations_array[1, 0]))
+        self.assertTrue(_test.np.isnan(matrix.distances_array[1, 0]))
+        self.assertAlmostEqual(float(matrix.distances_array[0, 1]), 83620, places=0)
+        # the lists are only built on access, with NaN back to None
+        self.assertEqual(matrix.durations, [[0, 100], [None, 0]])
+
     @responses.activate
     def test_few_sources_destinations_matrix(self):
         query = deepcopy(ENDPOINTS_QUERIES[self.name]["matrix"])
@@ -296,6 +399,130 @@ class ValhallaTest(_test.TestCase):
         self.assertEqual(expansion.interval_type, "time")
         self.assertIsInstance(expansion.raw, dict)
 
+    @responses.activate
+    def test_expansion_stream(self):
+        query = ENDPOINTS_QUERIES[self.name]["expansion"]
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/expansion",
+            status=200,
+            json=ENDPOINTS_RESPONSES[self.name]["expansion"],
+            content_type="application/json",
+        )
+        expected = self.client.expansion(**query)
+
+        with tempfile.TemporaryFile() as f:
+            expansion = self.client.expansion(**query, stream_to=f)
+            f.seek(0)
+            self.assertEqual(json.load(f), ENDPOINTS_RESPONSES[self.name]["expansion"])
+
+        self.assertIsNone(expansion.raw)
+        self.assertEqual([edge.geometry for edge in expansion], [edge.geometry for edge in expected])
+        self.assertEqual([edge.duration for edge in expansion], [edge.duration for edge in expected])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "expansion.json")
+            expansion = self.client.expansion(**query, stream_to=path, columnar=True)
+        self.assertIsInstance(expansion, ColumnarExpansions)
+        self.assertEqual([edge.geometry for edge in expansion], [edge.geometry for edge in expected])
+
+    @responses.activate
+    def test_expansion_columnar(self):
+        query = deepcopy(ENDPOINTS_QUERIES[self.name]["expansion"])
+        query["expansion_properties"].append("edge_status")
+        response = deepcopy(ENDPOINTS_RESPONSES[self.name]["expansion"])
+        for index, feature in enumerate(response["features"]):
+            feature["properties"]["edge_status"] = "r" if index % 2 else "s"
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/expansion",
+            status=200,
+            json=response,
+            content_type="application/json",
+        )
+        expected = self.client.expansion(**query)
+        expansion = self.client.expansion(**query, columnar=True)
+
+        self.assertIsInstance(expansion, ColumnarExpansions)
+        self.assertEqual(expansion.center, expected.center)
+        self.assertEqual(len(expansion), len(expected))
+        self.assertEqual(expansion.offsets[:4].tolist(), [0, 2, 4, 6])
+        self.assertEqual(expansion.status_categories, ("s", "r"))
+        self.assertEqual(expansion.columns["edge_status"][:3].tolist(), [0, 1, 0])
+        self.assertEqual(expansion.columns["duration"].typecode, "d")
+        for edge, expected_edge in zip(expansion, expected):
+            for name in ("geometry", "distance", "duration", "cost", "status"):
+                self.assertEqual(getattr(edge, name), getattr(expected_edge, name))
+        self.assertEqual(expansion[-1].geometry, expected[-1].geometry)
+        self.assertEqual(len(expansion[1:]), len(expected) - 1)
+        with self.assertRaises(IndexError):
+            expansion[len(expected)]
+
+    def test_expansion_columnar_missing_properties(self):
+        properties = ["duration", "edge_id", "edge_status"]
+        features = [
+            {"geometry": {"coordinates": [[0, 0], [1, 1]]}, "properties": {"duration": 1, "edge_id": 2}},
+            {
+                "geometry": {"coordinates": [[1, 1], [2, 2]]},
+                "properties": {"duration": None, "edge_id": None, "edge_status": None},
+            },
+            {"geometry": {"coordinates": [[2, 2], [3, 3]]}, "properties": {"edge_status": "s"}},
+        ]
+        response = {"type": "FeatureCollection", "features": features}
+
+        expected = self.client.parse_expansion_json(response, [0, 0], properties, "time")
+        expansion = self.client.parse_expansion_json(response, [0, 0], properties, "time", columnar=True)
+
+        self.assertEqual(expansion.status_categories, (None, "s"))
+        self.assertEqual(expansion.columns["edge_id"].tolist(), [2, -1, -1])
+        for edge, expected_edge in zip(expansion, expected):
+            for name in ("geometry", "duration", "edge_id", "status"):
+                self.assertEqual(getattr(edge, name), getattr(expected_edge, name))
+        self.assertEqual([edge.duration for edge in expansion], [1, None, None])
+
+    def test_expansion_columnar_many_statuses(self):
+        features = [
+            {"geometry": {"coordinates": [[0, 0], [1, 1]]}, "properties": {"edge_status": str(index)}}
+            for index in range(300)
+        ]
+
+        expansion = ColumnarExpansions.from_features(features, ["edge_status"])
+
+        self.assertEqual(len(expansion.status_categories), 300)
+        self.assertEqual(expansion[299].status, "299")
+
+    @responses.activate
+    def test_expansion_iter(self):
+        query = ENDPOINTS_QUERIES[self.name]["expansion"]
+        response = ENDPOINTS_RESPONSES[self.name]["expansion"]
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/expansion",
+            status=200,
+            body=json.dumps(response),
+            content_type="application/json",
+        )
+        expected = self.client.expansion(**query)
+
+        edges = list(self.client.expansion_iter(**query))
+        self.assertEqual([edge.geometry for edge in edges], [edge.geometry for edge in expected])
+        self.assertEqual([edge.cost for edge in edges], [edge.cost for edge in expected])
+
+        batches = list(self.client.expansion_iter(**query, batch_size=4))
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 4, 3])
+        self.assertIsInstance(batches[0], Expansions)
+        self.assertIsNone(batches[0].raw)
+        self.assertEqual(batches[-1][-1].geometry, expected[-1].geometry)
+
+        batches = list(self.client.expansion_iter(**query, batch_size=10, columnar=True))
+        self.assertIsInstance(batches[0], ColumnarExpansions)
+        self.assertEqual(
+            [edge.duration for batch in batches for edge in batch], [edge.duration for edge in expected]
+        )
+
+        with self.assertRaises(ValueError):
+            self.client.expansion_iter(**query, columnar=True)
+
     @responses.activate
     def test_trace_attributes(self):
         query = ENDPOINTS_QUERIES[self.name]["trace_attributes"]
@@ -324,6 +551,28 @@ class ValhallaTest(_test.TestCase):
             self.assertEqual(pt.match_type, "matched")
             self.assertGreaterEqual(pt.edge_index, 0)
 
+    @responses.activate
+    def test_trace_attributes_encoded(self):
+        query = deepcopy(ENDPOINTS_QUERIES[self.name]["trace_attributes"])
+        expected = deepcopy(ENDPOINTS_EXPECTED[self.name]["trace_attributes"])
+        del expected["shape"]
+        expected["encoded_polyline"] = "aqkg}Aa_iqO`kHxaN_ry@_ibE"
+        responses.add(
+            responses.POST,
+            "https://api.mapbox.com/valhalla/v1/trace_attributes",
+            status=200,
+            json=ENDPOINTS_RESPONSES[self.name]["trace_attributes"],
+            content_type="application/json",
+        )
+
+        self.client.trace_attributes(**query, coordinate_encoding="polyline6")
+
+        self.assertEqual(json.loads(responses.calls[0].request.body.decode("utf-8")), expected)
+
+        query["locations"] = [Valhalla.Waypoint(loc) for loc in query["locations"]]
+        with self.assertRaises(ValueError):
+            self.client.trace_attributes(**query, coordinate_encoding="polyline6")
+
     @responses.activate
     def test_units_kwarg_in_directions(self):
         query = ENDPOINTS_QUERIES[self.name]["directions"]